@@ -0,0 +1,63 @@
+"""
+Run comparison script
+Diff two test runs (JSON reports or archived run IDs) for performance changes
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+from config.config import RUN_DIFF_REPORT_PATH
+from utils.run_diff import diff_runs, format_terminal, generate_html, list_runs
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Compare two UtilityHub360 test runs",
+        epilog="Runs are test_results.json paths, run IDs from reports/runs, 'latest' or 'previous'. "
+               "Comma-separate several runs per side to pool them for significance testing."
+    )
+    parser.add_argument('baseline', nargs='?', default='previous', help="Baseline run(s) (default: previous)")
+    parser.add_argument('current', nargs='?', default='latest', help="Current run(s) (default: latest)")
+    parser.add_argument('--html', default=str(RUN_DIFF_REPORT_PATH), help="HTML output path")
+    parser.add_argument('--limit', type=int, default=10, help="Rows per terminal section")
+    parser.add_argument('--list', action='store_true', help="List archived run IDs and exit")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit with status 1 if tests newly fail or get significantly slower")
+    return parser.parse_args()
+
+
+def main():
+    """Main comparison function"""
+    args = parse_args()
+    
+    if args.list:
+        print('\n'.join(list_runs()) or "No archived runs")
+        return 0
+    
+    try:
+        diff = diff_runs(args.baseline.split(','), args.current.split(','))
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+    
+    print(format_terminal(diff, limit=args.limit))
+    html_report = generate_html(diff, Path(args.html))
+    print(f"\n📊 HTML diff: {html_report}")
+    
+    if args.fail_on_regression and (diff['newly_failing'] or diff['slower']):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
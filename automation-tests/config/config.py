@@ -10,6 +10,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 REPORTS_DIR = BASE_DIR / 'reports'
 DATA_DIR = BASE_DIR / 'data'
 SCREENSHOTS_DIR = REPORTS_DIR / 'screenshots'
+TRACES_DIR = REPORTS_DIR / 'traces'
 
 # Application URLs
 BASE_URL = os.getenv('BASE_URL', 'http://localhost:3000')
@@ -20,15 +21,58 @@ BROWSER = os.getenv('BROWSER', 'chrome')  # chrome, firefox, edge
 HEADLESS = os.getenv('HEADLESS', 'false').lower() == 'true'
 WINDOW_SIZE = (1920, 1080)
 
+# Remote WebDriver (Selenium Grid or standalone server); comma-separated URLs, empty = local browsers
+GRID_URLS = os.getenv('SELENIUM_REMOTE_URL', '')
+GRID_ACQUIRE_TIMEOUT = 300  # Max wait for a free browser slot
+GRID_POLL_INTERVAL = 2  # Seconds between /status checks while the grid is full
+GRID_STATUS_TIMEOUT = 5
+GRID_SESSION_REUSE = os.getenv('GRID_SESSION_REUSE', 'true').lower() == 'true'
+GRID_MAX_IDLE_SESSIONS = 1  # Reset sessions kept per worker for the next test
+
 # Timeouts (in seconds)
 IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 20
 PAGE_LOAD_TIMEOUT = 30
+PAGE_SETTLE_TIMEOUT = 10  # Max wait for network to go idle after navigation
+PAGE_IDLE_MS = 500  # No new requests for this long = page settled
 
 # Test Configuration
 TAKE_SCREENSHOT_ON_FAILURE = True
-RETRY_FAILED_TESTS = 1
-PARALLEL_WORKERS = 4
+RETRY_FAILED_TESTS = 1  # In-place retries of tests known to be flaky (see Flaky Test Handling)
+PARALLEL_WORKERS = os.getenv('PARALLEL_WORKERS', 'auto')  # Number, or 'auto' to size from CPU and memory
+
+# Tiered pipeline of run_tests.py: each stage runs only if the previous one passed
+PIPELINE_STAGES = [
+    {'name': 'smoke', 'markers': 'smoke', 'workers': 1, 'maxfail': 1},
+    {'name': 'api', 'markers': 'api_error and not smoke', 'workers': 2, 'maxfail': 3},
+    {'name': 'regression', 'markers': 'not smoke and not api_error', 'workers': PARALLEL_WORKERS, 'maxfail': 10},
+]
+PIPELINE_RESULTS_FILE = REPORTS_DIR / '.cache' / 'pipeline_results.json'  # Results carried to the next stage
+PIPELINE_AUTH_STATE_FILE = REPORTS_DIR / '.cache' / 'auth_state.json'
+
+# Flaky Test Handling: flip rates over the archived runs in reports/runs
+# A flip is an outcome change between consecutive runs or a pass that needed a retry
+FLAKY_HISTORY_RUNS = 20
+FLAKY_MIN_RUNS = 3
+FLAKY_FLIP_RATE = 0.1  # Flips per run from which failures are retried in place
+QUARANTINE_MIN_RUNS = 5
+QUARANTINE_FLIP_RATE = 0.3  # Flips per run from which a test moves to the non-blocking quarantine lane
+
+# Result Cache (--result-cache): skip tests whose inputs match a previous passing run
+RESULT_CACHE_FILE = REPORTS_DIR / '.cache' / 'results.json'
+RESULT_CACHE_MAX_AGE_HOURS = 24  # Re-run cached passes at least this often (0 = never expire)
+RESULT_CACHE_TIMEOUT = 5  # Seconds to fetch the served asset manifest
+RESULT_CACHE_OPTIONS = ['--browser', '--headless', '--profile', '--block-profile', '--remote-url']
+RESULT_CACHE_EXCLUDE_MARKERS = ['trace']  # Besides opt-in groups, which run for their measurements
+
+# Resource Telemetry (Linux /proc) and adaptive parallelism
+RESOURCE_SAMPLE_INTERVAL = 2  # Seconds between samples of the run's processes
+RESOURCE_CPU_TARGET = 0.85  # Share of the cores the run may use
+RESOURCE_MEMORY_TARGET = 0.75  # Share of the memory the run may use
+RESOURCE_MAX_WORKERS = 32
+WORKER_CPU_ESTIMATE = 1.0  # Cores per worker (browser + driver + pytest) until a run has been measured
+WORKER_RSS_ESTIMATE = 700 * 1024 * 1024
+RESOURCE_PROFILE_FILE = REPORTS_DIR / '.cache' / 'resource_profile.json'
 
 # Test User Credentials
 TEST_USERS = {
@@ -46,6 +90,11 @@ TEST_USERS = {
     }
 }
 
+# Cached logins are re-checked against /Auth/me at most this often (seconds)
+AUTH_VERIFY_INTERVAL = 60
+# File shared by processes (xdist workers, pipeline stages) to reuse logins; unset keeps them per process
+AUTH_STATE_FILE = os.getenv('AUTH_STATE_FILE')
+
 # API Endpoints for Monitoring
 API_ENDPOINTS = {
     'auth': '/Auth',
@@ -76,6 +125,147 @@ PAGES_TO_TEST = [
     {'name': 'Reports', 'path': '/reports', 'requires_auth': True},
 ]
 
+# Route Discovery: pages of the app's route table (src/App.tsx) that PAGES_TO_TEST
+# doesn't cover are added to the page matrix (see utils/route_discovery.py)
+ROUTE_DISCOVERY = os.getenv('ROUTE_DISCOVERY', 'true').lower() == 'true'
+APP_SRC_DIR = BASE_DIR.parent / 'src'
+ROUTE_FILES = [APP_SRC_DIR / 'App.tsx', APP_SRC_DIR / 'config' / 'appRoutes.ts']
+ROUTE_CACHE_FILE = REPORTS_DIR / '.cache' / 'routes.json'
+ROUTE_DISCOVERY_EXCLUDE = []  # Paths that can't be checked by just loading them
+
+# Change-Impact Selection (--changed-since): repo paths whose changes re-run everything
+CHANGE_IMPACT_GLOBAL_PATHS = [
+    'package.json', 'package-lock.json', 'tsconfig.json', 'setupProxy.js', 'public/',
+    'automation-tests/conftest.py', 'automation-tests/config/', 'automation-tests/pytest.ini',
+    'automation-tests/requirements.txt',
+]
+
+# Emulation Profiles (network/CPU throttling, Chrome/Edge only)
+# Select with --profile; a comma-separated list runs tests as a matrix
+EMULATION_PROFILE = os.getenv('EMULATION_PROFILE', 'none')
+EMULATION_PROFILES = {
+    'none': {},
+    'fast-3g': {
+        'network': {'latency_ms': 562.5, 'download_kbps': 1440, 'upload_kbps': 675},
+    },
+    'slow-4g': {
+        'network': {'latency_ms': 150, 'download_kbps': 1600, 'upload_kbps': 750},
+    },
+    'cpu-4x': {
+        'cpu_slowdown': 4,
+    },
+    'slow-phone': {
+        'network': {'latency_ms': 150, 'download_kbps': 1600, 'upload_kbps': 750},
+        'cpu_slowdown': 4,
+    },
+}
+
+# Request Blocking Profiles
+# 'functional' drops fonts, images, media and analytics for faster functional runs;
+# 'full' keeps full fidelity for performance-budget runs. Chromium blocks by URL
+# pattern only, so resource types are matched by file extension. page_visits
+# snapshots always load with 'full'.
+REQUEST_BLOCKING_PROFILE = os.getenv('REQUEST_BLOCKING_PROFILE', 'functional')
+REQUEST_BLOCKING_PROFILES = {
+    'full': {
+        'url_patterns': [],
+        'resource_types': [],
+    },
+    'functional': {
+        'url_patterns': [
+            '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+            '*hotjar.com*', '*segment.io*', '*connect.facebook.net*', '*clarity.ms*',
+            '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+        ],
+        'resource_types': ['font', 'image', 'media'],
+    },
+}
+
+# Multi-tab page visits: read-only page snapshots are loaded as concurrent tabs
+# of one browser per profile; 1 visits pages one at a time. Pages loaded alongside
+# other tabs keep no load timings, so the default keeps the timing measurements
+TAB_CONCURRENCY = int(os.getenv('TAB_CONCURRENCY', '1'))
+TAB_POLL_INTERVAL = 0.1  # Seconds between round-robin checks of the open tabs
+
+# Test Data Seeding
+TEST_DATA_FILE = DATA_DIR / 'test_data.json'
+SEED_OFFLINE = os.getenv('SEED_OFFLINE', 'false').lower() == 'true'
+SEED_CONCURRENCY = int(os.getenv('SEED_CONCURRENCY', '8'))  # Parallel API requests
+SEED_BATCH_SIZE = int(os.getenv('SEED_BATCH_SIZE', '250'))  # Records per batch
+SEED_MAX_RETRIES = 3
+SEED_RANDOM_SEED = 360  # Same seed -> same generated records
+SEED_TAG_PREFIX = 'uh360-seed'
+SEED_COUNTS = {
+    'bank_accounts': int(os.getenv('SEED_BANK_ACCOUNTS', '5')),
+    'bills': int(os.getenv('SEED_BILLS', '200')),
+    'loans': int(os.getenv('SEED_LOANS', '20')),
+    'transactions': int(os.getenv('SEED_TRANSACTIONS', '10000')),
+}
+
+# Local stand-in API server (offline runs)
+STUB_API_HOST = os.getenv('STUB_API_HOST', '127.0.0.1')
+STUB_API_PORT = int(os.getenv('STUB_API_PORT', '5055'))
+
+# Data-Volume Benchmarks
+BENCHMARK_SIZES = [int(size) for size in os.getenv('BENCHMARK_SIZES', '100,1000,10000,50000').split(',')]
+BENCHMARK_PAGES = [
+    {'name': 'Transactions', 'path': '/transactions', 'resource': 'transactions'},
+    {'name': 'Bills', 'path': '/bills', 'resource': 'bills'},
+    {'name': 'Loans', 'path': '/loans', 'resource': 'loans'},
+    {'name': 'Bank Accounts', 'path': '/bank-accounts', 'resource': 'bank_accounts'},
+]
+LIST_ROW_SELECTOR = 'table tbody tr, .MuiDataGrid-row, [role="row"], .MuiCard-root'
+BENCHMARK_RENDER_TIMEOUT = 60  # seconds to wait for a list to finish rendering
+BENCHMARK_SETTLE_MS = 1000  # row count unchanged this long = fully rendered
+SCALING_ALERT_EXPONENT = 0.8  # growth exponent that triggers a pagination/virtualization flag
+
+# Interaction Latency (PerformanceObserver longtask/event entries)
+INTERACTION_TRACKING = os.getenv('INTERACTION_TRACKING', 'false').lower() == 'true'  # Always on with --benchmark/tracing
+INTERACTION_EVENT_THRESHOLD_MS = 16  # Smallest event duration the browser reports
+INTERACTION_SLOW_MS = 200  # INP "needs improvement" boundary
+INTERACTION_REPORT_LIMIT = 5  # Worst interactions listed per page
+
+# Bulk form filling: typing cost per field until one has been measured in the run (seconds)
+FORM_TYPING_FIELD_ESTIMATE_S = 0.3
+
+# API Latency Histograms
+LATENCY_HISTOGRAM_GROWTH = 1.05  # Bucket width ratio; quantiles accurate to ~2.5%
+LATENCY_HISTOGRAM_MAX_MS = 300000
+
+# Redundant API Call Detection
+API_DUPLICATE_CALL_LIMIT = 2  # Identical calls allowed per page load (StrictMode double-fetches in dev)
+N_PLUS_ONE_MIN_CALLS = 3  # Distinct IDs fetched from one endpoint before it counts as a loop
+WATERFALL_MIN_LENGTH = 3  # Sequential distinct endpoints before a chain is reported
+WATERFALL_MAX_GAP_MS = 100  # Max idle time between one call ending and the next starting
+
+# Payload Accounting
+RESOURCE_TIMING_BUFFER_SIZE = 1000  # Browser default is 250 entries
+PAYLOAD_PAGE_BUDGET_BYTES = 3 * 1024 * 1024
+PAYLOAD_LARGE_RESPONSE_BYTES = 1024 * 1024
+PAYLOAD_COMPRESSION_MIN_BYTES = 2048  # Smaller text responses gain little from compression
+PAYLOAD_REPORT_LIMIT = 10  # Largest responses listed per page and run
+
+# Performance Traces (@pytest.mark.trace / --trace-on-failure, Chrome/Edge only)
+# Same categories as the DevTools Performance panel
+TRACE_CATEGORIES = [
+    '-*', 'devtools.timeline', 'v8.execute', 'disabled-by-default-devtools.timeline',
+    'disabled-by-default-devtools.timeline.frame', 'disabled-by-default-devtools.timeline.stack',
+    'disabled-by-default-v8.cpu_profiler', 'blink.user_timing', 'loading', 'latencyInfo',
+]
+TRACE_CHUNK_SIZE = 1024 * 1024  # Bytes read from the trace stream at a time
+TRACE_STOP_TIMEOUT = 60
+
+# Memory Leak Soak (run with --soak)
+LEAK_ITERATIONS = int(os.getenv('LEAK_ITERATIONS', '10'))
+LEAK_WARMUP_ITERATIONS = 2  # Excluded from slopes: caches and lazy chunks fill up first
+LEAK_SETTLE_MS = 500
+# Retained growth per navigation cycle above which a route is flagged
+LEAK_THRESHOLDS = {
+    'js_heap_bytes': 256 * 1024,
+    'dom_nodes': 50,
+    'event_listeners': 20,
+}
+
 # Locators Strategy
 LOCATOR_STRATEGY = 'css'  # css, xpath, id, name, class
 
@@ -88,9 +278,23 @@ LOG_FILE = REPORTS_DIR / 'logs' / 'test_execution.log'
 HTML_REPORT_PATH = REPORTS_DIR / 'html' / 'test_report.html'
 JSON_REPORT_PATH = REPORTS_DIR / 'json' / 'test_results.json'
 API_ERRORS_REPORT = REPORTS_DIR / 'json' / 'api_errors.json'
+RESOURCE_SIZES_FILE = REPORTS_DIR / 'json' / 'resource_sizes.json'
+RESOURCE_SIZE_TIMEOUT = 5  # Seconds to fetch a blocked URL's size directly
+RUNS_DIR = REPORTS_DIR / 'runs'  # One archived JSON report per run, for compare_runs.py
+RUN_HISTORY_LIMIT = 30
+RUN_DIFF_REPORT_PATH = REPORTS_DIR / 'html' / 'run_diff.html'
+RUN_DIFF_MIN_CHANGE = 0.10  # Relative change below which single-run differences are noise
+RUN_DIFF_MIN_DELTA_S = 0.5  # Test duration change below which any difference is noise
+RUN_DIFF_SIGNIFICANCE = 0.05  # Welch's t-test p-value when several runs per side are compared
+
+# Live Progress (tail reports/live/events.jsonl, or serve a live page with --live-port)
+LIVE_EVENTS_FILE = REPORTS_DIR / 'live' / 'events.jsonl'
+LIVE_HOST = '127.0.0.1'
+LIVE_REFRESH_SECONDS = 1
+LIVE_SLOWEST_LIMIT = 5
 
 # Create necessary directories
-for directory in [REPORTS_DIR, DATA_DIR, SCREENSHOTS_DIR, 
+for directory in [REPORTS_DIR, DATA_DIR, SCREENSHOTS_DIR, TRACES_DIR,
                   REPORTS_DIR / 'html', REPORTS_DIR / 'json', 
                   REPORTS_DIR / 'logs']:
     directory.mkdir(parents=True, exist_ok=True)
@@ -3,7 +3,12 @@ Pytest configuration and fixtures
 """
 
 import pytest
+import inspect
 import logging
+import os
+import re
+import sys
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
@@ -16,10 +21,33 @@ from pathlib import Path
 
 from config.config import (
     BROWSER, HEADLESS, WINDOW_SIZE, IMPLICIT_WAIT, 
-    PAGE_LOAD_TIMEOUT, SCREENSHOTS_DIR, TAKE_SCREENSHOT_ON_FAILURE
+    PAGE_LOAD_TIMEOUT, SCREENSHOTS_DIR, TAKE_SCREENSHOT_ON_FAILURE, TRACES_DIR,
+    API_BASE_URL, SEED_OFFLINE, REQUEST_BLOCKING_PROFILE, REQUEST_BLOCKING_PROFILES,
+    EMULATION_PROFILE, LEAK_ITERATIONS, INTERACTION_TRACKING, API_DUPLICATE_CALL_LIMIT, TAB_CONCURRENCY,
+    GRID_URLS, RETRY_FAILED_TESTS, RESULT_CACHE_OPTIONS, RESULT_CACHE_EXCLUDE_MARKERS, APP_SRC_DIR,
+    PIPELINE_RESULTS_FILE
 )
 from utils.api_monitor import APIMonitor
 from utils.report_generator import ReportGenerator
+from utils.data_seeder import DataSeeder
+from utils.stub_api import StubAPIServer
+from utils.page_visit_cache import PageVisitCache
+from utils.auth_manager import AuthStateManager, scope_key
+from utils.request_blocking import RequestBlocker
+from utils.network_log import enable_performance_logging, forget_network_log
+from utils.emulation import EmulationProfile, parse_profiles
+from utils.interaction_tracker import get_interaction_tracker, forget_interaction_tracker
+from utils.api_call_analyzer import analyze_page_calls
+from utils.payload_accounting import RESOURCE_TIMING_BUFFER_SCRIPT
+from utils.cdp import add_init_script, is_chromium
+from utils.trace_recorder import TraceRecorder
+from utils.live_progress import LiveProgress, LiveProgressServer
+from utils.remote_grid import RemoteSessionPool, parse_grid_urls
+from utils.resource_sampler import ResourceSampler, recommend_workers, save_profile
+from utils.flakiness import FlakinessIndex
+from utils.result_cache import ResultCache, source_files
+from utils.route_discovery import load_routes, covers
+from utils.change_impact import ImpactMap, changed_files, is_global_change
 
 # Configure logging
 logging.basicConfig(
@@ -34,7 +62,38 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Global report generator
-report_generator = ReportGenerator()
+report_generator = ReportGenerator(os.environ.get('PYTEST_XDIST_WORKER', 'master'))
+
+# Logged-in browser state shared by tests on this worker
+auth_manager = AuthStateManager()
+
+# Remote WebDriver session pool (--remote-url), one per process
+grid_pool = None
+remote_cdp_warned = False
+
+# Live event stream, written by the controller only
+live_progress = None
+live_server = None
+
+# CPU/memory sampler of the whole run's process tree (controller only)
+resource_sampler = None
+
+# Flip rates of past runs: which tests are retried in place or quarantined
+flakiness = FlakinessIndex()
+
+# Passing results of earlier runs (--result-cache); saved by the controller
+result_cache = None
+
+# Stage of run_tests.py's pipeline this session runs: {'name', 'started', 'carried'} (controller only)
+pipeline_stage = None
+
+
+# Markers of slow, opt-in test groups -> (command line flag, description)
+OPT_IN_MARKERS = {
+    'benchmark': ("--benchmark", "Data-volume benchmark"),
+    'soak': ("--soak", "Memory-leak soak test"),
+    'cache_efficiency': ("--cache-compare", "Warm vs cold cache comparison"),
+}
 
 
 def pytest_addoption(parser):
@@ -51,17 +110,227 @@ def pytest_addoption(parser):
         default=HEADLESS,
         help="Run tests in headless mode"
     )
+    parser.addoption(
+        "--profile",
+        action="store",
+        default=EMULATION_PROFILE,
+        help="Emulation profile(s): none, fast-3g, slow-4g, cpu-4x, slow-phone; comma-separate for a matrix"
+    )
+    parser.addoption(
+        "--block-profile",
+        action="store",
+        default=REQUEST_BLOCKING_PROFILE,
+        choices=list(REQUEST_BLOCKING_PROFILES),
+        help="Request blocking profile: 'functional' skips fonts/images/analytics, 'full' blocks nothing"
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run data-volume benchmarks (marked 'benchmark')"
+    )
+    parser.addoption(
+        "--trace-on-failure",
+        action="store_true",
+        default=False,
+        help="Record a performance trace of every test and keep it if the test fails"
+    )
+    parser.addoption(
+        "--soak",
+        action="store_true",
+        default=False,
+        help="Run memory-leak soak tests (marked 'soak')"
+    )
+    parser.addoption(
+        "--cache-compare",
+        action="store_true",
+        default=False,
+        help="Run warm vs cold cache comparisons (marked 'cache_efficiency')"
+    )
+    parser.addoption(
+        "--soak-iterations",
+        action="store",
+        type=int,
+        default=LEAK_ITERATIONS,
+        help="Navigation cycles per memory-leak soak test"
+    )
+    parser.addoption(
+        "--quarantine",
+        action="store",
+        default="run",
+        choices=("run", "skip", "only"),
+        help="Quarantined (chronically flaky) tests: run non-blocking, leave out, or run only them"
+    )
+    parser.addoption(
+        "--changed-since",
+        action="store",
+        default=None,
+        metavar="GIT_REF",
+        help="Only run tests affected by changes since this git ref, plus smoke tests"
+    )
+    parser.addoption(
+        "--result-cache",
+        action="store_true",
+        default=False,
+        help="Skip tests whose inputs (bundle, sources, config, backend) match a previous passing run"
+    )
+    parser.addoption(
+        "--remote-url",
+        action="store",
+        default=GRID_URLS,
+        help="Selenium Grid / standalone server URL(s), comma-separated; empty runs local browsers"
+    )
+    parser.addoption(
+        "--tabs",
+        action="store",
+        type=int,
+        default=TAB_CONCURRENCY,
+        help="Concurrent tabs for cached page visits (1 = one page at a time)"
+    )
+    parser.addoption(
+        "--pipeline-stage",
+        action="store",
+        default=None,
+        help="Name of the run_tests.py pipeline stage; continues the report of the earlier stages"
+    )
+    parser.addoption(
+        "--live-port",
+        action="store",
+        type=int,
+        default=None,
+        help="Serve a live progress page on this port (0 picks a free port)"
+    )
 
 
-@pytest.fixture(scope='function')
-def driver(request):
-    """WebDriver fixture"""
-    browser = request.config.getoption("--browser")
-    headless = request.config.getoption("--headless")
+def pytest_generate_tests(metafunc):
+    """Run browser tests once per emulation profile when several are selected"""
+    if 'emulation_profile' in metafunc.fixturenames:
+        profiles = parse_profiles(metafunc.config.getoption("--profile"))
+        if len(profiles) > 1:
+            metafunc.parametrize('emulation_profile', profiles, indirect=True, ids=profiles)
+
+
+def active_profile(item):
+    """Emulation profile a test ran under"""
+    callspec = getattr(item, 'callspec', None)
+    if callspec and 'emulation_profile' in callspec.params:
+        return callspec.params['emulation_profile']
+    return parse_profiles(item.config.getoption("--profile"))[0]
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip opt-in test groups unless requested"""
+    for marker, (option, reason) in OPT_IN_MARKERS.items():
+        if config.getoption(option):
+            continue
+        skip = pytest.mark.skip(reason=f"{reason}: run with {option}")
+        for item in items:
+            if marker in item.keywords:
+                item.add_marker(skip)
     
-    logger.info(f"Initializing {browser} driver (headless: {headless})")
+    # Quarantine lane: chronically flaky tests run non-blocking, or on their own
+    lane = config.getoption("--quarantine")
+    selected, deselected = [], []
+    for item in items:
+        stats = flakiness.get(item.nodeid)
+        quarantined = item.get_closest_marker('quarantine') is not None or flakiness.status(item.nodeid) == 'quarantined'
+        if quarantined and item.get_closest_marker('quarantine') is None:
+            item.add_marker(pytest.mark.quarantine)
+        if lane == 'skip' and quarantined or lane == 'only' and not quarantined:
+            deselected.append(item)
+            continue
+        if quarantined:
+            reason = f"quarantined, flip rate {stats['flip_rate']:.0%}" if stats else "quarantined"
+            item.add_marker(pytest.mark.xfail(reason=reason, strict=False))
+        selected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
     
-    # Initialize driver based on browser choice
+    if config.getoption("--changed-since"):
+        select_changed(config, items)
+    
+    if result_cache:
+        apply_result_cache(config, items)
+
+
+def item_page_paths(item):
+    """Pages a test exercises: its page parameter or the PAGE_PATH of the page objects it uses"""
+    callspec = getattr(item, 'callspec', None)
+    if callspec and isinstance(callspec.params.get('page'), dict):
+        return [callspec.params['page']['path']]
+    module = getattr(item, 'module', None)
+    return [value.PAGE_PATH for value in vars(module).values()
+            if isinstance(value, type) and hasattr(value, 'PAGE_PATH')] if module else []
+
+
+def suite_files():
+    """conftest.py and the utils/pages its hooks and fixtures run every test through"""
+    return set(source_files(sys.modules[__name__]))
+
+
+def select_changed(config, items):
+    """Deselect tests that no change since --changed-since can affect; smoke tests always run"""
+    ref = config.getoption("--changed-since")
+    try:
+        changed = changed_files(ref)
+        impact = ImpactMap(load_routes())
+    except (OSError, ValueError) as e:
+        raise pytest.UsageError(f"--changed-since {ref}: {e}")
+    
+    app_changes = [path for path in changed if path.resolve().is_relative_to(APP_SRC_DIR.resolve())]
+    all_routes, routes = impact.affected_routes(app_changes)
+    changed = {path.resolve() for path in changed}
+    run_all = all_routes or any(is_global_change(path) for path in changed) or bool(changed & suite_files())
+    
+    selected, deselected = [], []
+    for item in items:
+        paths = [impact.resolve_redirect(path) for path in item_page_paths(item)]
+        module = getattr(item, 'module', None)
+        # Tests that can't be tied to a page always run
+        if (run_all or not paths or item.get_closest_marker('smoke')
+                or module and changed & set(source_files(module))
+                or any(covers(path, route) for path in paths for route in routes)):
+            selected.append(item)
+        else:
+            deselected.append(item)
+    
+    logger.info(f"Changes since {ref}: {len(changed)} files, "
+                f"{'all routes' if run_all else f'{len(routes)} routes'} affected; "
+                f"running {len(selected)} of {len(items)} tests")
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def apply_result_cache(config, items):
+    """Skip tests whose fingerprint matches a previous passing run"""
+    global result_cache
+    if not result_cache.prepare({option: config.getoption(option) for option in RESULT_CACHE_OPTIONS}):
+        result_cache = None
+        return
+    
+    excluded = list(OPT_IN_MARKERS) + RESULT_CACHE_EXCLUDE_MARKERS + ['quarantine']
+    # Every test also runs through conftest's fixtures and the utils/pages they use
+    shared = suite_files()
+    hits = 0
+    for item in items:
+        # Measurements and known-flaky outcomes are not worth reusing
+        if (not hasattr(item, 'module') or flakiness.status(item.nodeid) != 'stable'
+                or any(item.get_closest_marker(marker) for marker in excluded)):
+            continue
+        fingerprint = result_cache.fingerprint(item.nodeid, item.module, shared)
+        item.user_properties.append(('fingerprint', fingerprint))
+        cached = result_cache.lookup(item.nodeid, fingerprint)
+        if cached:
+            item.cached_result = cached
+            item.add_marker(pytest.mark.skip(reason=f"cached pass from run {cached['run_id']}"))
+            hits += 1
+    logger.info(f"Result cache: {hits} of {len(items)} tests unchanged since their last pass")
+
+
+def browser_options(browser, headless, blocker=None):
+    """Options for a local or remote browser"""
     if browser.lower() == 'chrome':
         options = webdriver.ChromeOptions()
         if headless:
@@ -69,31 +338,46 @@ def driver(request):
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument(f'--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}')
-        driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=options
-        )
+        add_background_tab_arguments(options)
+        enable_performance_logging(options, browser)
     elif browser.lower() == 'firefox':
         options = webdriver.FirefoxOptions()
         if headless:
             options.add_argument('--headless')
         options.add_argument(f'--width={WINDOW_SIZE[0]}')
         options.add_argument(f'--height={WINDOW_SIZE[1]}')
-        driver = webdriver.Firefox(
-            service=FirefoxService(GeckoDriverManager().install()),
-            options=options
-        )
+        if blocker:
+            for name, value in blocker.firefox_preferences().items():
+                options.set_preference(name, value)
     elif browser.lower() == 'edge':
         options = webdriver.EdgeOptions()
         if headless:
             options.add_argument('--headless')
         options.add_argument(f'--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}')
-        driver = webdriver.Edge(
-            service=EdgeService(EdgeChromiumDriverManager().install()),
-            options=options
-        )
+        add_background_tab_arguments(options)
+        enable_performance_logging(options, browser)
     else:
         raise ValueError(f"Unsupported browser: {browser}")
+    return options
+
+
+def create_driver(browser, headless, blocker=None, emulation=None):
+    """Create and configure a WebDriver instance"""
+    options = browser_options(browser, headless, blocker)
+    
+    if grid_pool:
+        # Remote session from the grid (pooled sessions are reused per option set)
+        logger.info(f"Requesting remote {browser} session (headless: {headless})")
+        driver = grid_pool.acquire(session_key(browser, headless, blocker), options)
+        warn_remote_cdp(driver)
+    else:
+        logger.info(f"Initializing {browser} driver (headless: {headless})")
+        if browser.lower() == 'chrome':
+            driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+        elif browser.lower() == 'firefox':
+            driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
+        else:
+            driver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()), options=options)
     
     # Set timeouts
     driver.implicitly_wait(IMPLICIT_WAIT)
@@ -103,19 +387,218 @@ def driver(request):
     if not headless:
         driver.maximize_window()
     
+    if not prepare_tab(driver, blocker, emulation):
+        release_driver(driver)
+        pytest.skip(f"Emulation profile '{emulation.name}' requires Chrome or Edge")
+    
+    return driver
+
+
+def warn_remote_cdp(driver):
+    """Say once per process that DevTools-based measurements are off for grid sessions"""
+    global remote_cdp_warned
+    if remote_cdp_warned or is_chromium(driver):
+        return
+    remote_cdp_warned = True
+    logger.warning("Remote sessions have no DevTools (CDP) access: request blocking, emulation profiles, "
+                   "tracing and network-log payload sizes are off for this run")
+
+
+def session_key(browser, headless, blocker):
+    """Options a pooled grid session was started with"""
+    return (browser.lower(), headless, blocker.profile_name if blocker else None)
+
+
+def release_driver(driver):
+    """Quit a local browser, or hand a grid session back to the pool"""
+    if grid_pool and grid_pool.owns(driver):
+        forget_network_log(driver)
+        forget_interaction_tracker(driver)
+        grid_pool.release(driver)
+    else:
+        driver.quit()
+
+
+def add_background_tab_arguments(options):
+    """Keep timers and rendering of background tabs at full speed (multi-tab page visits)"""
+    options.add_argument('--disable-background-timer-throttling')
+    options.add_argument('--disable-backgrounding-occluded-windows')
+    options.add_argument('--disable-renderer-backgrounding')
+
+
+def prepare_tab(driver, blocker=None, emulation=None):
+    """Per-tab DevTools setup of the current tab; False if the emulation can't be applied"""
+    # Block non-essential requests
+    if blocker:
+        blocker.activate(driver)
+    
+    # Throttle network/CPU
+    if emulation and not emulation.apply(driver):
+        return False
+    
+    # Keep Resource Timing entries of request-heavy pages for payload accounting
+    add_init_script(driver, RESOURCE_TIMING_BUFFER_SCRIPT)
+    
+    return True
+
+
+@pytest.fixture(scope='function')
+def emulation_profile(request):
+    """Name of the emulation profile for this test"""
+    return getattr(request, 'param', None) or parse_profiles(request.config.getoption("--profile"))[0]
+
+
+@pytest.fixture(scope='function')
+def driver(request, emulation_profile):
+    """WebDriver fixture"""
+    # @pytest.mark.blocking_profile('full') overrides --block-profile
+    marker = request.node.get_closest_marker('blocking_profile')
+    blocker = RequestBlocker(marker.args[0] if marker else request.config.getoption("--block-profile"))
+    
+    driver = create_driver(
+        request.config.getoption("--browser"),
+        request.config.getoption("--headless"),
+        blocker,
+        EmulationProfile(emulation_profile)
+    )
+    
+    # Trace tests marked @pytest.mark.trace, or every test with --trace-on-failure
+    always_trace = request.node.get_closest_marker('trace') is not None
+    traced = always_trace or request.config.getoption("--trace-on-failure")
+    
+    # Interaction latency costs two extra round trips per action, so it's
+    # measured with INTERACTION_TRACKING=true, --benchmark or tracing only
+    if INTERACTION_TRACKING or traced or request.config.getoption("--benchmark"):
+        get_interaction_tracker(driver).install()
+    
+    recorder = None
+    if traced:
+        recorder = TraceRecorder(driver, TRACES_DIR / f"{safe_file_name(request.node.nodeid)}.json.gz")
+        if not recorder.start():
+            recorder = None
+    
     yield driver
     
+    rep_call = getattr(request.node, 'rep_call', None)
+    failed = rep_call is not None and rep_call.failed
+    
+    # Keep the trace if requested or if the test failed
+    if recorder:
+        trace_path = recorder.stop()
+        if trace_path and (always_trace or failed):
+            report_generator.attach_trace(request.node.nodeid, trace_path)
+        elif trace_path:
+            trace_path.unlink(missing_ok=True)
+    
+    # Record what the blocking profile saved
+    try:
+        report_generator.add_blocking_savings(request.node.nodeid, blocker.collect_savings(driver))
+    except Exception as e:
+        logger.debug(f"Could not collect request blocking savings: {e}")
+    
+    # Record interaction latencies of the test's clicks and typing, bulk form fills and element lookups
+    tracker = get_interaction_tracker(driver)
+    report_generator.add_interactions(request.node.nodeid, tracker.interactions, emulation_profile)
+    report_generator.add_form_fills(request.node.nodeid, tracker.form_fills)
+    report_generator.add_element_cache(tracker.element_cache)
+    
     # Take screenshot on failure
-    if request.node.rep_call.failed and TAKE_SCREENSHOT_ON_FAILURE:
+    if failed and TAKE_SCREENSHOT_ON_FAILURE:
         take_screenshot(driver, request.node.nodeid)
     
     # Cleanup
-    driver.quit()
+    release_driver(driver)
     logger.info("Driver closed")
 
 
+@pytest.fixture(scope='session')
+def auth_state():
+    """Shared login state manager used by the auth marker"""
+    return auth_manager
+
+
+@pytest.fixture(autouse=True)
+def auth_from_marker(request):
+    """Log in for tests marked @pytest.mark.auth(user=..., scope=...)
+
+    The login is performed once per requested scope (class, module or
+    session) and restored into each test's browser afterwards.
+    """
+    if request.node.get_closest_marker('auth') is None:
+        return
+    apply_auth_marker(request.node, request.getfixturevalue('driver'))
+
+
+def apply_auth_marker(item, driver):
+    """Log the driver in as the item's auth marker asks and open its landing page"""
+    marker = item.get_closest_marker('auth')
+    user = marker.kwargs.get('user', 'valid_user')
+    scope = marker.kwargs.get('scope', 'class')
+    landing = marker.kwargs.get('landing', '/dashboard')
+    auth_manager.authenticate(driver, user, scope_key(item, scope), landing)
+
+
+def pytest_runtest_teardown(item, nextitem):
+    """Drop cached logins whose scope ends with this test
+
+    Session logins live as long as the worker, and module logins until
+    the worker moves on to another module, even across unmarked tests.
+    """
+    marker = item.get_closest_marker('auth')
+    if marker is None:
+        return
+    scope = marker.kwargs.get('scope', 'class')
+    key = scope_key(item, scope)
+    if scope == 'session':
+        return
+    if scope == 'module':
+        if nextitem is None or scope_key(nextitem, 'module') != key:
+            auth_manager.release(key)
+        return
+    next_marker = nextitem.get_closest_marker('auth') if nextitem else None
+    if next_marker is None or scope_key(nextitem, next_marker.kwargs.get('scope', 'class')) != key:
+        auth_manager.release(key)
+
+
+@pytest.fixture(scope='session')
+def page_visits(request):
+    """Session cache of page snapshots, one visit per page per worker
+
+    Snapshots feed the page timings, payload accounting and run diffs,
+    so they load pages at full fidelity whatever --block-profile says.
+    """
+    browser = request.config.getoption("--browser")
+    headless = request.config.getoption("--headless")
+    blocker = RequestBlocker('full')
+    cache = PageVisitCache(
+        lambda profile: create_driver(browser, headless, blocker, EmulationProfile(profile)),
+        auth_manager,
+        setup_tab=lambda driver, profile: prepare_tab(driver, blocker, EmulationProfile(profile)),
+        tabs=request.config.getoption("--tabs"),
+        release_driver=release_driver
+    )
+    
+    # Batch the pages this session's tests ask for into tabs
+    planned = {}
+    for item in request.session.items:
+        page = getattr(item, 'callspec', None) and item.callspec.params.get('page')
+        if page and 'page_visits' in item.fixturenames:
+            planned.setdefault(page['path'], page)
+    cache.plan(planned.values())
+    
+    yield cache
+    
+    for snapshot in cache.snapshots.values():
+        report_generator.add_page_snapshot(snapshot)
+        report_generator.add_api_calls(snapshot['api_calls'], snapshot['profile'])
+        report_generator.add_api_call_analysis(analyze_page_calls(snapshot['name'], snapshot['api_calls']))
+        if snapshot['payload']:
+            report_generator.add_payload(snapshot['payload'], snapshot['profile'])
+    cache.close()
+
+
 @pytest.fixture(scope='function')
-def api_monitor(driver):
+def api_monitor(driver, emulation_profile, request):
     """API Monitor fixture"""
     monitor = APIMonitor(driver)
     
@@ -127,10 +610,53 @@ def api_monitor(driver):
     
     yield monitor
     
+    # Feed call durations into the latency histograms and look for redundant calls
+    calls = monitor.get_api_calls()
+    report_generator.add_api_calls(calls, emulation_profile)
+    try:
+        page = driver.execute_script("return location.pathname;")
+        report_generator.add_api_call_analysis(analyze_page_calls(page, calls))
+    except Exception as e:
+        logger.debug(f"Could not analyze API calls: {e}")
+    
     # Save errors at the end of test
     errors = monitor.get_errors()
     if errors:
         monitor.save_errors_to_file(test_name="test")
+        request.node.user_properties.append(('api_errors', [
+            {'method': e.get('method'), 'url': e.get('url'), 'status': e.get('status')} for e in errors
+        ]))
+
+
+@pytest.fixture(scope='session')
+def reporter():
+    """Session report generator, for tests that record extra measurements"""
+    return report_generator
+
+
+@pytest.fixture(scope='session')
+def data_seeder():
+    """Bulk test data seeder, cleaned up at the end of the session"""
+    stub_server = StubAPIServer().start() if SEED_OFFLINE else None
+    seeder = DataSeeder(
+        api_base_url=stub_server.base_url if stub_server else API_BASE_URL,
+        dataset='pytest'
+    )
+    
+    yield seeder
+    
+    try:
+        seeder.cleanup()
+    except Exception as e:
+        logger.warning(f"Could not clean up seeded data: {e}")
+    finally:
+        if stub_server:
+            stub_server.stop()
+
+
+def safe_file_name(test_name):
+    """File name for a test node id"""
+    return re.sub(r'[^\w.-]+', '_', test_name.replace('::', '_'))
 
 
 def take_screenshot(driver, test_name):
@@ -141,8 +667,7 @@ def take_screenshot(driver, test_name):
         
         # Generate filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe_test_name = test_name.replace('/', '_').replace('::', '_')
-        filename = f"{safe_test_name}_{timestamp}.png"
+        filename = f"{safe_file_name(test_name)}_{timestamp}.png"
         filepath = SCREENSHOTS_DIR / filename
         
         # Take screenshot
@@ -158,6 +683,81 @@ def take_screenshot(driver, test_name):
         return None
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Retry known-flaky tests in place, in the same (warm) browser and fixtures"""
+    outcome = yield
+    item = pyfuncitem
+    item.retry = {'attempts': 1, 'retry_time_s': 0.0, 'passed_on_retry': False}
+    if (outcome.excinfo is None or flakiness.status(item.nodeid) != 'flaky'
+            or isinstance(outcome.excinfo[1], pytest.skip.Exception)):
+        return
+    
+    # A cached page snapshot would hand the retry the same failing page, so
+    # page_visits tests are retried only if their page can be revisited
+    page_visits = item.funcargs.get('page_visits')
+    page = item.funcargs.get('page')
+    if page_visits is not None and not page:
+        return
+    
+    parameters = inspect.signature(item.obj).parameters
+    testargs = {arg: value for arg, value in item.funcargs.items() if arg in parameters}
+    for attempt in range(RETRY_FAILED_TESTS):
+        started = time.perf_counter()
+        logger.info(f"🔁 Retrying flaky test {item.nodeid} ({outcome.excinfo[1]!r})")
+        try:
+            if item.get_closest_marker('auth') and 'driver' in item.funcargs:
+                apply_auth_marker(item, item.funcargs['driver'])
+            if page_visits is not None:
+                page_visits.forget(page, item.funcargs.get('emulation_profile', 'none'))
+            item.obj(**testargs)
+        except (KeyboardInterrupt, SystemExit) as e:
+            outcome.force_exception(e)
+            return
+        except BaseException as e:
+            # pytest.fail() and pytest.skip() raise BaseExceptions too
+            outcome.force_exception(e)
+        else:
+            outcome.force_result(True)
+            item.retry['passed_on_retry'] = True
+        finally:
+            item.retry['attempts'] += 1
+            item.retry['retry_time_s'] += time.perf_counter() - started
+        # A pass or a skip ends the retries
+        if item.retry['passed_on_retry'] or isinstance(outcome.excinfo[1], pytest.skip.Exception):
+            break
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Enforce @pytest.mark.api_call_limit(max_duplicates=N) after the test body"""
+    outcome = yield
+    marker = item.get_closest_marker('api_call_limit')
+    if not marker or outcome.excinfo:
+        return
+    limit = marker.kwargs.get('max_duplicates', API_DUPLICATE_CALL_LIMIT)
+    
+    # Calls of the current page (api_monitor) or of the cached page visit
+    if 'api_monitor' in item.funcargs:
+        monitor = item.funcargs['api_monitor']
+        page = monitor.driver.execute_script("return location.pathname;")
+        calls = monitor.driver.execute_script("return window.apiCalls || [];")
+    elif 'page_visits' in item.funcargs and 'page' in item.funcargs:
+        profile = item.funcargs.get('emulation_profile', 'none')
+        snapshot = item.funcargs['page_visits'].get(item.funcargs['page'], profile)
+        page, calls = snapshot['name'], snapshot['api_calls']
+    else:
+        raise pytest.UsageError(f"{item.nodeid}: api_call_limit needs the api_monitor or page_visits fixture")
+    
+    analysis = analyze_page_calls(page, calls)
+    over_limit = [d for d in analysis['duplicates'] if d['count'] > limit]
+    if over_limit:
+        outcome.force_exception(AssertionError(
+            f"{page} repeated API calls beyond the limit of {limit}: " +
+            ", ".join(f"{d['request']} ×{d['count']}" for d in over_limit)
+        ))
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook to capture test results"""
@@ -167,6 +767,16 @@ def pytest_runtest_makereport(item, call):
     # Add report to request for screenshot logic
     setattr(item, f"rep_{rep.when}", rep)
     
+    # Tests skipped by the result cache report their cached pass
+    if rep.when == 'setup' and rep.skipped and hasattr(item, 'cached_result'):
+        report_generator.add_test_result(
+            test_name=item.nodeid,
+            status='PASSED',
+            duration=item.cached_result['duration'],
+            profile=active_profile(item),
+            cached=True
+        )
+    
     # Capture test result for report
     if rep.when == 'call':
         test_name = item.nodeid
@@ -174,25 +784,196 @@ def pytest_runtest_makereport(item, call):
         duration = rep.duration
         error_message = str(rep.longrepr) if rep.failed else None
         
+        # Quarantined tests run as non-strict xfail; record what really happened
+        quarantined = item.get_closest_marker('quarantine') is not None
+        if quarantined and hasattr(rep, 'wasxfail'):
+            status = 'PASSED' if rep.passed else 'FAILED'
+            error_message = str(rep.longrepr) if rep.skipped and rep.longrepr else None
+        
         report_generator.add_test_result(
             test_name=test_name,
             status=status,
             duration=duration,
-            error_message=error_message
+            error_message=error_message,
+            profile=active_profile(item),
+            quarantined=quarantined,
+            **getattr(item, 'retry', {})
         )
 
 
+def pytest_configure(config):
+    """Connect to the remote grid(s) and load flakiness history and result cache, in every xdist worker"""
+    global grid_pool, flakiness, result_cache
+    urls = parse_grid_urls(config.getoption("--remote-url"))
+    if urls:
+        grid_pool = RemoteSessionPool(urls, config.getoption("--browser"))
+    flakiness = FlakinessIndex.from_history()
+    if config.getoption("--result-cache"):
+        result_cache = ResultCache()
+
+
+def pytest_unconfigure(config):
+    """End pooled grid sessions"""
+    if grid_pool:
+        grid_pool.close()
+
+
+def grid_sessions_per_worker(config):
+    """Grid sessions one worker can hold at once
+
+    The test's own driver, plus the anonymous and logged-in page_visits
+    browsers of every emulation profile, which stay open until the
+    worker finishes.
+    """
+    return 1 + 2 * len(parse_profiles(config.getoption("--profile")))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """-n auto: one worker per grid slot, or as many as local CPU and memory allow"""
+    urls = parse_grid_urls(config.getoption("--remote-url"))
+    if urls:
+        slots = RemoteSessionPool(urls, config.getoption("--browser")).total_slots()
+        sessions = grid_sessions_per_worker(config)
+        workers = max(slots // sessions, 1)
+        logger.info(f"Grid has {slots} {config.getoption('--browser')} slots; "
+                    f"{workers} workers of up to {sessions} sessions each")
+        if slots < sessions:
+            logger.warning(f"A worker can hold {sessions} grid sessions but the grid has {slots} slots; "
+                           f"page visits may wait for GRID_ACQUIRE_TIMEOUT and fail")
+        return workers
+    # A pipeline stage's load average still includes the previous stage's browsers
+    recommendation = recommend_workers(subtract_load=not config.getoption("--pipeline-stage"))
+    logger.info(f"Using {recommendation['workers']} workers (limited by {recommendation['limited_by']}, "
+                f"{'measured' if recommendation['measured'] else 'estimated'} cost per worker)")
+    return recommendation['workers']
+
+
+def pytest_sessionstart(session):
+    """Open the live event stream (and page) and start resource sampling on the controller"""
+    global live_progress, live_server, resource_sampler, pipeline_stage
+    if hasattr(session.config, 'workerinput'):
+        return
+    
+    # Later pipeline stages add to the report of the earlier ones
+    stage = session.config.getoption('--pipeline-stage')
+    if stage:
+        report_generator.load_stage_results(PIPELINE_RESULTS_FILE)
+        pipeline_stage = {'name': stage, 'started': time.perf_counter(),
+                          'carried': len(report_generator.test_results)}
+    
+    # Local browsers only: grid sessions run on other machines
+    if not grid_pool:
+        resource_sampler = ResourceSampler(getattr(session.config.option, 'numprocesses', None) or 1)
+        if not resource_sampler.start():
+            resource_sampler = None
+    
+    live_progress = LiveProgress()
+    if not getattr(session.config.option, 'numprocesses', None):
+        live_progress.worker_ready('master')
+    port = session.config.getoption('--live-port')
+    if port is not None:
+        live_server = LiveProgressServer(live_progress, port).start()
+
+
+def pytest_collection_finish(session):
+    """Total test count when running without xdist"""
+    if live_progress and not getattr(session.config.option, 'numprocesses', None):
+        live_progress.collected(len(session.items))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodeready(node):
+    """Count an xdist worker as available"""
+    if live_progress:
+        live_progress.worker_ready(node.gateway.id)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    """Total test count, as collected by the xdist workers"""
+    if live_progress:
+        live_progress.collected(len(ids))
+
+
+def pytest_runtest_logreport(report):
+    """Record passes for the result cache and stream test start, finish and API errors
+
+    Runs on the controller for every worker's reports too; only the
+    controller saves the cache.
+    """
+    fingerprint = dict(report.user_properties).get('fingerprint')
+    if result_cache and fingerprint:
+        result_cache.record(report.nodeid, report.when, report.outcome, report.duration,
+                            fingerprint, report_generator.run_id)
+    if not live_progress:
+        return
+    if report.when == 'setup':
+        worker = report.node.gateway.id if hasattr(report, 'node') else 'master'
+        live_progress.test_started(report.nodeid, worker)
+    message = report.longreprtext.strip().splitlines()[-1] if report.failed and report.longreprtext.strip() else None
+    live_progress.phase_finished(report.nodeid, report.outcome, report.duration, message)
+    if report.when == 'teardown':
+        for name, errors in report.user_properties:
+            if name == 'api_errors':
+                live_progress.api_errors_found(report.nodeid, errors)
+        live_progress.test_finished(report.nodeid)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the results of a finished xdist worker"""
+    worker_report = getattr(node, 'workeroutput', {}).get('report')
+    if worker_report:
+        report_generator.merge(worker_report)
+
+
 def pytest_sessionfinish(session, exitstatus):
     """Hook to generate final report"""
+    # xdist workers hand their results to the controller, which writes the report
+    if hasattr(session.config, 'workerinput'):
+        session.config.workeroutput['report'] = report_generator.export()
+        return
+    
+    if live_progress:
+        live_progress.session_finished(int(exitstatus))
+    if live_server:
+        live_server.stop()
+    
+    report_generator.add_flakiness(flakiness.stats)
+    if result_cache:
+        result_cache.save()
+    if pipeline_stage:
+        report_generator.add_stage(
+            pipeline_stage['name'],
+            time.perf_counter() - pipeline_stage['started'],
+            len(report_generator.test_results) - pipeline_stage['carried'],
+            int(exitstatus)
+        )
+    
+    # Resource usage, and the per-worker cost for sizing the next run
+    if resource_sampler:
+        usage = resource_sampler.stop()
+        if usage:
+            report_generator.add_resource_usage(usage)
+            if usage['peak_browsers']:
+                save_profile(usage['per_worker'])
+    
     logger.info("Generating test reports...")
     
     # Generate JSON report
-    report_generator.generate_json_report()
+    report = report_generator.generate_json_report()
     
     # Generate HTML report
-    html_report = report_generator.generate_html_report()
+    html_report = report_generator.generate_html_report(report)
     if html_report:
         logger.info(f"✓ HTML Report: {html_report}")
     
+    # Keep runs that executed tests for run-to-run diffs and flakiness history
+    if report and report_generator.test_results and not session.config.option.collectonly:
+        report_generator.archive_run(report)
+    if pipeline_stage:
+        report_generator.save_stage_results(PIPELINE_RESULTS_FILE)
+    
     logger.info("Test execution completed")
 
@@ -4,36 +4,80 @@ Base Page class with common methods for all page objects
 
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 import logging
+import time
 from config.config import EXPLICIT_WAIT, BASE_URL
+from utils.interaction_tracker import get_interaction_tracker
+from utils.form_fill import FILL_FORM_SCRIPT, record_typing, typing_estimate
 
 logger = logging.getLogger(__name__)
 
 
 class BasePage:
-    """Base class for all page objects"""
+    """Base class for all page objects
+
+    Elements found by locator are cached on the page object, so chained
+    actions (e.g. checking the login form, then logging in) don't query
+    the DOM again. The cache is cleared by open()/refresh_page(), after
+    clicks and Enter keys (which may change the route) and when
+    wait_for_url_contains() sees the URL change. Cache hits don't check
+    the current URL, so after a route change made some other way call
+    invalidate_cache(); a stale handle is re-found and the action retried.
+    """
 
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, EXPLICIT_WAIT)
         self.base_url = BASE_URL
+        self.interactions = get_interaction_tracker(driver)
+        self.element_cache = {}  # locator -> WebElement
+        self.cache_stats = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidations': 0}
+
+    def _count(self, kind):
+        self.cache_stats[kind] += 1
+        self.interactions.element_cache[kind] += 1
+
+    def invalidate_cache(self, locator=None):
+        """Forget one cached element, or all of them"""
+        if locator is not None:
+            self.element_cache.pop(locator, None)
+        elif self.element_cache:
+            self.element_cache.clear()
+            self._count('invalidations')
+
+    def _with_element(self, locator, action, timeout=EXPLICIT_WAIT):
+        """action(element) on the (cached) element, re-finding it once if it went stale"""
+        try:
+            return action(self.find_element(locator, timeout))
+        except StaleElementReferenceException:
+            self._count('stale')
+            self.invalidate_cache(locator)
+            return action(self.find_element(locator, timeout))
 
     def open(self, path=''):
         """Open a specific page"""
         url = f"{self.base_url}{path}"
         logger.info(f"Opening URL: {url}")
+        self.invalidate_cache()
         self.driver.get(url)
         return self
 
     def find_element(self, locator, timeout=EXPLICIT_WAIT):
-        """Find an element with explicit wait"""
+        """Find an element with explicit wait (the cached handle if there is one)"""
+        element = self.element_cache.get(locator)
+        if element is not None:
+            self._count('hits')
+            return element
+        self._count('misses')
         try:
             element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located(locator)
             )
             logger.debug(f"Element found: {locator}")
+            self.element_cache[locator] = element
             return element
         except TimeoutException:
             logger.error(f"Element not found: {locator}")
@@ -53,35 +97,100 @@ class BasePage:
 
     def click(self, locator, timeout=EXPLICIT_WAIT):
         """Click an element"""
-        try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(locator)
-            )
+        def click(element):
+            element = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(element))
+            started_at = self.interactions.start()
             element.click()
+            self.interactions.finish(started_at, 'click', locator)
+        
+        try:
+            if locator in self.element_cache:
+                self._with_element(locator, click, timeout)
+            else:
+                self._count('misses')
+                click(locator)
             logger.info(f"Clicked element: {locator}")
         except TimeoutException:
             logger.error(f"Element not clickable: {locator}")
             raise
+        finally:
+            # The click may have changed the route
+            self.invalidate_cache()
 
     def send_keys(self, locator, text, clear_first=True):
         """Send keys to an input field"""
-        element = self.find_element(locator)
-        if clear_first:
-            element.clear()
-        element.send_keys(text)
+        started = time.perf_counter()
+        
+        def type_text(element):
+            started_at = self.interactions.start()
+            if clear_first:
+                element.clear()
+            element.send_keys(text)
+            self.interactions.finish(started_at, 'type', locator)
+        
+        self._with_element(locator, type_text)
+        if any(key in text for key in ('\n', Keys.ENTER, Keys.RETURN)):
+            # Enter may have submitted a form
+            self.invalidate_cache()
+        record_typing(time.perf_counter() - started)
         logger.info(f"Entered text into {locator}")
 
+    def fill_form(self, fields, typed=()):
+        """Fill several inputs ({locator: value}) in one script call
+
+        Values go through the native value setter plus input and change
+        events, so React/MUI controlled inputs update their state, and are
+        read back. Locators in typed (where keystrokes are what's being
+        tested) and fields whose value didn't stick are typed for real.
+        """
+        started = time.perf_counter()
+        bulk = [(locator, str(value)) for locator, value in fields.items() if locator not in typed]
+        retype = [(locator, str(value)) for locator, value in fields.items() if locator in typed]
+        if bulk:
+            started_at = self.interactions.start()
+            results = self.execute_script(
+                FILL_FORM_SCRIPT, [{'by': by, 'locator': locator, 'value': value} for (by, locator), value in bulk]
+            )
+            self.interactions.finish(started_at, 'fill_form', f"{len(bulk)} fields")
+            for (locator, value), result in zip(bulk, results):
+                if result['value'] != value:
+                    logger.info(f"Bulk fill of {locator} gave {result['status']}/{result['value']!r}; typing it")
+                    retype.append((locator, value))
+        bulk_seconds = time.perf_counter() - started
+        
+        for locator, value in retype:
+            self.send_keys(locator, value)
+        
+        filled = len(bulk) - len([f for f in retype if f[0] not in typed])
+        fill = {
+            'page': self.driver.current_url.replace(self.base_url, '', 1),
+            'fields': len(fields),
+            'bulk_fields': filled,
+            'typed_fields': len(retype),
+            'elapsed_s': time.perf_counter() - started,
+            'saved_s': typing_estimate(filled) - bulk_seconds,
+        }
+        self.interactions.form_fills.append(fill)
+        logger.info(f"Filled {fill['fields']} fields ({filled} in bulk, {len(retype)} typed), "
+                    f"~{fill['saved_s']:.2f}s faster than typing")
+        return fill
+
     def get_text(self, locator):
         """Get text from an element"""
-        element = self.find_element(locator)
-        text = element.text
+        text = self._with_element(locator, lambda element: element.text)
         logger.debug(f"Got text from {locator}: {text}")
         return text
 
     def is_element_visible(self, locator, timeout=EXPLICIT_WAIT):
         """Check if element is visible"""
         try:
-            WebDriverWait(self.driver, timeout).until(
+            if locator in self.element_cache:
+                return self._with_element(
+                    locator, lambda element: bool(WebDriverWait(self.driver, timeout).until(
+                        EC.visibility_of(element))), timeout
+                )
+            self._count('misses')
+            self.element_cache[locator] = WebDriverWait(self.driver, timeout).until(
                 EC.visibility_of_element_located(locator)
             )
             return True
@@ -103,6 +212,7 @@ class BasePage:
                 EC.url_contains(text)
             )
             logger.info(f"URL contains: {text}")
+            self.invalidate_cache()
             return True
         except TimeoutException:
             logger.error(f"URL does not contain: {text}")
@@ -118,8 +228,7 @@ class BasePage:
 
     def scroll_to_element(self, locator):
         """Scroll to an element"""
-        element = self.find_element(locator)
-        self.driver.execute_script("arguments[0].scrollIntoView();", element)
+        self._with_element(locator, lambda element: self.driver.execute_script("arguments[0].scrollIntoView();", element))
         logger.info(f"Scrolled to element: {locator}")
 
     def execute_script(self, script, *args):
@@ -149,13 +258,13 @@ class BasePage:
 
     def refresh_page(self):
         """Refresh the current page"""
+        self.invalidate_cache()
         self.driver.refresh()
         logger.info("Page refreshed")
 
     def get_attribute(self, locator, attribute):
         """Get attribute value from element"""
-        element = self.find_element(locator)
-        return element.get_attribute(attribute)
+        return self._with_element(locator, lambda element: element.get_attribute(attribute))
 
     def wait_for_element_to_disappear(self, locator, timeout=EXPLICIT_WAIT):
         """Wait for an element to disappear"""
@@ -169,3 +278,20 @@ class BasePage:
             logger.error(f"Element still visible: {locator}")
             return False
 
+    def wait_for_network_idle(self, idle_ms=500, timeout=EXPLICIT_WAIT):
+        """Wait until no new resources have loaded for idle_ms"""
+        deadline = time.time() + timeout
+        last_count = -1
+        last_change = time.time()
+        while time.time() < deadline:
+            count = self.driver.execute_script(
+                "return performance.getEntriesByType('resource').length;"
+            )
+            if count != last_count:
+                last_count = count
+                last_change = time.time()
+            elif (time.time() - last_change) * 1000 >= idle_ms:
+                return True
+            time.sleep(0.1)
+        logger.warning(f"Network not idle after {timeout}s")
+        return False
@@ -3,7 +3,10 @@ Dashboard Page Object
 """
 
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
+from config.config import EXPLICIT_WAIT
+from utils.route_discovery import crawl_sidebar_pages
 import logging
 
 logger = logging.getLogger(__name__)
@@ -56,15 +59,15 @@ class DashboardPage(BasePage):
 
     def is_job_title_disabled(self):
         """Check if job title input is disabled"""
-        element = self.find_element(self.JOB_TITLE_INPUT)
-        return not element.is_enabled()
-
-    def fill_profile_form(self, data):
-        """Fill profile form"""
-        if 'jobTitle' in data:
-            self.send_keys(self.JOB_TITLE_INPUT, data['jobTitle'])
-        if 'company' in data:
-            self.send_keys(self.COMPANY_INPUT, data['company'])
+        return not self._with_element(self.JOB_TITLE_INPUT, lambda element: element.is_enabled())
+
+    def fill_profile_form(self, data, typed=()):
+        """Fill profile form; keys in typed ('jobTitle', 'company') are typed key by key"""
+        locators = {'jobTitle': self.JOB_TITLE_INPUT, 'company': self.COMPANY_INPUT}
+        self.fill_form(
+            {locators[key]: value for key, value in data.items() if key in locators},
+            typed=[locators[key] for key in typed]
+        )
         logger.info("Filled profile form")
         return self
 
@@ -81,10 +84,29 @@ class DashboardPage(BasePage):
         except:
             return None
 
-    def navigate_to_page(self, page_name):
+    def get_sidebar_pages(self):
+        """Pages linked from the sidebar menu"""
+        self.is_element_visible(self.SIDEBAR, timeout=EXPLICIT_WAIT)
+        return crawl_sidebar_pages(self.driver, self.MENU_ITEMS[1])
+
+    def navigate_to_page(self, page_name, timeout=EXPLICIT_WAIT):
         """Navigate to a specific page using sidebar"""
         locator = (By.XPATH, f'//span[contains(text(), "{page_name}")]')
-        self.click(locator)
+        self.click(locator, timeout=timeout)
         logger.info(f"Navigated to {page_name}")
         return self
 
+    def navigate_in_app(self, page_name, path, timeout=3):
+        """Navigate without reloading: sidebar link, else client-side router"""
+        try:
+            self.navigate_to_page(page_name, timeout=timeout)
+        except TimeoutException:
+            # No sidebar entry: push the route and let React Router pick it up
+            self.execute_script(
+                "window.history.pushState({}, '', arguments[0]);"
+                "window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));",
+                path
+            )
+            logger.info(f"Navigated to {page_name} via history API")
+        return self.wait_for_url_contains(path, timeout=EXPLICIT_WAIT)
+
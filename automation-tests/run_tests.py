@@ -3,11 +3,14 @@ Main test runner script
 Execute all automation tests and generate reports
 """
 
+import argparse
+import os
 import sys
 import subprocess
 import logging
 from pathlib import Path
 from datetime import datetime
+from config.config import PARALLEL_WORKERS, PIPELINE_STAGES, PIPELINE_RESULTS_FILE, PIPELINE_AUTH_STATE_FILE
 
 # Setup logging
 logging.basicConfig(
@@ -16,50 +19,98 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# pytest exit code of a stage that selected no tests; not a failure
+NO_TESTS_COLLECTED = 5
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the UtilityHub360 automation test suite")
+    parser.add_argument('--changed-since', metavar='GIT_REF',
+                        help="Only run tests affected by changes since this ref (e.g. origin/main), plus smoke tests")
+    parser.add_argument('--single-stage', action='store_true',
+                        help="Run the whole suite at once instead of the smoke -> api -> regression pipeline")
+    return parser.parse_args()
+
+
+def stage_command(stage, args):
+    """pytest command of one pipeline stage"""
+    command = [
+        'pytest',
+        'tests/',
+        '-v',  # Verbose output
+        '--tb=short',  # Short traceback format
+        f"--html=reports/html/pytest_{stage['name']}.html",  # pytest-html report of this stage
+        '--self-contained-html',  # Embed assets in HTML
+        '-n', str(stage['workers']),  # 'auto' sizes workers from free CPU and memory
+        f"--maxfail={stage['maxfail']}",  # Stop the stage after this many failures
+        '--pipeline-stage', stage['name'],  # Continue the report of the earlier stages
+    ]
+    if stage['markers']:
+        command += ['-m', stage['markers']]
+    if args.changed_since:
+        command += ['--changed-since', args.changed_since]
+    return command
+
 
 def main():
     """Main test execution function"""
+    args = parse_args()
     logger.info("=" * 80)
     logger.info("🚀 Starting UtilityHub360 Automation Test Suite")
     logger.info("=" * 80)
     
     start_time = datetime.now()
     
-    # Pytest command with options
-    pytest_args = [
-        'pytest',
-        'tests/',
-        '-v',  # Verbose output
-        '--tb=short',  # Short traceback format
-        '--html=reports/html/test_report.html',  # HTML report
-        '--self-contained-html',  # Embed assets in HTML
-        '-n', '4',  # Run with 4 parallel workers
-        '--maxfail=10',  # Stop after 10 failures
-        '--reruns=1',  # Rerun failed tests once
-        '--reruns-delay=2',  # Wait 2 seconds before rerun
-    ]
+    stages = PIPELINE_STAGES
+    if args.single_stage:
+        stages = [{'name': 'all', 'markers': None, 'workers': PARALLEL_WORKERS, 'maxfail': 10}]
+    
+    # Stages share one report and the logins made by earlier stages
+    PIPELINE_RESULTS_FILE.unlink(missing_ok=True)
+    env = dict(os.environ)
+    if 'AUTH_STATE_FILE' not in env:
+        env['AUTH_STATE_FILE'] = str(PIPELINE_AUTH_STATE_FILE)
+        PIPELINE_AUTH_STATE_FILE.unlink(missing_ok=True)
     
+    timings = []
+    returncode = 0
     try:
-        # Run pytest
-        result = subprocess.run(pytest_args, check=False)
+        for i, stage in enumerate(stages):
+            logger.info(f"▶ Stage {i + 1}/{len(stages)}: {stage['name']} "
+                        f"(-m '{stage['markers'] or 'all'}', {stage['workers']} workers)")
+            stage_start = datetime.now()
+            result = subprocess.run(stage_command(stage, args), env=env, check=False)
+            timings.append((stage['name'], (datetime.now() - stage_start).total_seconds(), result.returncode))
+            
+            if result.returncode not in (0, NO_TESTS_COLLECTED):
+                returncode = result.returncode
+                skipped = [s['name'] for s in stages[i + 1:]]
+                if skipped:
+                    logger.error(f"✗ Stage {stage['name']} failed; not running {', '.join(skipped)}")
+                break
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         logger.info("=" * 80)
         logger.info(f"✓ Test execution completed in {duration:.2f} seconds")
+        for name, stage_duration, stage_returncode in timings:
+            status = 'passed' if stage_returncode in (0, NO_TESTS_COLLECTED) else f"failed (exit {stage_returncode})"
+            logger.info(f"   • {name:<12} {stage_duration:8.2f}s  {status}")
         logger.info("=" * 80)
         
         # Print report locations
         logger.info("\n📊 Test Reports Generated:")
         logger.info(f"   • HTML Report: reports/html/test_report.html")
+        for name, _, _ in timings:
+            logger.info(f"   • pytest-html: reports/html/pytest_{name}.html")
         logger.info(f"   • JSON Report: reports/json/test_results.json")
         logger.info(f"   • API Errors:  reports/json/api_errors.json")
         logger.info(f"   • Screenshots: reports/screenshots/")
         logger.info(f"   • Logs:        reports/logs/test_execution.log")
         
-        # Exit with pytest's exit code
-        sys.exit(result.returncode)
+        # Exit with the failed stage's exit code
+        sys.exit(returncode)
         
     except KeyboardInterrupt:
         logger.warning("\n⚠️  Test execution interrupted by user")
@@ -67,6 +118,10 @@ def main():
     except Exception as e:
         logger.error(f"\n❌ Test execution failed: {e}")
         sys.exit(1)
+    finally:
+        # The shared logins hold tokens; don't leave them behind
+        if env['AUTH_STATE_FILE'] == str(PIPELINE_AUTH_STATE_FILE):
+            PIPELINE_AUTH_STATE_FILE.unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""
+Test data seeding script
+Populate (or clean up) large realistic datasets for a test user
+"""
+
+import sys
+import time
+import argparse
+import logging
+
+from config.config import API_BASE_URL, SEED_COUNTS
+from utils.data_seeder import DataSeeder
+from utils.stub_api import StubAPIServer
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Seed UtilityHub360 test data")
+    parser.add_argument('--user', default='valid_user', help="Key in TEST_USERS to seed for")
+    parser.add_argument('--dataset', default='default', help="Dataset name used to tag records")
+    for resource, count in SEED_COUNTS.items():
+        parser.add_argument(f"--{resource.replace('_', '-')}", type=int, default=count,
+                            help=f"Number of {resource.replace('_', ' ')} (default: {count})")
+    parser.add_argument('--cleanup', action='store_true', help="Delete the dataset instead of seeding")
+    parser.add_argument('--offline', action='store_true',
+                        help="Seed a local stub API server and keep serving it until Ctrl+C")
+    return parser.parse_args()
+
+
+def main():
+    """Main seeding function"""
+    args = parse_args()
+    counts = {resource: getattr(args, resource) for resource in SEED_COUNTS}
+
+    stub_server = StubAPIServer().start() if args.offline else None
+    api_base_url = stub_server.base_url if stub_server else API_BASE_URL
+
+    try:
+        seeder = DataSeeder(api_base_url=api_base_url, user_key=args.user, dataset=args.dataset)
+        start_time = time.perf_counter()
+
+        if args.cleanup:
+            result = seeder.cleanup()
+            logger.info(f"✓ Deleted: {result}")
+        else:
+            result = seeder.seed(counts)
+            for resource, summary in result.items():
+                logger.info(f"✓ {resource}: {summary}")
+
+        logger.info(f"Finished in {time.perf_counter() - start_time:.1f} seconds")
+
+        if stub_server:
+            logger.info(f"Stub API serving at {api_base_url} (point the frontend's API URL here)")
+            logger.info("Press Ctrl+C to stop")
+            while True:
+                time.sleep(1)
+
+    except KeyboardInterrupt:
+        logger.info("Stopping")
+    except Exception as e:
+        logger.error(f"❌ Seeding failed: {e}")
+        sys.exit(1)
+    finally:
+        if stub_server:
+            stub_server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ class TestAuthentication:
         assert login_page.is_welcome_text_visible(), "Welcome text not visible"
         logger.info("✓ Login page loaded successfully")
 
+    @pytest.mark.smoke
     def test_login_with_valid_credentials(self, driver):
         """Test TC002: Login with valid credentials"""
         login_page = LoginPage(driver)
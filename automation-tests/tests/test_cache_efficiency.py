@@ -0,0 +1,53 @@
+"""
+Warm vs Cold Cache Tests
+Loads each page with an empty cache, then again in the same browser, to check
+that HTTP caching (and any service worker) helps returning users.
+
+Run with: pytest tests/test_cache_efficiency.py --cache-compare --browser chrome
+"""
+
+import pytest
+import logging
+from utils.cache_comparison import clear_browser_state, measure_load, compare_loads
+from utils.cdp import is_chromium
+from utils.route_discovery import page_matrix
+
+logger = logging.getLogger(__name__)
+
+# PAGES_TO_TEST plus pages discovered in the app's route table
+PAGES = page_matrix()
+
+
+@pytest.mark.cache_efficiency
+@pytest.mark.auth(user='valid_user', scope='session', landing=None)
+@pytest.mark.blocking_profile('full')
+class TestCacheEfficiency:
+    """Cold versus warm load comparison for every page"""
+
+    @pytest.mark.parametrize('page', PAGES, ids=[p['name'] for p in PAGES])
+    def test_warm_load_reuses_cache(self, driver, auth_state, reporter, page):
+        """Test TC400: Cacheable resources are not downloaded again on a warm load"""
+        if not is_chromium(driver):
+            pytest.skip("Clearing the browser cache needs Chrome or Edge")
+        
+        # Cold load: empty cache and storage, keeping only the login
+        login = auth_state.capture(driver, 'valid_user') if page['requires_auth'] else None
+        clear_browser_state(driver)
+        if login:
+            auth_state.restore(driver, login)
+        cold = measure_load(driver, page)
+        
+        # Warm load: same browser, navigate to the page again
+        warm = measure_load(driver, page)
+        
+        comparison = compare_loads(page, cold, warm)
+        reporter.add_cache_comparison(comparison)
+        logger.info(
+            f"{page['name']}: cold {comparison['cold']['transfer_bytes'] / 1024:.0f} KB / "
+            f"{comparison['cold']['requests']} requests, warm {comparison['warm']['transfer_bytes'] / 1024:.0f} KB / "
+            f"{comparison['warm']['requests']} requests"
+        )
+        
+        redownloaded = comparison['redownloaded']
+        assert not redownloaded, f"{page['name']} re-downloaded {len(redownloaded)} cacheable resource(s): " + \
+            ", ".join(r['url'] for r in redownloaded[:5])
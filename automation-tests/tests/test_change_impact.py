@@ -0,0 +1,138 @@
+"""
+Change-Impact Selection Tests
+Maps changes in a small fixture app and git repository to routes and tests, without a browser.
+"""
+
+import subprocess
+import types
+import pytest
+import conftest
+import utils.change_impact as change_impact
+from utils.change_impact import ImpactMap, changed_files
+
+APP_FILES = {
+    'src/index.tsx': "import App from './App';\nimport './theme';\n",
+    'src/theme.ts': "export const theme = {};\n",
+    'src/App.tsx': (
+        "import Layout from './components/Layout';\n"
+        "import Bills from './pages/Bills';\n"
+        "import { Dashboard } from './pages/Dashboard';\n"
+    ),
+    'src/components/Layout.tsx': "export default function Layout() {}\n",
+    'src/components/Table.tsx': "export default function Table() {}\n",
+    'src/pages/Bills.tsx': "import Table from '../components/Table';\n",
+    'src/pages/Dashboard.tsx': "export function Dashboard() {}\n",
+    'automation-tests/tests/test_bills.py': "PAGE = '/bills'\n",
+    'automation-tests/utils/page_visit_cache.py': "CACHE = {}\n",
+    'README.md': "docs\n",
+}
+
+ROUTES = [
+    {'path': '/bills', 'components': ['Layout', 'Bills']},
+    {'path': '/dashboard', 'components': ['Layout', 'Dashboard']},
+    {'path': '/login', 'components': [], 'redirect_to': '/dashboard'},
+]
+
+
+@pytest.fixture
+def app_repo(tmp_path, monkeypatch):
+    """A git repository holding the fixture app, committed once"""
+    for name, content in APP_FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    git = ['git', '-C', str(tmp_path), '-c', 'user.name=test', '-c', 'user.email=test@example.com']
+    subprocess.run(git + ['init', '-q'], check=True)
+    subprocess.run(git + ['add', '.'], check=True)
+    subprocess.run(git + ['commit', '-q', '-m', 'fixture'], check=True)
+    monkeypatch.setattr(change_impact, 'REPO_ROOT', tmp_path)
+    return tmp_path
+
+
+class FakeItem:
+    """Collected test with a page parameter, markers and a module"""
+
+    def __init__(self, nodeid, page=None, markers=(), module=None):
+        self.nodeid = nodeid
+        self.markers = set(markers)
+        self.module = module
+        if page:
+            self.callspec = types.SimpleNamespace(params={'page': {'path': page}})
+
+    def get_closest_marker(self, name):
+        return name if name in self.markers else None
+
+
+class FakeConfig:
+    """Config with --changed-since set, recording deselected items"""
+
+    def __init__(self, ref):
+        self.ref = ref
+        self.deselected = []
+        self.hook = types.SimpleNamespace(pytest_deselected=lambda items: self.deselected.extend(items))
+
+    def getoption(self, name):
+        return self.ref
+
+
+@pytest.mark.regression
+class TestChangeImpact:
+    """Import graph, git changes and test selection"""
+
+    def test_impact_map_routes(self, app_repo):
+        """Test TC510: Page, shared component and global changes affect the right routes"""
+        impact = ImpactMap(ROUTES, src_dir=app_repo / 'src')
+        src = app_repo / 'src'
+
+        assert impact.affected_routes([src / 'pages' / 'Bills.tsx']) == (False, {'/bills'})
+        assert impact.affected_routes([src / 'components' / 'Table.tsx']) == (False, {'/bills'})
+        assert impact.affected_routes([src / 'components' / 'Layout.tsx']) == (False, {'/bills', '/dashboard'})
+        assert impact.affected_routes([src / 'theme.ts'])[0] is True
+        assert impact.resolve_redirect('/login') == '/dashboard'
+
+    def test_changed_files(self, app_repo):
+        """Test TC511: Uncommitted and untracked files count as changed"""
+        (app_repo / 'src' / 'pages' / 'Bills.tsx').write_text("// edited\n", encoding='utf-8')
+        (app_repo / 'src' / 'pages' / 'Loans.tsx').write_text("// new\n", encoding='utf-8')
+
+        assert changed_files('HEAD') == [app_repo / 'src' / 'pages' / 'Bills.tsx',
+                                         app_repo / 'src' / 'pages' / 'Loans.tsx']
+        with pytest.raises(ValueError):
+            changed_files('no-such-ref')
+
+    def test_select_changed(self, app_repo, monkeypatch):
+        """Test TC512: Only tests of affected pages run, plus smoke and unmapped tests"""
+        monkeypatch.setattr(conftest, 'APP_SRC_DIR', app_repo / 'src')
+        monkeypatch.setattr(conftest, 'load_routes', lambda: ROUTES)
+        monkeypatch.setattr(conftest, 'ImpactMap', lambda routes: ImpactMap(routes, src_dir=app_repo / 'src'))
+        module = types.ModuleType('test_bills')
+        module.__file__ = str(app_repo / 'automation-tests' / 'tests' / 'test_bills.py')
+        items = [
+            FakeItem('bills', page='/bills', module=module),
+            FakeItem('dashboard', page='/dashboard', module=module),
+            FakeItem('login', page='/login', module=module),
+            FakeItem('smoke', page='/dashboard', markers=['smoke'], module=module),
+            FakeItem('unmapped', module=module),
+        ]
+
+        (app_repo / 'src' / 'pages' / 'Bills.tsx').write_text("// edited\n", encoding='utf-8')
+        selected = list(items)
+        conftest.select_changed(FakeConfig('HEAD'), selected)
+        assert [item.nodeid for item in selected] == ['bills', 'smoke', 'unmapped']
+
+    def test_suite_changes_select_everything(self, app_repo, monkeypatch):
+        """Test TC513: A change to a util that conftest runs tests through selects every test"""
+        assert any(path.name == 'page_visit_cache.py' for path in conftest.suite_files())
+
+        util = app_repo / 'automation-tests' / 'utils' / 'page_visit_cache.py'
+        monkeypatch.setattr(conftest, 'APP_SRC_DIR', app_repo / 'src')
+        monkeypatch.setattr(conftest, 'load_routes', lambda: ROUTES)
+        monkeypatch.setattr(conftest, 'ImpactMap', lambda routes: ImpactMap(routes, src_dir=app_repo / 'src'))
+        monkeypatch.setattr(conftest, 'suite_files', lambda: {util.resolve()})
+        items = [FakeItem('bills', page='/bills'), FakeItem('dashboard', page='/dashboard')]
+
+        util.write_text("CACHE = {'edited': True}\n", encoding='utf-8')
+        config = FakeConfig('HEAD')
+        conftest.select_changed(config, items)
+        assert [item.nodeid for item in items] == ['bills', 'dashboard']
+        assert config.deselected == []
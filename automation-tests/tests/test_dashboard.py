@@ -4,29 +4,16 @@ Dashboard Tests
 
 import pytest
 import logging
-from pages.login_page import LoginPage
 from pages.dashboard_page import DashboardPage
-from config.config import TEST_USERS
+from utils.route_discovery import page_matrix, uncovered_pages
 
 logger = logging.getLogger(__name__)
 
 
+@pytest.mark.auth(user='valid_user', scope='class')
 class TestDashboard:
     """Test cases for dashboard functionality"""
 
-    @pytest.fixture(autouse=True)
-    def login_before_test(self, driver):
-        """Automatically login before each test"""
-        login_page = LoginPage(driver)
-        user = TEST_USERS['valid_user']
-        
-        login_page.open_login_page()
-        login_page.login(user['email'], user['password'])
-        
-        # Wait for dashboard to load
-        dashboard_page = DashboardPage(driver)
-        dashboard_page.wait_for_url_contains('/dashboard', timeout=15)
-
     def test_dashboard_loads_successfully(self, driver):
         """Test TC010: Verify dashboard loads after login"""
         dashboard_page = DashboardPage(driver)
@@ -71,6 +58,7 @@ class TestDashboard:
             logger.info("✓ Statistics cards present (data may be empty)")
 
     @pytest.mark.api_error
+    @pytest.mark.api_call_limit()
     def test_dashboard_api_calls(self, driver, api_monitor):
         """Test TC014: Monitor API calls on dashboard load"""
         dashboard_page = DashboardPage(driver)
@@ -91,3 +79,12 @@ class TestDashboard:
         else:
             logger.info("✓ No API errors detected")
 
+    def test_sidebar_links_in_page_matrix(self, driver):
+        """Test TC015: Every sidebar link gets the per-page regression checks"""
+        dashboard_page = DashboardPage(driver)
+        sidebar_pages = dashboard_page.get_sidebar_pages()
+        
+        missing = uncovered_pages(sidebar_pages, page_matrix())
+        assert not missing, "Sidebar links missing from the page matrix: " + \
+            ", ".join(f"{p['name']} ({p['path']})" for p in missing)
+        logger.info(f"✓ {len(sidebar_pages)} sidebar links covered by the page matrix")
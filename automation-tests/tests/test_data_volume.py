@@ -0,0 +1,46 @@
+"""
+Data-Volume Scaling Benchmarks
+Loads list pages with increasing dataset sizes and records how rendering scales.
+
+Run with: pytest tests/test_data_volume.py --benchmark -n 0
+Benchmarks share one seeded account, so run them on a single worker.
+"""
+
+import pytest
+import logging
+from pages.base_page import BasePage
+from utils.page_metrics import ListPageMetrics
+from config.config import BENCHMARK_PAGES, BENCHMARK_SIZES
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.benchmark
+@pytest.mark.xdist_group('data_volume')
+@pytest.mark.auth(user='valid_user', scope='module', landing=None)
+@pytest.mark.blocking_profile('full')
+class TestDataVolume:
+    """Scaling benchmarks for list pages"""
+
+    # Sizes vary fastest so each page's dataset grows incrementally
+    @pytest.mark.parametrize('size', sorted(BENCHMARK_SIZES))
+    @pytest.mark.parametrize('page', BENCHMARK_PAGES, ids=[p['name'] for p in BENCHMARK_PAGES])
+    def test_list_page_scaling(self, driver, data_seeder, reporter, page, size):
+        """Test TC200: Measure list page rendering at increasing dataset sizes"""
+        # Seed exactly `size` records for this page's resource
+        summary = data_seeder.seed({page['resource']: size}, trim=True)
+        logger.info(f"Seeded {page['name']} to {size} rows: {summary}")
+
+        # Register metrics collection before navigating
+        metrics_collector = ListPageMetrics(driver)
+        BasePage(driver).open(page['path'])
+        metrics = metrics_collector.collect()
+
+        reporter.add_benchmark_result(page['name'], size, metrics)
+        logger.info(
+            f"✓ {page['name']} @ {size} rows: first row {metrics['time_to_first_row_ms']} ms, "
+            f"rendered {metrics['time_to_rendered_ms']} ms, {metrics['dom_nodes']} DOM nodes, "
+            f"jank {metrics['jank_ratio']:.0%}"
+        )
+
+        assert metrics['rendered_rows'] > 0, f"{page['name']} rendered no rows with {size} records"
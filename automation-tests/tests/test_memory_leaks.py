@@ -0,0 +1,51 @@
+"""
+SPA Memory-Leak Soak Tests
+Cycles through the authenticated routes without reloading and checks that
+retained memory does not keep growing.
+
+Run with: pytest tests/test_memory_leaks.py --soak --browser chrome
+"""
+
+import pytest
+import logging
+from pages.dashboard_page import DashboardPage
+from utils.memory_profiler import MemoryProfiler, analyze_leaks
+from utils.cdp import is_chromium
+from config.config import PAGES_TO_TEST, PAGE_IDLE_MS, LEAK_SETTLE_MS
+
+logger = logging.getLogger(__name__)
+
+AUTH_PAGES = [p for p in PAGES_TO_TEST if p['requires_auth']]
+
+
+@pytest.mark.soak
+@pytest.mark.auth(user='valid_user', scope='function')
+class TestMemoryLeaks:
+    """Memory-leak soak tests for client-side navigation"""
+
+    def test_spa_navigation_does_not_leak(self, driver, reporter, request):
+        """Test TC300: Retained heap, DOM nodes and listeners stay flat across navigation cycles"""
+        if not is_chromium(driver):
+            pytest.skip("Memory profiling needs Chrome or Edge")
+        
+        iterations = request.config.getoption("--soak-iterations")
+        dashboard = DashboardPage(driver)
+        profiler = MemoryProfiler(driver)
+        
+        for iteration in range(iterations):
+            for page in AUTH_PAGES:
+                assert dashboard.navigate_in_app(page['name'], page['path']), \
+                    f"Could not navigate to {page['name']} (iteration {iteration})"
+                dashboard.wait_for_network_idle(idle_ms=max(PAGE_IDLE_MS, LEAK_SETTLE_MS))
+                profiler.sample(page['name'], iteration)
+            logger.info(f"Completed navigation cycle {iteration + 1}/{iterations}")
+        
+        analysis = analyze_leaks(profiler.samples)
+        reporter.add_memory_leak_results(analysis)
+        
+        leaking = [r for r in analysis if r['leaking']]
+        for result in leaking:
+            logger.error(f"✗ {result['page']} retains memory: {'; '.join(result['reasons'])}")
+        assert not leaking, f"Memory grows on {len(leaking)} route(s): " + \
+            ", ".join(r['page'] for r in leaking)
+        logger.info(f"✓ No leaks across {iterations} cycles of {len(AUTH_PAGES)} routes")
@@ -0,0 +1,81 @@
+"""
+Payload Accounting Tests
+Checks how Resource Timing entries and network log records are merged, without a browser.
+"""
+
+import json
+import pytest
+from utils.network_log import NetworkLog
+from utils.payload_accounting import classify_resource, payload_flags
+
+API_URL = 'https://api.utilityhub360.com/api/Bills'
+
+
+class FakeDriver:
+    """Driver whose performance log holds the given Network events"""
+
+    def __init__(self, events):
+        self.entries = [{'message': json.dumps({'message': event})} for event in events]
+
+    def execute_cdp_cmd(self, command, params):
+        return {}
+
+    def get_log(self, log_type):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def api_events(request_id, chunks, status=200, headers=None, frame_id='main'):
+    """Network events of one uncompressed JSON response delivered in chunks"""
+    events = [
+        {'method': 'Network.requestWillBeSent',
+         'params': {'requestId': request_id, 'frameId': frame_id, 'type': 'Fetch', 'request': {'url': API_URL}}},
+        {'method': 'Network.responseReceived',
+         'params': {'requestId': request_id, 'type': 'Fetch', 'response': {
+             'url': API_URL, 'status': status, 'mimeType': 'application/json',
+             'headers': headers or {'Content-Type': 'application/json'}}}},
+    ]
+    events += [{'method': 'Network.dataReceived', 'params': {'requestId': request_id, 'dataLength': size}}
+               for size in chunks]
+    events.append({'method': 'Network.loadingFinished',
+                   'params': {'requestId': request_id, 'encodedDataLength': sum(chunks) + 300}})
+    return events
+
+
+@pytest.mark.regression
+class TestPayloadAccounting:
+    """Cross-origin responses, whose Resource Timing sizes are zero"""
+
+    def test_cross_origin_sizes_come_from_network_log(self):
+        """Test TC500: Opaque timing entries use the network log's status and sizes"""
+        record = NetworkLog(FakeDriver(api_events('1', [400000, 400000]))).requests()['1']
+        entry = {'url': API_URL, 'initiator_type': 'fetch',
+                 'transfer_size': 0, 'encoded_size': 0, 'decoded_size': 0, 'duration': 120.0}
+
+        resource = classify_resource(entry, record)
+
+        assert resource['cache_status'] == 'network'
+        assert resource['decoded_bytes'] == 800000
+        assert resource['transfer_bytes'] == 800300
+        assert 'uncompressed' in payload_flags(resource)
+
+    def test_cross_origin_cache_hits(self):
+        """Test TC501: Cached and revalidated cross-origin responses are not counted as downloads"""
+        cached = NetworkLog(FakeDriver(api_events('1', [1000]))).requests()['1']
+        cached['from_cache'] = True
+        revalidated = NetworkLog(FakeDriver(api_events('2', [], status=304))).requests()['2']
+        entry = {'url': API_URL, 'initiator_type': 'fetch',
+                 'transfer_size': 0, 'encoded_size': 0, 'decoded_size': 0, 'duration': 5.0}
+
+        assert classify_resource(entry, cached)['cache_status'] == 'cache'
+        assert classify_resource(entry, revalidated)['cache_status'] == 'revalidated'
+        assert classify_resource(entry, None)['cache_status'] == 'opaque'
+
+    def test_concurrent_tabs_keep_their_own_records(self):
+        """Test TC502: Requests of other tabs are not attributed to a tab's page"""
+        log = NetworkLog(FakeDriver(api_events('1', [1000], frame_id='tab-a') +
+                                    api_events('2', [2000], status=304, frame_id='tab-b')))
+
+        assert list(log.requests(frame_id='tab-a')) == ['1']
+        assert list(log.requests(frame_id='tab-b')) == ['2']
+        assert len(log.requests()) == 2
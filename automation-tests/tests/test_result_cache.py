@@ -0,0 +1,94 @@
+"""
+Result Cache Tests
+Fingerprints, lookups and recording of cached passes, without a browser.
+"""
+
+import time
+import types
+import pytest
+import conftest
+from utils.result_cache import ResultCache
+
+NODEID = 'tests/test_regression.py::TestPages::test_page_loads[Bills]'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Empty result cache in a temporary file, prepared with fixed run inputs"""
+    result_cache = ResultCache(path=tmp_path / 'results.json', max_age_hours=24)
+    result_cache.run_inputs = 'run-inputs'
+    return result_cache
+
+
+@pytest.fixture
+def test_module(tmp_path):
+    """A test module file outside the repo"""
+    path = tmp_path / 'test_module.py'
+    path.write_text("def test_page(): pass\n", encoding='utf-8')
+    module = types.ModuleType('test_module')
+    module.__file__ = str(path)
+    return module
+
+
+@pytest.mark.regression
+class TestResultCache:
+    """Fingerprints and the lifecycle of a cached pass"""
+
+    def test_fingerprint_follows_inputs(self, cache, test_module, tmp_path):
+        """Test TC520: Changing the test, a shared util or the run inputs changes the fingerprint"""
+        util = tmp_path / 'page_visit_cache.py'
+        util.write_text("CACHE = {}\n", encoding='utf-8')
+        fingerprint = cache.fingerprint(NODEID, test_module, [util])
+
+        assert cache.fingerprint(NODEID, test_module, [util]) == fingerprint
+        assert cache.fingerprint(NODEID + '-other', test_module, [util]) != fingerprint
+
+        util.write_text("CACHE = {'edited': True}\n", encoding='utf-8')
+        assert self._fresh(cache).fingerprint(NODEID, test_module, [util]) != fingerprint
+
+        other_run = self._fresh(cache)
+        other_run.run_inputs = 'other-inputs'
+        util.write_text("CACHE = {}\n", encoding='utf-8')
+        assert other_run.fingerprint(NODEID, test_module, [util]) != fingerprint
+
+    def test_suite_files_are_fingerprinted(self):
+        """Test TC521: Utils and page objects used by conftest count as inputs of every test"""
+        names = {path.name for path in conftest.suite_files()}
+        assert {'conftest.py', 'page_visit_cache.py', 'api_monitor.py', 'auth_manager.py',
+                'base_page.py'} <= names
+
+    def test_record_stores_after_teardown(self, cache):
+        """Test TC522: A pass is cached once teardown passed, and a later failure drops it"""
+        cache.record(NODEID, 'setup', 'passed', 0.1, 'fp', 'run-1')
+        cache.record(NODEID, 'call', 'passed', 2.5, 'fp', 'run-1')
+        assert cache.lookup(NODEID, 'fp') is None
+
+        cache.record(NODEID, 'teardown', 'passed', 0.1, 'fp', 'run-1')
+        entry = cache.lookup(NODEID, 'fp')
+        assert entry['duration'] == 2.5 and entry['run_id'] == 'run-1'
+        assert cache.lookup(NODEID, 'other-fp') is None
+
+        cache.record(NODEID, 'call', 'failed', 2.5, 'fp', 'run-2')
+        assert cache.lookup(NODEID, 'fp') is None
+
+    def test_failed_teardown_is_not_cached(self, cache):
+        """Test TC523: A call that passed but whose teardown failed is not cached"""
+        cache.record(NODEID, 'call', 'passed', 2.5, 'fp', 'run-1')
+        cache.record(NODEID, 'teardown', 'failed', 0.1, 'fp', 'run-1')
+        assert cache.lookup(NODEID, 'fp') is None
+
+    def test_entries_expire_and_persist(self, cache):
+        """Test TC524: Passes older than the maximum age are ignored; saved entries load again"""
+        cache.store(NODEID, 'fp', 2.5, 'run-1')
+        cache.save()
+        assert ResultCache(path=cache.path, max_age_hours=24).lookup(NODEID, 'fp')
+
+        cache.entries[NODEID]['passed_at'] = time.time() - 25 * 3600
+        assert cache.lookup(NODEID, 'fp') is None
+
+    @staticmethod
+    def _fresh(cache):
+        """A cache of the same run that hasn't hashed any files yet"""
+        fresh = ResultCache(path=cache.path, max_age_hours=24)
+        fresh.run_inputs = cache.run_inputs
+        return fresh
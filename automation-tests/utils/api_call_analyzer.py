@@ -0,0 +1,129 @@
+"""
+API Call Analyzer
+Finds duplicate calls, sequential waterfalls and N+1 fetch loops in one page load
+"""
+
+import logging
+from urllib.parse import urlparse
+from config.config import (
+    N_PLUS_ONE_MIN_CALLS, WATERFALL_MIN_LENGTH, WATERFALL_MAX_GAP_MS
+)
+from utils.latency_histogram import endpoint_template
+
+logger = logging.getLogger(__name__)
+
+
+def _call_key(call):
+    """Method and URL (query included) identifying identical requests"""
+    return f"{(call.get('method') or 'GET').upper()} {call.get('url')}"
+
+
+def _wall_time(calls):
+    """Time covered by the union of the calls' [start, end] intervals"""
+    total = 0.0
+    current_start = current_end = None
+    for call in sorted(calls, key=lambda c: c['start']):
+        if current_end is None or call['start'] > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = call['start'], call['end']
+        else:
+            current_end = max(current_end, call['end'])
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def find_duplicates(calls):
+    """Identical requests fired more than once"""
+    groups = {}
+    for call in calls:
+        groups.setdefault(_call_key(call), []).append(call)
+
+    duplicates = []
+    for key, group in groups.items():
+        if len(group) > 1:
+            durations = sorted(c.get('duration') or 0 for c in group)
+            duplicates.append({
+                'request': key,
+                'count': len(group),
+                # Every call after the first could have been served from the first response
+                'savings_ms': sum(durations[1:]),
+            })
+    return sorted(duplicates, key=lambda d: d['count'], reverse=True)
+
+
+def find_n_plus_one(calls):
+    """Per-item fetch loops: one endpoint template hit for many different IDs"""
+    groups = {}
+    for call in calls:
+        groups.setdefault(endpoint_template(call.get('url'), call.get('method')), []).append(call)
+
+    patterns = []
+    for template, group in groups.items():
+        distinct = {urlparse(str(c.get('url'))).path for c in group}
+        if '{id}' not in template or len(distinct) < N_PLUS_ONE_MIN_CALLS:
+            continue
+        wall = _wall_time(group)
+        longest = max(c['end'] - c['start'] for c in group)
+        patterns.append({
+            'endpoint': template,
+            'count': len(group),
+            'distinct_items': len(distinct),
+            'wall_ms': wall,
+            # One batched request would take about as long as the slowest single one
+            'savings_ms': max(wall - longest, 0.0),
+        })
+    return sorted(patterns, key=lambda p: p['savings_ms'], reverse=True)
+
+
+def find_waterfalls(calls):
+    """Chains of different requests that each start only after the previous one ended"""
+    chains = []
+    for call in sorted(calls, key=lambda c: c['start']):
+        for chain in chains:
+            last = chain[-1]
+            if last['end'] <= call['start'] <= last['end'] + WATERFALL_MAX_GAP_MS:
+                chain.append(call)
+                break
+        else:
+            chains.append([call])
+
+    waterfalls = []
+    for chain in chains:
+        templates = [endpoint_template(c.get('url'), c.get('method')) for c in chain]
+        if len(set(templates)) < WATERFALL_MIN_LENGTH:
+            continue
+        durations = [c['end'] - c['start'] for c in chain]
+        waterfalls.append({
+            'chain': templates,
+            'sequential_ms': chain[-1]['end'] - chain[0]['start'],
+            # Upper bound: requests may depend on each other's responses
+            'savings_ms': max(chain[-1]['end'] - chain[0]['start'] - max(durations), 0.0),
+        })
+    return sorted(waterfalls, key=lambda w: w['savings_ms'], reverse=True)
+
+
+def analyze_page_calls(page, calls):
+    """Summarise redundant and serialised API calls made during one page load"""
+    timed = [c for c in calls if c.get('start') is not None and c.get('end') is not None]
+    duplicates = find_duplicates(calls)
+    n_plus_one = find_n_plus_one(timed)
+    # Loops are already counted as N+1; leave them out of the waterfalls
+    looped = {p['endpoint'] for p in n_plus_one}
+    waterfalls = find_waterfalls(
+        [c for c in timed if endpoint_template(c.get('url'), c.get('method')) not in looped]
+    )
+    return {
+        'page': page,
+        'calls': len(calls),
+        'duplicates': duplicates,
+        'n_plus_one': n_plus_one,
+        'waterfalls': waterfalls,
+        'max_duplicate_count': max((d['count'] for d in duplicates), default=1),
+        'savings_ms': (
+            sum(d['savings_ms'] for d in duplicates)
+            + sum(p['savings_ms'] for p in n_plus_one)
+            + sum(w['savings_ms'] for w in waterfalls)
+        ),
+    }
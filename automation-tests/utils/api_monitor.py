@@ -8,123 +8,144 @@ import json
 from datetime import datetime
 from selenium.webdriver.common.by import By
 from config.config import API_ERRORS_REPORT
+from utils.cdp import add_init_script
 
 logger = logging.getLogger(__name__)
 
+# Wraps fetch and XMLHttpRequest to record every call and error.
+# Guarded so it is safe to run more than once in the same document.
+MONITORING_SCRIPT = """
+(function() {
+    if (window.__apiMonitorInstalled) { return; }
+    window.__apiMonitorInstalled = true;
+    window.apiErrors = [];
+    window.apiCalls = [];
 
-class APIMonitor:
-    """Monitor API calls and capture errors"""
-
-    def __init__(self, driver):
-        self.driver = driver
-        self.errors = []
-        self.api_calls = []
-
-    def inject_monitoring_script(self):
-        """Inject JavaScript to monitor XHR requests"""
-        script = """
-        window.apiErrors = [];
-        window.apiCalls = [];
+    // Intercept fetch
+    const originalFetch = window.fetch;
+    window.fetch = function(...args) {
+        const url = args[0] instanceof Request ? args[0].url : String(args[0]);
+        const startTime = Date.now();
+        const startMark = performance.now();
         
-        // Intercept fetch
-        const originalFetch = window.fetch;
-        window.fetch = function(...args) {
-            const url = args[0];
-            const startTime = Date.now();
-            
-            return originalFetch.apply(this, args)
-                .then(response => {
-                    const endTime = Date.now();
-                    const callInfo = {
-                        url: url,
-                        method: args[1]?.method || 'GET',
-                        status: response.status,
-                        duration: endTime - startTime,
-                        timestamp: new Date().toISOString()
-                    };
-                    
-                    window.apiCalls.push(callInfo);
-                    
-                    if (!response.ok) {
-                        window.apiErrors.push({
-                            ...callInfo,
-                            error: `HTTP ${response.status}: ${response.statusText}`
-                        });
-                    }
-                    
-                    return response;
-                })
-                .catch(error => {
-                    const endTime = Date.now();
-                    const errorInfo = {
-                        url: url,
-                        method: args[1]?.method || 'GET',
-                        status: 0,
-                        duration: endTime - startTime,
-                        error: error.message,
-                        timestamp: new Date().toISOString()
-                    };
-                    
-                    window.apiErrors.push(errorInfo);
-                    window.apiCalls.push(errorInfo);
-                    
-                    throw error;
-                });
-        };
-        
-        // Intercept XMLHttpRequest
-        const originalXHROpen = XMLHttpRequest.prototype.open;
-        const originalXHRSend = XMLHttpRequest.prototype.send;
-        
-        XMLHttpRequest.prototype.open = function(method, url) {
-            this._method = method;
-            this._url = url;
-            this._startTime = Date.now();
-            return originalXHROpen.apply(this, arguments);
-        };
-        
-        XMLHttpRequest.prototype.send = function() {
-            this.addEventListener('load', function() {
+        return originalFetch.apply(this, args)
+            .then(response => {
                 const endTime = Date.now();
                 const callInfo = {
-                    url: this._url,
-                    method: this._method,
-                    status: this.status,
-                    duration: endTime - this._startTime,
+                    url: url,
+                    method: args[1]?.method || 'GET',
+                    status: response.status,
+                    duration: endTime - startTime,
+                    start: startMark,
+                    end: performance.now(),
                     timestamp: new Date().toISOString()
                 };
                 
                 window.apiCalls.push(callInfo);
                 
-                if (this.status >= 400) {
+                if (!response.ok) {
                     window.apiErrors.push({
                         ...callInfo,
-                        error: `HTTP ${this.status}: ${this.statusText}`
+                        error: `HTTP ${response.status}: ${response.statusText}`
                     });
                 }
-            });
-            
-            this.addEventListener('error', function() {
+                
+                return response;
+            })
+            .catch(error => {
                 const endTime = Date.now();
                 const errorInfo = {
-                    url: this._url,
-                    method: this._method,
+                    url: url,
+                    method: args[1]?.method || 'GET',
                     status: 0,
-                    duration: endTime - this._startTime,
-                    error: 'Network Error',
+                    duration: endTime - startTime,
+                    start: startMark,
+                    end: performance.now(),
+                    error: error.message,
                     timestamp: new Date().toISOString()
                 };
                 
                 window.apiErrors.push(errorInfo);
                 window.apiCalls.push(errorInfo);
+                
+                throw error;
             });
+    };
+
+    // Intercept XMLHttpRequest
+    const originalXHROpen = XMLHttpRequest.prototype.open;
+    const originalXHRSend = XMLHttpRequest.prototype.send;
+
+    XMLHttpRequest.prototype.open = function(method, url) {
+        this._method = method;
+        this._url = url;
+        this._startTime = Date.now();
+        return originalXHROpen.apply(this, arguments);
+    };
+
+    XMLHttpRequest.prototype.send = function() {
+        this._startMark = performance.now();
+        this.addEventListener('load', function() {
+            const endTime = Date.now();
+            const callInfo = {
+                url: this._url,
+                method: this._method,
+                status: this.status,
+                duration: endTime - this._startTime,
+                start: this._startMark,
+                end: performance.now(),
+                timestamp: new Date().toISOString()
+            };
             
-            return originalXHRSend.apply(this, arguments);
-        };
-        """
+            window.apiCalls.push(callInfo);
+            
+            if (this.status >= 400) {
+                window.apiErrors.push({
+                    ...callInfo,
+                    error: `HTTP ${this.status}: ${this.statusText}`
+                });
+            }
+        });
+        
+        this.addEventListener('error', function() {
+            const endTime = Date.now();
+            const errorInfo = {
+                url: this._url,
+                method: this._method,
+                status: 0,
+                duration: endTime - this._startTime,
+                start: this._startMark,
+                end: performance.now(),
+                error: 'Network Error',
+                timestamp: new Date().toISOString()
+            };
+            
+            window.apiErrors.push(errorInfo);
+            window.apiCalls.push(errorInfo);
+        });
         
+        return originalXHRSend.apply(this, arguments);
+    };
+})();
+"""
+
+
+class APIMonitor:
+    """Monitor API calls and capture errors"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.errors = []
+        self.api_calls = []
+
+    def inject_monitoring_script(self):
+        """Inject JavaScript to monitor fetch/XHR requests
+
+        On Chromium the script is registered to run before every new
+        document, so calls made while a page loads are captured too.
+        """
         try:
-            self.driver.execute_script(script)
+            add_init_script(self.driver, MONITORING_SCRIPT)
             logger.debug("API monitoring script injected")
         except Exception as e:
             logger.error(f"Failed to inject monitoring script: {e}")
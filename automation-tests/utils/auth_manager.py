@@ -0,0 +1,190 @@
+"""
+Authentication State Manager
+Logs in once per scope and restores the session into later browsers
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from pathlib import Path
+import requests
+from config.config import BASE_URL, API_BASE_URL, TEST_USERS, AUTH_VERIFY_INTERVAL, AUTH_STATE_FILE
+from pages.login_page import LoginPage
+
+logger = logging.getLogger(__name__)
+
+AUTH_SCOPES = ('function', 'class', 'module', 'session')
+
+# Lightweight same-origin URL used to get access to localStorage and cookies
+ORIGIN_BOOTSTRAP_PATH = '/robots.txt'
+
+
+def scope_key(item, scope):
+    """Cache key for an auth scope of a test item"""
+    if scope == 'session':
+        return 'session'
+    if scope == 'module':
+        return item.nodeid.split('::')[0]
+    if scope == 'class':
+        return '::'.join(item.nodeid.split('::')[:2]) if item.cls else item.nodeid.split('::')[0]
+    if scope == 'function':
+        return item.nodeid
+    raise ValueError(f"Unsupported auth scope: {scope} (expected one of {AUTH_SCOPES})")
+
+
+def token_expiry(token):
+    """Read the exp claim from a JWT, None if it cannot be decoded"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+    except Exception:
+        return None
+
+
+class AuthStateManager:
+    """Cache logged-in browser state per (user, scope) and reuse it
+
+    With a state file, session-scoped logins are also shared with other
+    processes: a session without a cached state first tries the user's
+    saved state. Narrower scopes stay process-local, so they still get a
+    fresh login after release().
+    """
+
+    def __init__(self, api_base_url=API_BASE_URL, state_file=AUTH_STATE_FILE):
+        self.api_base_url = api_base_url.rstrip('/')
+        self.state_file = Path(state_file) if state_file else None
+        self.states = {}  # (user_key, scope_key) -> state
+        self.stats = {'logins': 0, 'restores': 0, 'verifications': 0}
+
+    def capture(self, driver, user_key):
+        """Capture localStorage and cookies of a logged-in browser"""
+        local_storage = driver.execute_script(
+            "var items = {};"
+            "for (var i = 0; i < localStorage.length; i++) {"
+            "  var key = localStorage.key(i); items[key] = localStorage.getItem(key);"
+            "}"
+            "return items;"
+        )
+        token = local_storage.get('authToken')
+        return {
+            'user_key': user_key,
+            'local_storage': local_storage,
+            'cookies': driver.get_cookies(),
+            'token': token,
+            'expires_at': token_expiry(token) if token else None,
+            'verified_at': time.time(),
+        }
+
+    def login(self, driver, user_key):
+        """Log in through the UI and capture the resulting state"""
+        user = TEST_USERS[user_key]
+        login_page = LoginPage(driver)
+        login_page.open_login_page()
+        login_page.login(user['email'], user['password'])
+        if not login_page.wait_for_url_contains('/dashboard', timeout=15):
+            raise AssertionError(f"Login failed for {user['email']}")
+        self.stats['logins'] += 1
+        return self.capture(driver, user_key)
+
+    def is_valid(self, state):
+        """Cheaply check that a cached state is still usable
+
+        The JWT expiry is checked locally; the API is only asked
+        (GET /Auth/me) once per AUTH_VERIFY_INTERVAL seconds.
+        """
+        if not state.get('token'):
+            return False
+        if state['expires_at'] and state['expires_at'] - 30 < time.time():
+            logger.info(f"Cached login for {state['user_key']} expired")
+            return False
+        if time.time() - state['verified_at'] < AUTH_VERIFY_INTERVAL:
+            return True
+
+        self.stats['verifications'] += 1
+        try:
+            response = requests.get(
+                f"{self.api_base_url}/Auth/me",
+                headers={'Authorization': f"Bearer {state['token']}"},
+                timeout=5
+            )
+        except requests.RequestException as e:
+            # Can't reach the API from here; trust the token until it expires
+            logger.debug(f"Could not verify cached login: {e}")
+            return True
+        if response.status_code in (401, 403):
+            logger.info(f"Cached login for {state['user_key']} rejected by API")
+            return False
+        state['verified_at'] = time.time()
+        return True
+
+    def restore(self, driver, state):
+        """Load a captured state into a browser"""
+        driver.get(f"{BASE_URL}{ORIGIN_BOOTSTRAP_PATH}")
+        for cookie in state['cookies']:
+            cookie = {k: v for k, v in cookie.items() if k != 'sameSite' or v in ('Strict', 'Lax', 'None')}
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"Could not restore cookie {cookie.get('name')}: {e}")
+        driver.execute_script(
+            "var items = arguments[0];"
+            "Object.keys(items).forEach(function(key) { localStorage.setItem(key, items[key]); });",
+            state['local_storage']
+        )
+        self.stats['restores'] += 1
+
+    def _read_shared(self):
+        try:
+            return json.loads(self.state_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def load_shared(self, user_key):
+        """State of user_key saved by another process, if any"""
+        if not self.state_file:
+            return None
+        return self._read_shared().get(user_key)
+
+    def save_shared(self, state):
+        """Save a login for other processes (written atomically)"""
+        if not self.state_file:
+            return
+        states = self._read_shared()
+        states[state['user_key']] = state
+        temp_file = self.state_file.with_name(f"{self.state_file.name}.{os.getpid()}.tmp")
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file.write_text(json.dumps(states), encoding='utf-8')
+            os.replace(temp_file, self.state_file)
+        except OSError as e:
+            logger.debug(f"Could not save shared login state: {e}")
+
+    def authenticate(self, driver, user_key='valid_user', key='session', landing='/dashboard'):
+        """Make the browser logged in as user_key, reusing the state cached under key"""
+        cache_key = (user_key, key)
+        state = self.states.get(cache_key)
+        if not state and key == 'session':
+            state = self.load_shared(user_key)
+            if state:
+                self.states[cache_key] = state
+        if state and self.is_valid(state):
+            self.restore(driver, state)
+            logger.info(f"Reused {user_key} login ({key})")
+            if landing:
+                driver.get(f"{BASE_URL}{landing}")
+        else:
+            self.states[cache_key] = self.login(driver, user_key)
+            if key == 'session':
+                self.save_shared(self.states[cache_key])
+            logger.info(f"Logged in as {user_key} ({key})")
+            if landing and landing != '/dashboard':
+                driver.get(f"{BASE_URL}{landing}")
+        return driver
+
+    def release(self, key):
+        """Forget every cached state stored under a scope key"""
+        for cache_key in [k for k in self.states if k[1] == key]:
+            del self.states[cache_key]
@@ -0,0 +1,107 @@
+"""
+Cache Comparison Utility
+Measures a cold (cleared cache and storage) load against a warm load of the same page
+"""
+
+import logging
+import re
+from urllib.parse import urlparse
+from config.config import BASE_URL, PAGE_SETTLE_TIMEOUT, PAGE_IDLE_MS
+from pages.base_page import BasePage
+from utils.cdp import execute_cdp
+from utils.network_log import get_network_log
+from utils.payload_accounting import collect_page_payload
+
+logger = logging.getLogger(__name__)
+
+PAINT_TIMINGS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var fcp = performance.getEntriesByName('first-contentful-paint')[0];
+return {
+    first_contentful_paint_ms: fcp ? fcp.startTime : null,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd || null,
+    load_ms: nav.loadEventEnd || null,
+    service_worker: !!(navigator.serviceWorker && navigator.serviceWorker.controller)
+};
+"""
+
+
+def is_cacheable(cache_control):
+    """Whether Cache-Control lets the browser reuse a response without a request"""
+    if not cache_control:
+        return False
+    directives = cache_control.lower()
+    if 'no-store' in directives or 'no-cache' in directives:
+        return False
+    if 'immutable' in directives:
+        return True
+    max_age = re.search(r'max-age=(\d+)', directives)
+    return bool(max_age and int(max_age.group(1)) > 0)
+
+
+def clear_browser_state(driver, origin=None):
+    """Empty the HTTP cache, service workers, cookies and storage of the app origin"""
+    parsed = urlparse(origin or BASE_URL)
+    execute_cdp(driver, 'Network.enable')
+    execute_cdp(driver, 'Network.clearBrowserCache')
+    execute_cdp(driver, 'Storage.clearDataForOrigin', {
+        'origin': f"{parsed.scheme}://{parsed.netloc}",
+        'storageTypes': 'all',
+    })
+    driver.delete_all_cookies()
+
+
+def measure_load(driver, page):
+    """Load a page and return its payload accounting and paint timings"""
+    base_page = BasePage(driver)
+    network_mark = get_network_log(driver).mark()
+    base_page.open(page['path'])
+    base_page.wait_for_network_idle(idle_ms=PAGE_IDLE_MS, timeout=PAGE_SETTLE_TIMEOUT)
+    return {
+        'payload': collect_page_payload(driver, page['name'], since=network_mark, include_resources=True),
+        'timings': base_page.execute_script(PAINT_TIMINGS_SCRIPT),
+    }
+
+
+def compare_loads(page, cold, warm):
+    """Differences between a cold and a warm load, and resources the warm load re-downloaded"""
+    cold_resources = {r['url']: r for r in cold['payload']['resources']}
+    redownloaded = []
+    for resource in warm['payload']['resources']:
+        cold_resource = cold_resources.get(resource['url'])
+        if not cold_resource or resource['cache_status'] != 'network':
+            continue
+        if is_cacheable(cold_resource['cache_control']):
+            redownloaded.append({
+                'url': resource['url'],
+                'transfer_bytes': resource['transfer_bytes'],
+                'cache_control': cold_resource['cache_control'],
+            })
+
+    def delta(key, section='payload'):
+        before, after = cold[section].get(key), warm[section].get(key)
+        return after - before if before is not None and after is not None else None
+
+    return {
+        'page': page['name'],
+        'path': page['path'],
+        'service_worker': warm['timings']['service_worker'],
+        'cold': {
+            'requests': cold['payload']['requests'],
+            'transfer_bytes': cold['payload']['transfer_bytes'],
+            **{k: v for k, v in cold['timings'].items() if k != 'service_worker'},
+        },
+        'warm': {
+            'requests': warm['payload']['requests'],
+            'cached_requests': warm['payload']['cached_requests'],
+            'transfer_bytes': warm['payload']['transfer_bytes'],
+            **{k: v for k, v in warm['timings'].items() if k != 'service_worker'},
+        },
+        'delta': {
+            'requests': delta('requests'),
+            'transfer_bytes': delta('transfer_bytes'),
+            'first_contentful_paint_ms': delta('first_contentful_paint_ms', 'timings'),
+            'load_ms': delta('load_ms', 'timings'),
+        },
+        'redownloaded': redownloaded,
+    }
@@ -0,0 +1,60 @@
+"""
+Chrome DevTools Protocol Helpers
+Thin wrappers around Selenium's CDP support for Chromium browsers
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def is_chromium(driver):
+    """Check if the driver talks to a Chromium browser (Chrome/Edge)"""
+    return hasattr(driver, 'execute_cdp_cmd')
+
+
+def execute_cdp(driver, command, params=None):
+    """Execute a CDP command, returning None on non-Chromium browsers"""
+    if not is_chromium(driver):
+        return None
+    return driver.execute_cdp_cmd(command, params or {})
+
+
+def main_frame_id(driver):
+    """ID of the current tab's main frame, which Network events carry as frameId; None if unknown"""
+    try:
+        tree = execute_cdp(driver, 'Page.getFrameTree')
+    except Exception as e:
+        logger.debug(f"Could not read the frame tree: {e}")
+        return None
+    return tree['frameTree']['frame']['id'] if tree else None
+
+
+def add_init_script(driver, source):
+    """Run a script in every new document before the page's own scripts
+
+    On Chromium this uses Page.addScriptToEvaluateOnNewDocument so the
+    script survives navigation. Other browsers only get the script in
+    the current document. Returns True if the script was registered
+    for future navigations.
+    """
+    if is_chromium(driver):
+        try:
+            execute_cdp(driver, 'Page.addScriptToEvaluateOnNewDocument', {'source': source})
+            return True
+        except Exception as e:
+            logger.warning(f"Could not register init script: {e}")
+    try:
+        driver.execute_script(source)
+    except Exception as e:
+        logger.debug(f"Could not run init script in current document: {e}")
+    return False
+
+
+def get_performance_metrics(driver):
+    """Return Performance.getMetrics as a name -> value dict"""
+    if not is_chromium(driver):
+        return {}
+    execute_cdp(driver, 'Performance.enable')
+    result = execute_cdp(driver, 'Performance.getMetrics')
+    return {m['name']: m['value'] for m in result.get('metrics', [])}
@@ -0,0 +1,135 @@
+"""
+Change Impact Utility
+Maps files changed since a git ref to the app routes and tests they affect
+"""
+
+import logging
+import re
+import subprocess
+from pathlib import Path
+from config.config import APP_SRC_DIR, CHANGE_IMPACT_GLOBAL_PATHS
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = APP_SRC_DIR.parent
+SOURCE_SUFFIXES = ('.tsx', '.ts', '.jsx', '.js')
+ENTRY_FILES = ('index.tsx', 'App.tsx')
+
+# Relative module specifiers of import/export ... from, import(), require() and side-effect imports
+SPECIFIER = re.compile(r'(?:\bfrom|\bimport|\brequire)\s*\(?\s*[\'"](\.{1,2}/[^\'"]*)[\'"]')
+# Names bound by a static import: import Default, { Named, Other as Alias } from './module'
+IMPORT_BINDINGS = re.compile(r'\bimport\s+(?!type\b)([\w\s{},*]+?)\s+from\s+[\'"](\.{1,2}/[^\'"]*)[\'"]')
+
+
+def resolve_module(specifier, importer):
+    """File a relative specifier refers to, trying TypeScript/JS extensions and index files"""
+    base = (importer.parent / specifier).resolve()
+    candidates = [base] + [base.with_name(base.name + suffix) for suffix in SOURCE_SUFFIXES]
+    candidates += [base / f"index{suffix}" for suffix in SOURCE_SUFFIXES]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def import_graph(src_dir=APP_SRC_DIR):
+    """file -> set of app files it imports, for every source file under src_dir"""
+    graph = {}
+    for path in Path(src_dir).rglob('*'):
+        if path.suffix not in SOURCE_SUFFIXES or not path.is_file():
+            continue
+        source = path.read_text(encoding='utf-8', errors='replace')
+        imports = (resolve_module(spec, path) for spec in SPECIFIER.findall(source))
+        graph[path.resolve()] = {target for target in imports if target}
+    return graph
+
+
+def imported_names(path):
+    """Local name -> file of the components and modules a file imports statically"""
+    names = {}
+    source = path.read_text(encoding='utf-8', errors='replace')
+    for bindings, specifier in IMPORT_BINDINGS.findall(source):
+        target = resolve_module(specifier, path)
+        if not target:
+            continue
+        default, _, named = bindings.partition('{')
+        for name in [default.strip(' ,*')] + named.rstrip('} ').split(','):
+            local = name.split(' as ')[-1].strip()
+            if local:
+                names[local] = target
+    return names
+
+
+def closure(graph, roots, skip=()):
+    """Files reachable from roots, not following imports of the files in skip"""
+    seen = set()
+    stack = list(roots)
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        stack.extend(target for target in graph.get(path, ()) if target not in skip)
+    return seen
+
+
+class ImpactMap:
+    """Which routes each app source file can affect
+
+    A route depends on everything its components import. Files loaded by
+    index.tsx and App.tsx outside any route component (contexts, theme,
+    route config) affect every route.
+    """
+
+    def __init__(self, routes, src_dir=APP_SRC_DIR):
+        self.src_dir = Path(src_dir).resolve()
+        self.graph = import_graph(src_dir)
+        app_file = self.src_dir / 'App.tsx'
+        components = imported_names(app_file)
+
+        self.route_files = {}
+        for route in routes:
+            files = {components[c] for c in route.get('components', []) if c in components}
+            self.route_files.setdefault(route['path'], set()).update(closure(self.graph, files))
+
+        route_roots = {components[c] for route in routes for c in route.get('components', []) if c in components}
+        entries = [self.src_dir / name for name in ENTRY_FILES if (self.src_dir / name).exists()]
+        self.global_files = closure(self.graph, entries, skip=route_roots)
+        self.redirects = {route['path']: route['redirect_to'] for route in routes if route.get('redirect_to')}
+
+    def affected_routes(self, changed):
+        """(every route affected?, set of affected route paths) for changed app files"""
+        changed = {Path(path).resolve() for path in changed}
+        if changed & self.global_files:
+            return True, set(self.route_files)
+        return False, {path for path, files in self.route_files.items() if changed & files}
+
+    def resolve_redirect(self, path):
+        """Route a redirecting path (e.g. /login -> /auth) ends up on"""
+        seen = set()
+        while path in self.redirects and path not in seen:
+            seen.add(path)
+            path = self.redirects[path]
+        return path
+
+
+def _git(*args):
+    result = subprocess.run(['git', '-C', str(REPO_ROOT), *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def changed_files(ref):
+    """Files changed since the merge base with ref, including uncommitted and untracked ones"""
+    base = _git('merge-base', ref, 'HEAD').strip()
+    names = _git('diff', '--name-only', base).splitlines()
+    names += _git('ls-files', '--others', '--exclude-standard').splitlines()
+    return sorted({REPO_ROOT / name for name in names if name})
+
+
+def is_global_change(path):
+    """Changes that can affect any test: app build setup, static assets, suite config"""
+    relative = Path(path).resolve().relative_to(REPO_ROOT.resolve()).as_posix()
+    return any(relative == prefix or relative.startswith(prefix.rstrip('/') + '/')
+               for prefix in CHANGE_IMPACT_GLOBAL_PATHS)
@@ -0,0 +1,355 @@
+"""
+Test Data Seeder
+Generates large, realistic datasets through the API for data-volume testing
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import requests
+from faker import Faker
+
+from config.config import (
+    API_BASE_URL, TEST_USERS, TEST_DATA_FILE, SEED_CONCURRENCY,
+    SEED_BATCH_SIZE, SEED_MAX_RETRIES, SEED_RANDOM_SEED, SEED_TAG_PREFIX
+)
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_CATEGORIES = [
+    'Groceries', 'Dining', 'Transportation', 'Shopping', 'Entertainment',
+    'Healthcare', 'Utilities', 'Rent', 'Travel', 'Education',
+]
+BILL_TYPES = ['utility', 'insurance', 'subscription', 'school_tuition', 'credit_card', 'medical', 'other']
+BILL_FREQUENCIES = ['monthly', 'quarterly', 'yearly']
+ACCOUNT_TYPES = ['checking', 'savings', 'credit_card', 'investment']
+LOAN_PURPOSES = ['Home Improvement', 'Car Purchase', 'Education', 'Debt Consolidation', 'Medical']
+
+
+def load_test_data():
+    """Load templates from data/test_data.json"""
+    with open(TEST_DATA_FILE, 'r') as f:
+        return json.load(f)
+
+
+class DataSeeder:
+    """Create, reuse and clean up bulk test data for a user"""
+
+    # Per-resource API endpoints and the field used to store the seed tag
+    RESOURCES = {
+        'bank_accounts': {
+            'list': '/bankaccounts',
+            'create': '/bankaccounts',
+            'delete': ('POST', '/bankaccounts/{id}/delete'),
+            'tag_field': 'description',
+            'paginated': False,
+        },
+        'bills': {
+            'list': '/bills',
+            'create': '/bills',
+            'delete': ('DELETE', '/Bills/{id}'),
+            'tag_field': 'referenceNumber',
+            'paginated': True,
+        },
+        'loans': {
+            'list': '/Loans/user/{user_id}',
+            'create': '/Loans/apply',
+            'delete': ('POST', '/Loans/{id}/delete'),
+            'tag_field': 'additionalInfo',
+            'paginated': False,
+        },
+        'transactions': {
+            'list': '/BankAccounts/transactions',
+            'create': '/BankAccounts/transactions',
+            'delete': ('POST', '/BankAccounts/transactions/{id}/delete'),
+            'tag_field': 'referenceNumber',
+            'paginated': True,
+        },
+    }
+
+    # Seeding order: transactions need bank accounts to exist first
+    SEED_ORDER = ['bank_accounts', 'bills', 'loans', 'transactions']
+
+    LIST_PAGE_SIZE = 500
+
+    def __init__(self, api_base_url=API_BASE_URL, user_key='valid_user', dataset='default',
+                 random_seed=SEED_RANDOM_SEED, concurrency=SEED_CONCURRENCY, batch_size=SEED_BATCH_SIZE):
+        self.api_base_url = api_base_url.rstrip('/')
+        self.user_key = user_key
+        self.dataset = dataset
+        self.random_seed = random_seed
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.templates = load_test_data()
+        self.faker = Faker()
+        self.token = None
+        self.user_id = None
+        self._local = threading.local()
+
+    # Session / HTTP helpers
+
+    def _session(self):
+        """Return a requests session for the current thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            if self.token:
+                session.headers['Authorization'] = f"Bearer {self.token}"
+            self._local.session = session
+        return session
+
+    def _request(self, method, path, payload=None):
+        """Send an API request, retrying throttled and server errors"""
+        url = f"{self.api_base_url}{path}"
+        for attempt in range(1, SEED_MAX_RETRIES + 1):
+            try:
+                response = self._session().request(method, url, json=payload, timeout=30)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+                return response.json() if response.content else None
+            except requests.RequestException as e:
+                status = getattr(e.response, 'status_code', None)
+                retryable = status is None or status == 429 or status >= 500
+                if attempt == SEED_MAX_RETRIES or not retryable:
+                    raise
+                time.sleep(0.5 * 2 ** (attempt - 1))
+
+    @staticmethod
+    def _extract_items(response):
+        """Pull the record list out of the API's response envelopes"""
+        data = response.get('data', response) if isinstance(response, dict) else response
+        if isinstance(data, dict):
+            data = data.get('data') or data.get('items') or []
+        return data if isinstance(data, list) else []
+
+    def login(self):
+        """Authenticate as the configured test user"""
+        user = TEST_USERS[self.user_key]
+        response = self._request('POST', '/Auth/login', {
+            'email': user['email'],
+            'password': user['password'],
+        })
+        data = response.get('data', response)
+        self.token = data['token']
+        self.user_id = data['user']['id']
+        self._local = threading.local()
+        logger.info(f"Seeder logged in as {user['email']}")
+        return self
+
+    # Record generation
+
+    def tag(self, resource, index):
+        """Deterministic tag identifying a seeded record"""
+        return f"{SEED_TAG_PREFIX}:{self.dataset}:{resource}:{index}"
+
+    def _is_seed_tag(self, value, resource=None):
+        prefix = f"{SEED_TAG_PREFIX}:{self.dataset}:"
+        if resource:
+            prefix += f"{resource}:"
+        return isinstance(value, str) and value.startswith(prefix)
+
+    def build_record(self, resource, index, context=None):
+        """Generate the payload for one record; same index -> same payload"""
+        fake = self.faker
+        fake.seed_instance(f"{self.random_seed}:{self.dataset}:{resource}:{index}")
+        financial = self.templates['financial_data']
+        profile = self.templates['profile_data']['employed']
+        tag = self.tag(resource, index)
+        today = datetime.now()
+
+        if resource == 'bank_accounts':
+            return {
+                'accountName': f"{fake.company()} {fake.random_element(['Checking', 'Savings', 'Card'])}",
+                'accountType': fake.random_element(ACCOUNT_TYPES),
+                'initialBalance': round(fake.pyfloat(min_value=financial['monthlySavingsGoal'],
+                                                     max_value=financial['monthlySavingsGoal'] * 50), 2),
+                'currency': 'USD',
+                'description': tag,
+                'financialInstitution': fake.company(),
+                'accountNumber': fake.bban(),
+                'syncFrequency': 'MANUAL',
+            }
+
+        if resource == 'bills':
+            due_date = today + timedelta(days=fake.random_int(-60, 60))
+            return {
+                'billName': f"{fake.company()} {fake.random_element(['Electric', 'Water', 'Internet', 'Phone', 'Insurance'])}",
+                'billType': fake.random_element(BILL_TYPES),
+                'amount': round(fake.pyfloat(min_value=10, max_value=financial['monthlyTaxDeductions']), 2),
+                'dueDate': due_date.strftime('%Y-%m-%dT00:00:00'),
+                'frequency': fake.random_element(BILL_FREQUENCIES),
+                'provider': fake.company(),
+                'referenceNumber': tag,
+                'notes': fake.sentence(),
+            }
+
+        if resource == 'loans':
+            monthly_income = round(financial['monthlyTaxDeductions'] / financial['taxRate'], 2)
+            return {
+                'principal': fake.random_int(1000, 50000),
+                'interestRate': round(fake.pyfloat(min_value=3, max_value=18), 2),
+                'purpose': fake.random_element(LOAN_PURPOSES),
+                'term': fake.random_element([6, 12, 24, 36, 48, 60]),
+                'monthlyIncome': monthly_income,
+                'employmentStatus': profile['employmentType'],
+                'additionalInfo': tag,
+            }
+
+        if resource == 'transactions':
+            account_ids = (context or {}).get('bank_account_ids') or []
+            is_credit = fake.random_int(1, 10) == 1
+            transaction_date = today - timedelta(days=fake.random_int(0, 730),
+                                                 minutes=fake.random_int(0, 1439))
+            record = {
+                'bankAccountId': account_ids[index % len(account_ids)] if account_ids else None,
+                'amount': round(fake.pyfloat(min_value=1, max_value=financial['monthlySavingsGoal']), 2),
+                'transactionType': 'CREDIT' if is_credit else 'DEBIT',
+                'description': fake.bs().capitalize(),
+                'category': 'CREDIT' if is_credit else fake.random_element(TRANSACTION_CATEGORIES),
+                'merchant': fake.company(),
+                'location': profile['location'],
+                'transactionDate': transaction_date.strftime('%Y-%m-%dT%H:%M'),
+                'referenceNumber': tag,
+                'currency': 'USD',
+                'isRecurring': False,
+            }
+            return record
+
+        raise ValueError(f"Unknown seed resource: {resource}")
+
+    # Listing
+
+    def list_records(self, resource):
+        """List every record of a resource for the user"""
+        spec = self.RESOURCES[resource]
+        path = spec['list'].format(user_id=self.user_id)
+        if not spec['paginated']:
+            return self._extract_items(self._request('GET', path))
+
+        records = []
+        seen_ids = set()
+        page = 1
+        while True:
+            items = self._extract_items(
+                self._request('GET', f"{path}?page={page}&limit={self.LIST_PAGE_SIZE}")
+            )
+            new_items = [item for item in items if item.get('id') not in seen_ids]
+            records.extend(new_items)
+            seen_ids.update(item.get('id') for item in new_items)
+            # Stop when the API returns a short page or ignores pagination
+            if len(items) < self.LIST_PAGE_SIZE or not new_items:
+                break
+            page += 1
+        return records
+
+    def list_seeded(self, resource):
+        """Map seed index -> record for records created by this dataset"""
+        tag_field = self.RESOURCES[resource]['tag_field']
+        seeded = {}
+        for record in self.list_records(resource):
+            value = record.get(tag_field)
+            if self._is_seed_tag(value, resource):
+                seeded[int(value.rsplit(':', 1)[1])] = record
+        return seeded
+
+    # Seeding
+
+    def _run_batched(self, func, items, label):
+        """Run func over items in batches with bounded concurrency"""
+        succeeded = 0
+        failed = 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for offset in range(0, len(items), self.batch_size):
+                batch = items[offset:offset + self.batch_size]
+                futures = [executor.submit(func, item) for item in batch]
+                batch_failed = 0
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        succeeded += 1
+                    except Exception as e:
+                        batch_failed += 1
+                        logger.debug(f"{label} failed: {e}")
+                failed += batch_failed
+                logger.info(f"{label}: {offset + len(batch)}/{len(items)} processed")
+                if batch_failed == len(batch):
+                    logger.error(f"{label}: entire batch failed, aborting")
+                    break
+        elapsed = time.perf_counter() - started
+        rate = succeeded / elapsed if elapsed else 0
+        logger.info(f"{label}: {succeeded} ok, {failed} failed in {elapsed:.1f}s ({rate:.0f}/s)")
+        return succeeded, failed
+
+    def seed_resource(self, resource, count, context=None, trim=False):
+        """Ensure records 0..count-1 exist for a resource"""
+        existing = self.list_seeded(resource)
+        missing = [i for i in range(count) if i not in existing]
+        summary = {'requested': count, 'existing': count - len(missing), 'created': 0, 'failed': 0}
+        if trim:
+            surplus = [record for i, record in existing.items() if i >= count]
+            method, path = self.RESOURCES[resource]['delete']
+            summary['trimmed'], _ = self._run_batched(
+                lambda record: self._request(method, path.format(id=record['id'])),
+                surplus,
+                f"Trim {resource}",
+            )
+        if not missing:
+            logger.info(f"Seed {resource}: all {count} records already present")
+            return summary
+
+        create_path = self.RESOURCES[resource]['create']
+        payloads = [self.build_record(resource, i, context) for i in missing]
+        summary['created'], summary['failed'] = self._run_batched(
+            lambda payload: self._request('POST', create_path, payload),
+            payloads,
+            f"Seed {resource}",
+        )
+        return summary
+
+    def seed(self, counts, trim=False):
+        """Seed several resources, e.g. {'transactions': 10000}"""
+        if not self.token:
+            self.login()
+        summary = {}
+        context = {}
+        for resource in self.SEED_ORDER:
+            count = counts.get(resource, 0)
+            if not count:
+                continue
+            if resource == 'transactions':
+                accounts = self.list_seeded('bank_accounts')
+                if not accounts:
+                    summary['bank_accounts'] = self.seed_resource('bank_accounts', 1)
+                    accounts = self.list_seeded('bank_accounts')
+                context['bank_account_ids'] = [record['id'] for _, record in sorted(accounts.items())]
+            summary[resource] = self.seed_resource(resource, count, context, trim=trim)
+        return summary
+
+    # Cleanup
+
+    def cleanup(self, resources=None):
+        """Delete every record seeded by this dataset"""
+        if not self.token:
+            self.login()
+        deleted = {}
+        # Reverse order so transactions go before their bank accounts
+        for resource in reversed(self.SEED_ORDER):
+            if resources and resource not in resources:
+                continue
+            records = list(self.list_seeded(resource).values())
+            if not records:
+                deleted[resource] = 0
+                continue
+            method, path = self.RESOURCES[resource]['delete']
+            deleted[resource], _ = self._run_batched(
+                lambda record: self._request(method, path.format(id=record['id'])),
+                records,
+                f"Cleanup {resource}",
+            )
+        return deleted
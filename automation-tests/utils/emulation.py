@@ -0,0 +1,58 @@
+"""
+Emulation Utility
+Applies named network and CPU throttling profiles through CDP
+"""
+
+import logging
+from config.config import EMULATION_PROFILES
+from utils.cdp import execute_cdp, is_chromium
+
+logger = logging.getLogger(__name__)
+
+
+def parse_profiles(value):
+    """Split a --profile value such as 'fast-3g,cpu-4x' into profile names"""
+    names = [name.strip() for name in value.split(',') if name.strip()] or ['none']
+    unknown = [name for name in names if name not in EMULATION_PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown emulation profile(s): {', '.join(unknown)} "
+                         f"(available: {', '.join(EMULATION_PROFILES)})")
+    return names
+
+
+class EmulationProfile:
+    """Network and CPU conditions applied to a Chromium browser"""
+
+    def __init__(self, name):
+        if name not in EMULATION_PROFILES:
+            raise ValueError(f"Unknown emulation profile: {name}")
+        self.name = name
+        self.settings = EMULATION_PROFILES[name]
+
+    @property
+    def is_throttled(self):
+        return bool(self.settings)
+
+    def apply(self, driver):
+        """Apply the profile; returns False if the browser can't emulate it"""
+        if not self.is_throttled:
+            return True
+        if not is_chromium(driver):
+            logger.warning(f"Emulation profile '{self.name}' needs Chrome/Edge (CDP)")
+            return False
+
+        network = self.settings.get('network')
+        if network:
+            execute_cdp(driver, 'Network.enable')
+            execute_cdp(driver, 'Network.emulateNetworkConditions', {
+                'offline': False,
+                'latency': network['latency_ms'],
+                # CDP expects bytes per second
+                'downloadThroughput': network['download_kbps'] * 1024 / 8,
+                'uploadThroughput': network['upload_kbps'] * 1024 / 8,
+            })
+        cpu_slowdown = self.settings.get('cpu_slowdown')
+        if cpu_slowdown:
+            execute_cdp(driver, 'Emulation.setCPUThrottlingRate', {'rate': cpu_slowdown})
+        logger.info(f"Emulation profile '{self.name}' applied")
+        return True
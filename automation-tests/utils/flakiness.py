@@ -0,0 +1,81 @@
+"""
+Flakiness Utility
+Per-test flip rates from archived runs, deciding which tests to retry and which to quarantine
+"""
+
+import logging
+from config.config import (
+    FLAKY_HISTORY_RUNS, FLAKY_MIN_RUNS, FLAKY_FLIP_RATE, QUARANTINE_MIN_RUNS, QUARANTINE_FLIP_RATE
+)
+from utils.run_diff import list_runs, load_runs
+
+logger = logging.getLogger(__name__)
+
+
+def analyze_history(reports):
+    """Flip statistics of every test in a list of reports, oldest first
+
+    A flip is an outcome change from one run to the next, or a run where
+    the test only passed on an in-place retry. Skipped and cached results
+    are ignored.
+    """
+    outcomes = {}
+    for report in reports:
+        for result in report.get('test_results', []):
+            if result['status'] not in ('PASSED', 'FAILED') or result.get('cached'):
+                continue
+            outcomes.setdefault(result['test_name'], []).append(
+                (result['status'], bool(result.get('passed_on_retry')))
+            )
+
+    stats = {}
+    for test, runs in outcomes.items():
+        changes = sum(1 for a, b in zip(runs, runs[1:]) if a[0] != b[0])
+        retried = sum(1 for _, passed_on_retry in runs if passed_on_retry)
+        flips = changes + retried
+        stats[test] = {
+            'runs': len(runs),
+            'failures': sum(1 for status, _ in runs if status == 'FAILED'),
+            'flips': flips,
+            'flip_rate': flips / len(runs),
+            'status': classify(len(runs), flips / len(runs)),
+        }
+    return stats
+
+
+def classify(runs, flip_rate):
+    """'quarantined', 'flaky' or 'stable'"""
+    if runs >= QUARANTINE_MIN_RUNS and flip_rate >= QUARANTINE_FLIP_RATE:
+        return 'quarantined'
+    if runs >= FLAKY_MIN_RUNS and flip_rate >= FLAKY_FLIP_RATE:
+        return 'flaky'
+    return 'stable'
+
+
+class FlakinessIndex:
+    """Flip statistics of the last FLAKY_HISTORY_RUNS archived runs"""
+
+    def __init__(self, stats=None):
+        self.stats = stats or {}
+
+    @classmethod
+    def from_history(cls, limit=FLAKY_HISTORY_RUNS):
+        runs = list_runs()[-limit:]
+        try:
+            stats = analyze_history(load_runs(runs))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read run history for flakiness: {e}")
+            stats = {}
+        index = cls(stats)
+        logger.info(f"Flakiness from {len(runs)} runs: {len(index.tests('flaky'))} flaky, "
+                    f"{len(index.tests('quarantined'))} quarantined")
+        return index
+
+    def status(self, test_name):
+        return self.stats.get(test_name, {}).get('status', 'stable')
+
+    def get(self, test_name):
+        return self.stats.get(test_name)
+
+    def tests(self, status):
+        return sorted(name for name, stats in self.stats.items() if stats['status'] == status)
@@ -0,0 +1,135 @@
+"""
+Interaction Tracker Utility
+Records main-thread long tasks and interaction-to-next-paint style latency of test actions
+"""
+
+import logging
+import weakref
+from datetime import datetime
+from config.config import INTERACTION_EVENT_THRESHOLD_MS
+from utils.cdp import add_init_script
+
+logger = logging.getLogger(__name__)
+
+# Buffers PerformanceObserver 'longtask' and 'event' entries in the page.
+# Guarded so it is safe to run more than once in the same document.
+INTERACTION_OBSERVER_SCRIPT = """
+(function() {
+    if (window.__interactionObserverInstalled) { return; }
+    window.__interactionObserverInstalled = true;
+    var MAX_ENTRIES = 500;
+    var longTasks = window.__longTasks = [];
+    var events = window.__eventTimings = [];
+    function keep(buffer, entry) {
+        buffer.push(entry);
+        if (buffer.length > MAX_ENTRIES) { buffer.shift(); }
+    }
+    try {
+        new PerformanceObserver(function(list) {
+            list.getEntries().forEach(function(e) {
+                keep(longTasks, {start: e.startTime, duration: e.duration});
+            });
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+    try {
+        new PerformanceObserver(function(list) {
+            list.getEntries().forEach(function(e) {
+                keep(events, {
+                    name: e.name,
+                    start: e.startTime,
+                    duration: e.duration,
+                    input_delay: e.processingStart - e.startTime,
+                    processing: e.processingEnd - e.processingStart,
+                    presentation_delay: e.startTime + e.duration - e.processingEnd
+                });
+            });
+        }).observe({type: 'event', buffered: true, durationThreshold: %d});
+    } catch (e) {}
+})();
+""" % INTERACTION_EVENT_THRESHOLD_MS
+
+# Resolves after the next paint, then returns entries that started after the action
+COLLECT_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var since = arguments[0] - performance.timeOrigin;
+requestAnimationFrame(function() {
+    setTimeout(function() {
+        done({
+            path: location.pathname,
+            events: (window.__eventTimings || []).filter(function(e) { return e.start >= since; }),
+            long_tasks: (window.__longTasks || []).filter(function(t) { return t.start + t.duration >= since; }),
+            observed: !!window.__interactionObserverInstalled
+        });
+    }, 0);
+});
+"""
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def get_interaction_tracker(driver):
+    """Return the shared InteractionTracker of a driver"""
+    if driver not in _trackers:
+        _trackers[driver] = InteractionTracker(driver)
+    return _trackers[driver]
+
+
+def forget_interaction_tracker(driver):
+    """Drop the InteractionTracker of a driver whose session is reused for another test"""
+    _trackers.pop(driver, None)
+
+
+class InteractionTracker:
+    """Measure the latency of each click/type performed through page objects"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.enabled = False
+        self.interactions = []
+        self.form_fills = []  # BasePage.fill_form results
+        self.element_cache = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidations': 0}  # Of all page objects
+
+    def install(self):
+        """Register the observers before the next navigation"""
+        add_init_script(self.driver, INTERACTION_OBSERVER_SCRIPT)
+        self.enabled = True
+
+    def start(self):
+        """Timestamp (epoch ms) taken just before an action"""
+        if not self.enabled:
+            return None
+        try:
+            return self.driver.execute_script(
+                INTERACTION_OBSERVER_SCRIPT + "return performance.timeOrigin + performance.now();"
+            )
+        except Exception as e:
+            logger.debug(f"Could not start interaction timing: {e}")
+            return None
+
+    def finish(self, started_at, action, target):
+        """Record the slowest event of an action and the long tasks it caused"""
+        if started_at is None:
+            return None
+        try:
+            result = self.driver.execute_async_script(COLLECT_SCRIPT, started_at)
+        except Exception as e:
+            # The action navigated away or closed the window
+            logger.debug(f"Could not collect interaction timing for {action}: {e}")
+            return None
+
+        worst = max(result['events'], key=lambda e: e['duration'], default=None)
+        interaction = {
+            'page': result['path'],
+            'action': action,
+            'target': str(target),
+            'latency_ms': worst['duration'] if worst else None,
+            'event': worst['name'] if worst else None,
+            'input_delay_ms': worst['input_delay'] if worst else None,
+            'processing_ms': worst['processing'] if worst else None,
+            'presentation_delay_ms': worst['presentation_delay'] if worst else None,
+            'long_tasks': len(result['long_tasks']),
+            'long_task_ms': sum(t['duration'] for t in result['long_tasks']),
+            'timestamp': datetime.now().isoformat(),
+        }
+        self.interactions.append(interaction)
+        return interaction
@@ -0,0 +1,191 @@
+"""
+Latency Histogram Utility
+Fixed-memory, mergeable per-endpoint latency histograms for API calls
+"""
+
+import math
+import re
+from urllib.parse import urlparse
+from config.config import LATENCY_HISTOGRAM_GROWTH, LATENCY_HISTOGRAM_MAX_MS
+
+# Path segments that identify a record rather than a route
+ID_SEGMENT_PATTERNS = [
+    re.compile(r'^\d+$'),
+    re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'),
+    re.compile(r'^[0-9a-fA-F]{24,}$'),
+    re.compile(r'^[A-Za-z0-9_-]{32,}$'),
+]
+
+
+def endpoint_template(url, method='GET'):
+    """Normalize a call into an endpoint template, e.g. 'GET /api/Loans/{id}'"""
+    path = urlparse(str(url or '')).path or '/'
+    segments = [
+        '{id}' if any(p.match(segment) for p in ID_SEGMENT_PATTERNS) else segment
+        for segment in path.rstrip('/').split('/')
+    ]
+    return f"{(method or 'GET').upper()} {'/'.join(segments) or '/'}"
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram with bounded relative error
+
+    Bucket i covers (GROWTH ** (i - 1), GROWTH ** i] milliseconds, so the
+    bucket count is fixed and quantiles are accurate to about half the
+    growth factor. Two histograms merge by adding their bucket counts.
+    """
+
+    GROWTH = LATENCY_HISTOGRAM_GROWTH
+    BUCKETS = int(math.ceil(math.log(LATENCY_HISTOGRAM_MAX_MS) / math.log(LATENCY_HISTOGRAM_GROWTH))) + 1
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def bucket(self, value):
+        """Bucket index of a latency in ms"""
+        if value <= 1:
+            return 0
+        return min(int(math.ceil(math.log(value) / math.log(self.GROWTH))), self.BUCKETS - 1)
+
+    def record(self, value):
+        """Add one latency in ms"""
+        value = max(float(value), 0.0)
+        self.counts[self.bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add another histogram's counts into this one"""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Approximate latency at quantile q (0..1)"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1) + 1
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                # Geometric middle of the bucket, clamped to observed values
+                estimate = self.GROWTH ** (index - 0.5) if index else 1.0
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        """Sparse, serializable form"""
+        return {
+            'buckets': {str(i): c for i, c in enumerate(self.counts) if c},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        for index, count in data['buckets'].items():
+            histogram.counts[int(index)] = count
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
+
+class LatencyAggregator:
+    """Latency histograms, call counts and errors per endpoint template and emulation profile"""
+
+    def __init__(self, worker='master'):
+        self.worker = worker
+        self.endpoints = {}  # (template, profile) -> {'histogram', 'errors', 'workers'}
+
+    def _endpoint(self, key):
+        if key not in self.endpoints:
+            self.endpoints[key] = {'histogram': LatencyHistogram(), 'errors': 0, 'workers': {}}
+        return self.endpoints[key]
+
+    def record(self, call, profile='none'):
+        """Add one call recorded by the API monitor under an emulation profile"""
+        if call.get('duration') is None:
+            return
+        endpoint = self._endpoint((endpoint_template(call.get('url'), call.get('method')), profile))
+        endpoint['histogram'].record(call['duration'])
+        status = call.get('status') or 0
+        if status == 0 or status >= 400:
+            endpoint['errors'] += 1
+        endpoint['workers'][self.worker] = endpoint['workers'].get(self.worker, 0) + 1
+
+    def record_all(self, calls, profile='none'):
+        for call in calls:
+            self.record(call, profile)
+
+    def merge(self, other):
+        """Add another aggregator's endpoints into this one"""
+        for key, data in other.endpoints.items():
+            endpoint = self._endpoint(key)
+            endpoint['histogram'].merge(data['histogram'])
+            endpoint['errors'] += data['errors']
+            for worker, count in data['workers'].items():
+                endpoint['workers'][worker] = endpoint['workers'].get(worker, 0) + count
+        return self
+
+    def to_dict(self):
+        return {
+            'worker': self.worker,
+            'endpoints': [
+                {
+                    'endpoint': template,
+                    'profile': profile,
+                    'histogram': data['histogram'].to_dict(),
+                    'errors': data['errors'],
+                    'workers': data['workers'],
+                }
+                for (template, profile), data in self.endpoints.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregator = cls(data['worker'])
+        for endpoint in data['endpoints']:
+            aggregator.endpoints[(endpoint['endpoint'], endpoint['profile'])] = {
+                'histogram': LatencyHistogram.from_dict(endpoint['histogram']),
+                'errors': endpoint['errors'],
+                'workers': dict(endpoint['workers']),
+            }
+        return aggregator
+
+    def summary(self):
+        """p50/p95/p99, counts and error rate per endpoint and profile, slowest p95 first"""
+        rows = []
+        for (template, profile), data in self.endpoints.items():
+            histogram = data['histogram']
+            rows.append({
+                'endpoint': template,
+                'profile': profile,
+                'count': histogram.count,
+                'errors': data['errors'],
+                'error_rate': data['errors'] / histogram.count if histogram.count else 0.0,
+                'mean_ms': histogram.total / histogram.count if histogram.count else None,
+                'p50_ms': histogram.quantile(0.50),
+                'p95_ms': histogram.quantile(0.95),
+                'p99_ms': histogram.quantile(0.99),
+                'max_ms': histogram.max,
+                'workers': data['workers'],
+            })
+        return sorted(rows, key=lambda r: r['p95_ms'] or 0, reverse=True)
@@ -0,0 +1,267 @@
+"""
+Live Progress Utility
+Streams test start/finish events to a JSONL file and an optional local SSE page
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.config import LIVE_EVENTS_FILE, LIVE_HOST, LIVE_REFRESH_SECONDS, LIVE_SLOWEST_LIMIT
+from utils.report_generator import REPORT_CSS
+
+logger = logging.getLogger(__name__)
+
+
+class LiveProgress:
+    """Track a running session and append every event to a tail-able JSONL file"""
+
+    def __init__(self, path=LIVE_EVENTS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.total = 0
+        self.workers = {}  # worker id -> nodeid of its running test (or None)
+        self.running = {}  # nodeid -> {'worker', 'started'}
+        self.outcomes = {'passed': 0, 'failed': 0, 'skipped': 0}
+        self.api_errors = 0
+        self.recent_failures = []
+        self.finished = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.emit('session_start')
+
+    def emit(self, event, **data):
+        """Write one event line"""
+        line = json.dumps({'event': event, 'time': datetime.now().isoformat(), **data}, default=str)
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line + '\n')
+                self.file.flush()
+
+    def worker_ready(self, worker):
+        with self.lock:
+            self.workers.setdefault(worker, None)
+        self.emit('worker_ready', worker=worker)
+
+    def collected(self, total):
+        with self.lock:
+            self.total = max(self.total, total)
+        self.emit('collected', total=total)
+
+    def test_started(self, nodeid, worker=None):
+        with self.lock:
+            self.running[nodeid] = {'worker': worker, 'started': time.time(), 'outcome': 'passed', 'duration': 0.0}
+            if worker:
+                self.workers[worker] = nodeid
+        self.emit('test_start', nodeid=nodeid, worker=worker)
+
+    def phase_finished(self, nodeid, outcome, duration, message=None):
+        """Fold the setup/call/teardown result into the test outcome"""
+        with self.lock:
+            test = self.running.get(nodeid)
+            if not test:
+                return
+            test['duration'] += duration
+            if outcome == 'failed' or (outcome == 'skipped' and test['outcome'] == 'passed'):
+                test['outcome'] = outcome
+            if message and not test.get('message'):
+                test['message'] = message
+
+    def api_errors_found(self, nodeid, errors):
+        with self.lock:
+            self.api_errors += len(errors)
+        for error in errors:
+            self.emit('api_error', nodeid=nodeid, **error)
+
+    def test_finished(self, nodeid):
+        with self.lock:
+            test = self.running.pop(nodeid, None)
+            if not test:
+                return
+            worker = test['worker']
+            if worker and self.workers.get(worker) == nodeid:
+                self.workers[worker] = None
+            self.outcomes[test['outcome']] = self.outcomes.get(test['outcome'], 0) + 1
+            if test['outcome'] == 'failed':
+                self.recent_failures = ([{'nodeid': nodeid, 'message': test.get('message')}] + self.recent_failures)[:10]
+        self.emit('test_finish', nodeid=nodeid, outcome=test['outcome'],
+                  duration=round(test['duration'], 3), worker=worker)
+
+    def session_finished(self, exitstatus):
+        with self.lock:
+            self.finished = True
+        self.emit('session_finish', exitstatus=exitstatus, **self.state())
+        with self.lock:
+            self.file.close()
+
+    def state(self):
+        """Throughput, ETA, worker utilization and slowest running tests"""
+        with self.lock:
+            now = time.time()
+            elapsed = now - self.started_at
+            done = sum(self.outcomes.values())
+            per_minute = done / elapsed * 60 if elapsed and done else 0.0
+            remaining = max(self.total - done, 0)
+            busy = len([t for t in self.workers.values() if t])
+            slowest = sorted(
+                ({'nodeid': nodeid, 'worker': t['worker'], 'running_s': now - t['started']}
+                 for nodeid, t in self.running.items()),
+                key=lambda t: t['running_s'], reverse=True
+            )[:LIVE_SLOWEST_LIMIT]
+            return {
+                'total': self.total,
+                'done': done,
+                'outcomes': dict(self.outcomes),
+                'api_errors': self.api_errors,
+                'elapsed_s': elapsed,
+                'tests_per_minute': per_minute,
+                'eta_s': remaining / per_minute * 60 if per_minute else None,
+                'workers': len(self.workers),
+                'busy_workers': busy,
+                'slowest_running': slowest,
+                'recent_failures': list(self.recent_failures),
+                'finished': self.finished,
+            }
+
+
+LIVE_PAGE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>UtilityHub360 Live Test Progress</title>
+    <style>
+        %s
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>⏳ UtilityHub360 Live Test Progress</h1>
+            <p id="status">Connecting…</p>
+        </div>
+        <div class="summary">
+            <div class="summary-card"><h3 id="done">-</h3><p>Done</p></div>
+            <div class="summary-card"><h3 class="failed" id="failed">-</h3><p>Failed</p></div>
+            <div class="summary-card"><h3 id="rate">-</h3><p>Tests / Minute</p></div>
+            <div class="summary-card"><h3 id="eta">-</h3><p>ETA</p></div>
+            <div class="summary-card"><h3 id="workers">-</h3><p>Busy Workers</p></div>
+            <div class="summary-card"><h3 class="skipped" id="api-errors">-</h3><p>API Errors</p></div>
+        </div>
+        <div class="section">
+            <h2>🐢 Slowest Running Tests</h2>
+            <table><thead><tr><th>Test</th><th>Worker</th><th>Running (s)</th></tr></thead>
+            <tbody id="slowest"></tbody></table>
+        </div>
+        <div class="section">
+            <h2>❌ Recent Failures</h2>
+            <table><tbody id="failures"></tbody></table>
+        </div>
+    </div>
+    <script>
+        function minutes(s) { return s === null ? '-' : Math.floor(s / 60) + 'm ' + Math.round(s %% 60) + 's'; }
+        function cell(text) { var td = document.createElement('td'); td.textContent = text; return td; }
+        function fill(id, rows) {
+            var body = document.getElementById(id);
+            body.innerHTML = '';
+            rows.forEach(function(values) {
+                var tr = document.createElement('tr');
+                values.forEach(function(v) { tr.appendChild(cell(v)); });
+                body.appendChild(tr);
+            });
+        }
+        var source = new EventSource('/events');
+        source.onmessage = function(message) {
+            var s = JSON.parse(message.data);
+            document.getElementById('status').textContent = (s.finished ? 'Finished' : 'Running') +
+                ' · elapsed ' + minutes(s.elapsed_s);
+            document.getElementById('done').textContent = s.done + ' / ' + s.total;
+            document.getElementById('failed').textContent = s.outcomes.failed;
+            document.getElementById('rate').textContent = s.tests_per_minute.toFixed(1);
+            document.getElementById('eta').textContent = minutes(s.eta_s);
+            document.getElementById('workers').textContent = s.busy_workers + ' / ' + s.workers;
+            document.getElementById('api-errors').textContent = s.api_errors;
+            fill('slowest', s.slowest_running.map(function(t) {
+                return [t.nodeid, t.worker || '-', t.running_s.toFixed(1)];
+            }));
+            fill('failures', s.recent_failures.map(function(f) { return [f.nodeid, f.message || '']; }));
+            if (s.finished) { source.close(); }
+        };
+    </script>
+</body>
+</html>
+""" % REPORT_CSS
+
+
+class LiveProgressHandler(BaseHTTPRequestHandler):
+    """Serve the live page, a state snapshot and a Server-Sent Events stream"""
+
+    progress = None
+
+    def log_message(self, format, *args):
+        logger.debug(f"Live progress {self.address_string()} - {format % args}")
+
+    def _send(self, body, content_type):
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/':
+            self._send(LIVE_PAGE, 'text/html; charset=utf-8')
+        elif self.path == '/state':
+            self._send(json.dumps(self.progress.state()), 'application/json')
+        elif self.path == '/events':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            try:
+                while True:
+                    state = self.progress.state()
+                    self.wfile.write(f"data: {json.dumps(state)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                    if state['finished']:
+                        break
+                    time.sleep(LIVE_REFRESH_SECONDS)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        else:
+            self.send_error(404)
+
+
+class LiveProgressServer:
+    """Serve live progress in a background thread"""
+
+    def __init__(self, progress, port, host=LIVE_HOST):
+        self.progress = progress
+        self.host = host
+        self.port = port
+        self.httpd = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """Start serving the live page"""
+        handler = type('BoundLiveProgressHandler', (LiveProgressHandler,), {'progress': self.progress})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        logger.info(f"📡 Live progress: {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
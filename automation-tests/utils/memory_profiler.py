@@ -0,0 +1,79 @@
+"""
+Memory Profiler Utility
+Samples JS heap, DOM nodes and event listeners after forced GC to detect SPA memory leaks
+"""
+
+import logging
+from config.config import LEAK_THRESHOLDS, LEAK_WARMUP_ITERATIONS
+from utils.cdp import execute_cdp, get_performance_metrics, is_chromium
+from utils.stats import linear_fit
+
+logger = logging.getLogger(__name__)
+
+# Performance.getMetrics names for each sampled metric
+LEAK_METRICS = {
+    'js_heap_bytes': 'JSHeapUsedSize',
+    'dom_nodes': 'Nodes',
+    'event_listeners': 'JSEventListeners',
+}
+
+
+class MemoryProfiler:
+    """Take retained-memory samples of a Chromium page"""
+
+    def __init__(self, driver):
+        if not is_chromium(driver):
+            raise ValueError("Memory profiling needs Chrome or Edge (CDP)")
+        self.driver = driver
+        self.samples = []
+
+    def collect_garbage(self):
+        """Force a full garbage collection so only retained memory is measured"""
+        execute_cdp(self.driver, 'HeapProfiler.collectGarbage')
+
+    def sample(self, page, iteration):
+        """Record retained memory after visiting a page"""
+        self.collect_garbage()
+        metrics = get_performance_metrics(self.driver)
+        sample = {'page': page, 'iteration': iteration}
+        for key, name in LEAK_METRICS.items():
+            sample[key] = metrics.get(name)
+        self.samples.append(sample)
+        logger.debug(f"Memory sample {page} #{iteration}: {sample}")
+        return sample
+
+
+def analyze_leaks(samples, warmup=LEAK_WARMUP_ITERATIONS, thresholds=LEAK_THRESHOLDS):
+    """Fit growth per iteration for every route and metric
+
+    A route is flagged when a metric grows by more than its threshold
+    per navigation cycle after the warm-up iterations.
+    """
+    by_page = {}
+    for sample in samples:
+        by_page.setdefault(sample['page'], []).append(sample)
+
+    analysis = []
+    for page, page_samples in by_page.items():
+        measured = [s for s in page_samples if s['iteration'] >= warmup]
+        result = {
+            'page': page,
+            'iterations': len(measured),
+            'slopes': {},
+            'first': {},
+            'last': {},
+            'leaking': False,
+            'reasons': [],
+        }
+        for metric, threshold in thresholds.items():
+            points = [(s['iteration'], s[metric]) for s in measured if s.get(metric) is not None]
+            fit = linear_fit([p[0] for p in points], [p[1] for p in points])
+            slope = fit['slope'] if fit else None
+            result['slopes'][metric] = slope
+            result['first'][metric] = points[0][1] if points else None
+            result['last'][metric] = points[-1][1] if points else None
+            if slope is not None and slope > threshold:
+                result['leaking'] = True
+                result['reasons'].append(f"{metric} +{slope:.0f}/iteration (limit {threshold})")
+        analysis.append(result)
+    return analysis
@@ -0,0 +1,125 @@
+"""
+Network Log Utility
+Buffered access to Chromium's performance log Network events
+"""
+
+import json
+import logging
+import weakref
+from utils.cdp import is_chromium
+
+logger = logging.getLogger(__name__)
+
+# Capabilities that make chromedriver/msedgedriver record Network events
+PERFORMANCE_LOGGING_PREFS = {'performance': 'ALL'}
+PERF_LOGGING_OPTIONS = {'enableNetwork': True, 'enablePage': False}
+
+_logs = weakref.WeakKeyDictionary()
+
+
+def enable_performance_logging(options, browser):
+    """Turn on Network event logging in Chromium driver options"""
+    if browser.lower() == 'edge':
+        options.set_capability('ms:loggingPrefs', PERFORMANCE_LOGGING_PREFS)
+    options.set_capability('goog:loggingPrefs', PERFORMANCE_LOGGING_PREFS)
+    options.add_experimental_option('perfLoggingPrefs', PERF_LOGGING_OPTIONS)
+
+
+def get_network_log(driver):
+    """Return the shared NetworkLog of a driver"""
+    if driver not in _logs:
+        _logs[driver] = NetworkLog(driver)
+    return _logs[driver]
+
+
+def forget_network_log(driver):
+    """Drop the NetworkLog of a driver whose session is reused for another test"""
+    _logs.pop(driver, None)
+
+
+class NetworkLog:
+    """Collect Network.* events so several consumers can read them
+
+    Reading the performance log drains it, so every consumer goes
+    through this buffer instead of calling driver.get_log directly.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.events = []
+        self.available = is_chromium(driver)
+
+    def refresh(self):
+        """Move new entries from the browser log into the buffer"""
+        if not self.available:
+            return self.events
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {e}")
+            self.available = False
+            return self.events
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message.get('method', '').startswith('Network.'):
+                self.events.append(message)
+        return self.events
+
+    def mark(self):
+        """Position in the buffer, for reading only later events"""
+        self.refresh()
+        return len(self.events)
+
+    def requests(self, since=0, frame_id=None):
+        """Summarise events into one record per request id
+
+        frame_id keeps only the requests of one tab's main frame, since
+        the log interleaves the events of every open tab.
+        """
+        self.refresh()
+        requests = {}
+        for event in self.events[since:]:
+            params = event.get('params', {})
+            request_id = params.get('requestId')
+            if not request_id:
+                continue
+            record = requests.setdefault(request_id, {
+                'url': None,
+                'frame_id': None,
+                'type': None,
+                'status': None,
+                'mime_type': None,
+                'response_headers': {},
+                'from_cache': False,
+                'encoded_bytes': 0,
+                'decoded_bytes': 0,
+                'blocked_reason': None,
+                'failed': False,
+            })
+            method = event['method']
+            if method == 'Network.requestWillBeSent':
+                record['url'] = params['request']['url']
+                record['frame_id'] = params.get('frameId')
+                record['type'] = params.get('type')
+            elif method == 'Network.responseReceived':
+                response = params['response']
+                record['url'] = record['url'] or response.get('url')
+                record['frame_id'] = record['frame_id'] or params.get('frameId')
+                record['type'] = params.get('type') or record['type']
+                record['status'] = response.get('status')
+                record['mime_type'] = response.get('mimeType')
+                record['response_headers'] = {k.lower(): v for k, v in response.get('headers', {}).items()}
+                record['from_cache'] = bool(response.get('fromDiskCache') or response.get('fromServiceWorker'))
+            elif method == 'Network.requestServedFromCache':
+                record['from_cache'] = True
+            elif method == 'Network.dataReceived':
+                record['decoded_bytes'] += params.get('dataLength', 0)
+            elif method == 'Network.loadingFinished':
+                record['encoded_bytes'] = params.get('encodedDataLength', 0)
+            elif method == 'Network.loadingFailed':
+                record['failed'] = True
+                record['type'] = params.get('type') or record['type']
+                record['blocked_reason'] = params.get('blockedReason')
+        if frame_id:
+            return {request_id: record for request_id, record in requests.items() if record['frame_id'] == frame_id}
+        return requests
@@ -0,0 +1,206 @@
+"""
+Page Metrics Utility
+Measures rendering cost of list pages: first row, full render, heap, DOM size and scroll jank
+"""
+
+import json
+import logging
+import time
+from config.config import (
+    LIST_ROW_SELECTOR, BENCHMARK_RENDER_TIMEOUT, BENCHMARK_SETTLE_MS, SCALING_ALERT_EXPONENT
+)
+from utils.cdp import add_init_script, get_performance_metrics, is_chromium
+from utils.stats import power_law_fit, classify_growth
+
+logger = logging.getLogger(__name__)
+
+# Tracks when list rows first appear and when their count last changed.
+# Checks are throttled to one per animation frame so large lists are not
+# re-queried on every mutation.
+ROW_TIMING_SCRIPT = """
+(function() {
+    if (window.__listTimings) { return; }
+    var selector = %s;
+    var timings = window.__listTimings = {firstRow: null, lastChange: null, rowCount: 0};
+    var scheduled = false;
+    function check() {
+        scheduled = false;
+        var count = document.querySelectorAll(selector).length;
+        if (count !== timings.rowCount) {
+            var now = performance.now();
+            if (count > 0 && timings.firstRow === null) { timings.firstRow = now; }
+            timings.rowCount = count;
+            timings.lastChange = now;
+        }
+    }
+    function schedule() {
+        if (!scheduled) { scheduled = true; requestAnimationFrame(check); }
+    }
+    function start() {
+        new MutationObserver(schedule).observe(document.documentElement, {childList: true, subtree: true});
+        schedule();
+    }
+    if (document.documentElement) { start(); }
+    else { document.addEventListener('readystatechange', start, {once: true}); }
+})();
+"""
+
+# Scrolls the main scroll container one step per frame and records frame times
+SCROLL_JANK_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var maxDuration = arguments[0];
+function pickScroller() {
+    var root = document.scrollingElement || document.documentElement;
+    if (root.scrollHeight > root.clientHeight + 50) { return root; }
+    var candidates = document.querySelectorAll(
+        '.MuiDataGrid-virtualScroller, .MuiTableContainer-root, [role="grid"], main');
+    var best = null;
+    candidates.forEach(function(el) {
+        if (el.scrollHeight > el.clientHeight + 50 &&
+            (!best || el.scrollHeight > best.scrollHeight)) { best = el; }
+    });
+    return best;
+}
+var el = pickScroller();
+if (!el) { done({frames: 0, janky_frames: 0, max_frame_ms: 0, jank_ratio: 0, scrollable: false}); return; }
+var frames = [];
+var start = performance.now();
+var last = start;
+var step = Math.max(el.clientHeight / 2, 200);
+el.scrollTop = 0;
+function tick(now) {
+    frames.push(now - last);
+    last = now;
+    el.scrollTop += step;
+    var atEnd = el.scrollTop + el.clientHeight >= el.scrollHeight - 1;
+    if (atEnd || now - start > maxDuration) {
+        var janky = frames.filter(function(f) { return f > 50; }).length;
+        done({
+            frames: frames.length,
+            janky_frames: janky,
+            max_frame_ms: Math.max.apply(null, frames),
+            jank_ratio: frames.length ? janky / frames.length : 0,
+            scrollable: true
+        });
+    } else {
+        requestAnimationFrame(tick);
+    }
+}
+requestAnimationFrame(tick);
+"""
+
+
+class ListPageMetrics:
+    """Collect rendering metrics for a page that displays a list of records"""
+
+    SCROLL_MAX_DURATION_MS = 10000
+
+    def __init__(self, driver, row_selector=LIST_ROW_SELECTOR):
+        self.driver = driver
+        self.row_selector = row_selector
+        self.script = ROW_TIMING_SCRIPT % json.dumps(row_selector)
+        # Registered before navigation so the observer sees the first row
+        self.tracks_from_start = add_init_script(driver, self.script)
+
+    def wait_for_render(self, timeout=BENCHMARK_RENDER_TIMEOUT, settle_ms=BENCHMARK_SETTLE_MS):
+        """Wait until the row count has stopped changing for settle_ms"""
+        if not self.tracks_from_start:
+            self.driver.execute_script(self.script)
+
+        deadline = time.time() + timeout
+        timings = {}
+        while time.time() < deadline:
+            timings = self.driver.execute_script(
+                "var t = window.__listTimings || {};"
+                "return {firstRow: t.firstRow, lastChange: t.lastChange,"
+                " rowCount: t.rowCount || 0, now: performance.now()};"
+            )
+            if timings['rowCount'] and timings['now'] - timings['lastChange'] >= settle_ms:
+                break
+            time.sleep(0.25)
+        else:
+            logger.warning(f"List did not settle within {timeout}s ({timings.get('rowCount', 0)} rows)")
+        return timings
+
+    def get_heap_size(self):
+        """JS heap in use, in bytes"""
+        if is_chromium(self.driver):
+            return get_performance_metrics(self.driver).get('JSHeapUsedSize')
+        return self.driver.execute_script(
+            "return window.performance.memory ? performance.memory.usedJSHeapSize : null;"
+        )
+
+    def get_dom_node_count(self):
+        """Number of elements in the document"""
+        return self.driver.execute_script("return document.getElementsByTagName('*').length;")
+
+    def measure_scroll_jank(self):
+        """Scroll the list to the bottom and summarise frame times"""
+        return self.driver.execute_async_script(SCROLL_JANK_SCRIPT, self.SCROLL_MAX_DURATION_MS)
+
+    def collect(self):
+        """Wait for the list to render and collect all metrics"""
+        timings = self.wait_for_render()
+        metrics = {
+            'time_to_first_row_ms': timings.get('firstRow'),
+            'time_to_rendered_ms': timings.get('lastChange'),
+            'rendered_rows': timings.get('rowCount', 0),
+            'js_heap_bytes': self.get_heap_size(),
+            'dom_nodes': self.get_dom_node_count(),
+            'timed_from_navigation_start': self.tracks_from_start,
+        }
+        scroll = self.measure_scroll_jank()
+        metrics.update({
+            'scroll_frames': scroll['frames'],
+            'janky_frames': scroll['janky_frames'],
+            'max_frame_ms': scroll['max_frame_ms'],
+            'jank_ratio': scroll['jank_ratio'],
+        })
+        return metrics
+
+
+# Metrics fitted against dataset size
+SCALING_METRICS = ['time_to_first_row_ms', 'time_to_rendered_ms', 'js_heap_bytes', 'dom_nodes', 'max_frame_ms']
+
+
+def analyze_scaling(results):
+    """Fit a power-law scaling curve per page and metric
+
+    results is a list of {'page', 'size', 'metrics'} dicts. Pages whose
+    render time or DOM size grows roughly linearly (or worse) with the
+    number of records are flagged for pagination or virtualization.
+    """
+    by_page = {}
+    for result in results:
+        by_page.setdefault(result['page'], []).append(result)
+
+    analysis = []
+    for page, samples in sorted(by_page.items()):
+        samples.sort(key=lambda r: r['size'])
+        sizes = [r['size'] for r in samples]
+        curves = {}
+        for metric in SCALING_METRICS:
+            values = [r['metrics'].get(metric) for r in samples]
+            fit = power_law_fit(sizes, values)
+            curves[metric] = {
+                'values': values,
+                'exponent': fit['exponent'] if fit else None,
+                'r2': fit['r2'] if fit else None,
+                'growth': classify_growth(fit['exponent'] if fit else None),
+            }
+
+        recommendations = []
+        dom_exponent = curves['dom_nodes']['exponent']
+        render_exponent = curves['time_to_rendered_ms']['exponent']
+        if dom_exponent is not None and dom_exponent >= SCALING_ALERT_EXPONENT:
+            recommendations.append('virtualize: DOM size grows with row count')
+        if render_exponent is not None and render_exponent >= SCALING_ALERT_EXPONENT:
+            recommendations.append('paginate: render time grows with row count')
+
+        analysis.append({
+            'page': page,
+            'sizes': sizes,
+            'curves': curves,
+            'recommendations': recommendations,
+        })
+    return analysis
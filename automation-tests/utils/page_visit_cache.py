@@ -0,0 +1,211 @@
+"""
+Page Visit Cache
+Visits each page once per worker session and caches a snapshot for assertions
+"""
+
+import logging
+import time
+from datetime import datetime
+from config.config import PAGE_SETTLE_TIMEOUT, PAGE_IDLE_MS, TAB_CONCURRENCY
+from pages.base_page import BasePage
+from utils.api_monitor import APIMonitor
+from utils.network_log import get_network_log
+from utils.payload_accounting import collect_page_payload
+from utils.tab_executor import TabExecutor
+
+logger = logging.getLogger(__name__)
+
+# Navigation/paint timings, JS heap and a DOM summary in one round trip
+SNAPSHOT_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var fcp = performance.getEntriesByName('first-contentful-paint')[0];
+var body = document.body;
+return {
+    metrics: {
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd || null,
+        load_ms: nav.loadEventEnd || null,
+        first_contentful_paint_ms: fcp ? fcp.startTime : null,
+        js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+        resource_count: performance.getEntriesByType('resource').length
+    },
+    dom: {
+        node_count: document.getElementsByTagName('*').length,
+        text_length: body ? body.innerText.trim().length : 0,
+        headings: Array.from(document.querySelectorAll('h1, h2, h3')).slice(0, 10)
+            .map(function(h) { return h.innerText.trim(); }),
+        forms: document.forms.length,
+        buttons: document.querySelectorAll('button').length,
+        error_elements: document.querySelectorAll('.MuiAlert-standardError, .MuiAlert-filledError').length
+    },
+    api_calls: window.apiCalls || [],
+    api_errors: window.apiErrors || []
+};
+"""
+
+# Timings that other tabs loading at the same time would distort
+CONTENDED_METRICS = ('dom_content_loaded_ms', 'load_ms', 'first_contentful_paint_ms', 'visit_duration_s')
+
+
+class PageVisitCache:
+    """Visit each page once per emulation profile and reuse its snapshot across assertion tests
+
+    With tabs > 1 a cache miss loads the requested page together with the
+    next planned pages as concurrent tabs of the same browser (see
+    TabExecutor); setup_tab(driver, profile) prepares each new tab.
+    Snapshots of pages that shared the browser with other loading tabs
+    keep no load timings, as those measured the contention.
+    release_driver(driver) ends a browser, e.g. handing a grid session
+    back to its pool; by default it quits.
+    """
+
+    def __init__(self, driver_factory, auth_manager, user_key='valid_user', setup_tab=None, tabs=TAB_CONCURRENCY,
+                 release_driver=None):
+        self.driver_factory = driver_factory
+        self.release_driver = release_driver or (lambda driver: driver.quit())
+        self.auth_manager = auth_manager
+        self.user_key = user_key
+        self.setup_tab = setup_tab
+        self.tabs = tabs
+        self.planned = []  # pages the session's tests will ask for, in order
+        self.drivers = {}  # (profile, requires_auth) -> driver
+        self.snapshots = {}  # (profile, page path) -> snapshot
+
+    def _get_driver(self, requires_auth, profile):
+        """Return the anonymous or logged-in browser, creating it on first use"""
+        key = (profile, requires_auth)
+        if key not in self.drivers:
+            driver = self.driver_factory(profile)
+            try:
+                APIMonitor(driver).inject_monitoring_script()
+                if requires_auth:
+                    self.auth_manager.authenticate(driver, self.user_key, 'session')
+            except Exception:
+                self.release_driver(driver)
+                raise
+            self.drivers[key] = driver
+        return self.drivers[key]
+
+    def plan(self, pages):
+        """Pages to batch into tabs on cache misses"""
+        self.planned = list(pages)
+
+    def get(self, page, profile='none'):
+        """Return the snapshot for a page, visiting it on first request"""
+        key = (profile, page['path'])
+        if key not in self.snapshots:
+            if self.tabs > 1:
+                self.prefetch(self._batch(page, profile), profile)
+            else:
+                self.snapshots[key] = self.visit(page, profile)
+        else:
+            logger.debug(f"Reusing snapshot of {page['name']} ({profile})")
+        return self.snapshots[key]
+
+    def forget(self, page, profile='none'):
+        """Drop a page's snapshot so the next request visits it again"""
+        self.snapshots.pop((profile, page['path']), None)
+
+    def _batch(self, page, profile):
+        """The page plus the next unvisited planned pages of the same browser"""
+        batch = [page]
+        for planned in self.planned:
+            if len(batch) >= self.tabs:
+                break
+            if (planned['requires_auth'] == page['requires_auth']
+                    and (profile, planned['path']) not in self.snapshots
+                    and all(p['path'] != planned['path'] for p in batch)):
+                batch.append(planned)
+        return batch
+
+    def prefetch(self, pages, profile='none'):
+        """Visit pages as concurrent tabs, one browser per login state"""
+        for requires_auth in (False, True):
+            group = [p for p in pages if p['requires_auth'] == requires_auth
+                     and (profile, p['path']) not in self.snapshots]
+            if not group:
+                continue
+            try:
+                driver = self._get_driver(requires_auth, profile)
+            except Exception as e:
+                for page in group:
+                    snapshot = self._new_snapshot(page, profile)
+                    snapshot['error'] = f"{type(e).__name__}: {e}"
+                    self.snapshots[(profile, page['path'])] = snapshot
+                continue
+
+            def setup_tab(tab_driver):
+                APIMonitor(tab_driver).inject_monitoring_script()
+                if self.setup_tab:
+                    self.setup_tab(tab_driver, profile)
+
+            def capture(page, tab):
+                snapshot = self._new_snapshot(page, profile)
+                self._capture(driver, snapshot, tab['started'], tab['network_mark'], tab['frame_id'])
+                snapshot['metrics']['concurrent_tabs'] = tab['concurrent']
+                if tab['concurrent'] > 1:
+                    snapshot['metrics'].update(dict.fromkeys(CONTENDED_METRICS))
+                return snapshot
+
+            results = TabExecutor(driver, setup_tab, max_tabs=self.tabs).run(group, capture)
+            for page in group:
+                snapshot = results.get(page['path'])
+                if not isinstance(snapshot, dict):
+                    error = snapshot
+                    snapshot = self._new_snapshot(page, profile)
+                    snapshot['error'] = f"{type(error).__name__}: {error}"
+                    logger.error(f"Failed to visit {page['name']}: {error}")
+                self.snapshots[(profile, page['path'])] = snapshot
+            logger.info(f"Visited {len(group)} pages as tabs under '{profile}'")
+
+    def _new_snapshot(self, page, profile):
+        return {
+            'name': page['name'],
+            'path': page['path'],
+            'requires_auth': page['requires_auth'],
+            'profile': profile,
+            'visited_at': datetime.now().isoformat(),
+            'url': None,
+            'title': None,
+            'api_calls': [],
+            'api_errors': [],
+            'metrics': {},
+            'dom': {},
+            'payload': None,
+            'error': None,
+        }
+
+    def _capture(self, driver, snapshot, started, network_mark, frame_id=None):
+        """Fill a snapshot from the loaded page in the current tab"""
+        base_page = BasePage(driver)
+        snapshot.update(base_page.execute_script(SNAPSHOT_SCRIPT))
+        snapshot['metrics']['visit_duration_s'] = time.perf_counter() - started
+        snapshot['url'] = base_page.get_current_url()
+        snapshot['title'] = base_page.get_page_title()
+        snapshot['payload'] = collect_page_payload(driver, snapshot['name'], since=network_mark,
+                                                   frame_id=frame_id)
+
+    def visit(self, page, profile='none'):
+        """Navigate to a page and capture its snapshot"""
+        snapshot = self._new_snapshot(page, profile)
+        try:
+            driver = self._get_driver(page['requires_auth'], profile)
+            base_page = BasePage(driver)
+            network_mark = get_network_log(driver).mark()
+            started = time.perf_counter()
+            base_page.open(page['path'])
+            base_page.wait_for_network_idle(idle_ms=PAGE_IDLE_MS, timeout=PAGE_SETTLE_TIMEOUT)
+            self._capture(driver, snapshot, started, network_mark)
+            logger.info(f"Visited {page['name']} under '{profile}' ({len(snapshot['api_calls'])} API calls)")
+        except Exception as e:
+            snapshot['error'] = f"{type(e).__name__}: {e}"
+            logger.error(f"Failed to visit {page['name']}: {e}")
+        return snapshot
+
+    def close(self):
+        """Quit (or hand back to the grid pool) all browsers opened by the cache"""
+        for driver in self.drivers.values():
+            try:
+                self.release_driver(driver)
+            except Exception as e:
+                logger.warning(f"Failed to close page visit driver: {e}")
+        self.drivers = {}
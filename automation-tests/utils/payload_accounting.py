@@ -0,0 +1,158 @@
+"""
+Payload Accounting Utility
+Measures transfer, encoded and decoded sizes, compression and cache status of page requests
+"""
+
+import logging
+from config.config import (
+    RESOURCE_TIMING_BUFFER_SIZE, PAYLOAD_LARGE_RESPONSE_BYTES, PAYLOAD_PAGE_BUDGET_BYTES,
+    PAYLOAD_COMPRESSION_MIN_BYTES, PAYLOAD_REPORT_LIMIT
+)
+from utils.latency_histogram import endpoint_template
+from utils.network_log import get_network_log
+
+logger = logging.getLogger(__name__)
+
+# Raises the Resource Timing buffer (default 250 entries) before the page loads
+RESOURCE_TIMING_BUFFER_SCRIPT = (
+    "if (window.performance && performance.setResourceTimingBufferSize) {"
+    " performance.setResourceTimingBufferSize(%d); }" % RESOURCE_TIMING_BUFFER_SIZE
+)
+
+# Navigation and resource entries of the current document
+RESOURCE_ENTRIES_SCRIPT = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .map(function(e) {
+        return {
+            url: e.name,
+            initiator_type: e.initiatorType,
+            transfer_size: e.transferSize || 0,
+            encoded_size: e.encodedBodySize || 0,
+            decoded_size: e.decodedBodySize || 0,
+            duration: e.duration
+        };
+    });
+"""
+
+# Content that should be served compressed
+COMPRESSIBLE_TYPES = ('javascript', 'json', 'css', 'html', 'xml', 'svg', 'text/')
+API_INITIATORS = ('fetch', 'xmlhttprequest')
+
+
+def cache_status(entry, record):
+    """'network', 'cache', 'revalidated' or 'opaque' (cross-origin without Timing-Allow-Origin)
+
+    The network log record decides when there is one: cross-origin
+    Resource Timing entries (e.g. the API) report zero sizes.
+    """
+    if record and record['from_cache']:
+        return 'cache'
+    if record and record['status'] == 304:
+        return 'revalidated'
+    if record and record['status']:
+        return 'network'
+    if entry['transfer_size'] == 0:
+        return 'cache' if entry['decoded_size'] else 'opaque'
+    if entry['transfer_size'] < entry['encoded_size']:
+        return 'revalidated'
+    return 'network'
+
+
+def classify_resource(entry, record):
+    """Merge a Resource Timing entry with the network log record of the same URL
+
+    Sizes hidden from Resource Timing fall back to the record: bytes on
+    the wire (loadingFinished) and decoded body bytes (dataReceived).
+    """
+    headers = record['response_headers'] if record else {}
+    mime_type = (record and record['mime_type']) or headers.get('content-type', '')
+    encoding = headers.get('content-encoding')
+    if not encoding and entry['decoded_size'] > entry['encoded_size'] > 0:
+        encoding = 'compressed'
+    transfer = entry['transfer_size'] or (record['encoded_bytes'] if record else 0)
+    decoded = entry['decoded_size'] or (record['decoded_bytes'] if record else 0)
+    return {
+        'url': entry['url'],
+        'initiator_type': entry['initiator_type'],
+        'mime_type': mime_type,
+        'transfer_bytes': transfer,
+        'encoded_bytes': entry['encoded_size'],
+        'decoded_bytes': decoded,
+        'content_encoding': encoding,
+        'cache_status': cache_status(entry, record),
+        'cache_control': headers.get('cache-control'),
+    }
+
+
+def payload_flags(resource):
+    """Problems worth reporting for one resource"""
+    flags = []
+    size = max(resource['decoded_bytes'], resource['transfer_bytes'])
+    if size >= PAYLOAD_LARGE_RESPONSE_BYTES:
+        flags.append(f"large response ({size / 1048576:.1f} MB)")
+    compressible = any(t in (resource['mime_type'] or '') for t in COMPRESSIBLE_TYPES) or \
+        resource['initiator_type'] in API_INITIATORS + ('script', 'navigation')
+    if (compressible and not resource['content_encoding'] and resource['cache_status'] == 'network'
+            and resource['decoded_bytes'] >= PAYLOAD_COMPRESSION_MIN_BYTES):
+        flags.append('uncompressed')
+    return flags
+
+
+def collect_page_payload(driver, page, since=0, include_resources=False, frame_id=None):
+    """Account for every request of the current page load
+
+    since is a NetworkLog mark taken before navigating, so headers and
+    cache status come from this load only; frame_id narrows them to one
+    tab when several load at once. The per-request list is only kept
+    with include_resources, to keep reports small.
+    """
+    entries = driver.execute_script(RESOURCE_ENTRIES_SCRIPT) or []
+    records = {}
+    for record in get_network_log(driver).requests(since, frame_id).values():
+        if record['url']:
+            records[record['url']] = record
+
+    resources = []
+    for entry in entries:
+        resource = classify_resource(entry, records.get(entry['url']))
+        resource['flags'] = payload_flags(resource)
+        resources.append(resource)
+
+    endpoints = {}
+    for resource in resources:
+        if resource['initiator_type'] not in API_INITIATORS:
+            continue
+        endpoint = endpoints.setdefault(endpoint_template(resource['url']), {
+            'requests': 0, 'transfer_bytes': 0, 'decoded_bytes': 0, 'max_decoded_bytes': 0
+        })
+        endpoint['requests'] += 1
+        endpoint['transfer_bytes'] += resource['transfer_bytes']
+        endpoint['decoded_bytes'] += resource['decoded_bytes']
+        endpoint['max_decoded_bytes'] = max(endpoint['max_decoded_bytes'], resource['decoded_bytes'])
+
+    by_type = {}
+    for resource in resources:
+        totals = by_type.setdefault(resource['initiator_type'] or 'other', {'requests': 0, 'transfer_bytes': 0})
+        totals['requests'] += 1
+        totals['transfer_bytes'] += resource['transfer_bytes']
+
+    transfer_bytes = sum(r['transfer_bytes'] for r in resources)
+    flags = []
+    if transfer_bytes >= PAYLOAD_PAGE_BUDGET_BYTES:
+        flags.append(f"page downloads {transfer_bytes / 1048576:.1f} MB")
+    payload = {
+        'page': page,
+        'requests': len(resources),
+        'transfer_bytes': transfer_bytes,
+        'encoded_bytes': sum(r['encoded_bytes'] for r in resources),
+        'decoded_bytes': sum(r['decoded_bytes'] for r in resources),
+        'cached_requests': len([r for r in resources if r['cache_status'] in ('cache', 'revalidated')]),
+        'by_type': by_type,
+        'endpoints': endpoints,
+        'largest': sorted(resources, key=lambda r: r['decoded_bytes'], reverse=True)[:PAYLOAD_REPORT_LIMIT],
+        'flagged': [r for r in resources if r['flags']],
+        'flags': flags,
+    }
+    if include_resources:
+        payload['resources'] = resources
+    return payload
@@ -0,0 +1,163 @@
+"""
+Remote Grid Utility
+Pools Remote WebDriver sessions on Selenium Grid / standalone servers with capacity checks
+"""
+
+import logging
+import time
+import requests
+from selenium import webdriver
+from config.config import (
+    BASE_URL, GRID_ACQUIRE_TIMEOUT, GRID_POLL_INTERVAL, GRID_STATUS_TIMEOUT,
+    GRID_SESSION_REUSE, GRID_MAX_IDLE_SESSIONS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_grid_urls(value):
+    """Comma-separated list of grid URLs"""
+    return [url.strip().rstrip('/') for url in (value or '').split(',') if url.strip()]
+
+
+def grid_status(url, browser):
+    """Slots of a grid (or standalone server) for one browser, from its /status endpoint
+
+    Returns {'url', 'ready', 'total', 'free', 'nodes': [{'id', 'uri', 'total', 'free'}]};
+    an unreachable grid reports no slots.
+    """
+    status = {'url': url, 'ready': False, 'total': 0, 'free': 0, 'nodes': []}
+    try:
+        response = requests.get(f"{url}/status", timeout=GRID_STATUS_TIMEOUT)
+        response.raise_for_status()
+        value = response.json().get('value', {})
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Grid {url} unavailable: {e}")
+        return status
+
+    status['ready'] = bool(value.get('ready'))
+    for node in value.get('nodes', []):
+        if node.get('availability', 'UP') != 'UP':
+            continue
+        slots = [s for s in node.get('slots', [])
+                 if s.get('stereotype', {}).get('browserName', '').lower() in (browser.lower(), '')]
+        free = len([s for s in slots if not s.get('session')])
+        status['nodes'].append({'id': node.get('id'), 'uri': node.get('uri'), 'total': len(slots), 'free': free})
+        status['total'] += len(slots)
+        status['free'] += free
+    return status
+
+
+class RemoteSessionPool:
+    """Hand out Remote WebDriver sessions without overloading the grids
+
+    A session is only requested from the grid whose nodes report the most
+    free slots for the browser, so tests wait here instead of timing out
+    in the grid's queue. Released
+    sessions are reset and kept for the next test with the same options,
+    saving the session start-up; idle sessions are given back when a slot
+    is needed for different options.
+    """
+
+    def __init__(self, urls, browser, reuse=GRID_SESSION_REUSE, max_idle=GRID_MAX_IDLE_SESSIONS):
+        self.urls = urls
+        self.browser = browser
+        self.reuse = reuse
+        self.max_idle = max_idle
+        self.idle = []  # (key, driver)
+        self.grid_of = {}  # session id -> grid url
+        self.key_of = {}  # session id -> options key
+        self.created = 0
+        self.reused = 0
+
+    def capacity(self):
+        """Current slot counts of every grid"""
+        return [grid_status(url, self.browser) for url in self.urls]
+
+    def total_slots(self):
+        return sum(status['total'] for status in self.capacity())
+
+    def owns(self, driver):
+        return getattr(driver, 'session_id', None) in self.grid_of
+
+    def acquire(self, key, options, timeout=GRID_ACQUIRE_TIMEOUT):
+        """A session for these options: a pooled one, or a new one on the grid with most free slots"""
+        for i, (idle_key, driver) in enumerate(self.idle):
+            if idle_key == key:
+                del self.idle[i]
+                if self._alive(driver):
+                    self.reused += 1
+                    logger.info(f"Reusing grid session {driver.session_id}")
+                    return driver
+                self._discard(driver)
+                break
+
+        deadline = time.time() + timeout
+        while True:
+            statuses = [s for s in self.capacity() if s['free'] > 0]
+            if statuses:
+                best = max(statuses, key=lambda s: s['free'])
+                try:
+                    driver = webdriver.Remote(command_executor=best['url'], options=options)
+                except Exception as e:
+                    # Another worker took the slot between /status and the request
+                    logger.warning(f"Could not start a session on {best['url']}: {e}")
+                else:
+                    self.grid_of[driver.session_id] = best['url']
+                    self.key_of[driver.session_id] = key
+                    self.created += 1
+                    logger.info(f"Started {self.browser} session on {best['url']} "
+                                f"({best['free'] - 1}/{best['total']} slots free)")
+                    return driver
+            elif self.idle:
+                # Our own idle sessions may be what is holding the slots
+                self._discard(self.idle.pop(0)[1])
+                continue
+            if time.time() >= deadline:
+                raise TimeoutError(f"No free {self.browser} slot on {', '.join(self.urls)} within {timeout}s")
+            time.sleep(GRID_POLL_INTERVAL)
+
+    def release(self, driver):
+        """Keep a finished test's session for reuse, or end it"""
+        if not self.reuse or len(self.idle) >= self.max_idle or not self._reset(driver):
+            self._discard(driver)
+            return
+        self.idle.append((self.key_of[driver.session_id], driver))
+
+    def _reset(self, driver):
+        """Clear what a test leaves behind: extra tabs, cookies and storage"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            if driver.current_url.startswith(BASE_URL):
+                driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            logger.debug(f"Could not reset grid session: {e}")
+            return False
+
+    def _alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        self.grid_of.pop(driver.session_id, None)
+        self.key_of.pop(driver.session_id, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Failed to end grid session: {e}")
+
+    def close(self):
+        """End all pooled sessions"""
+        while self.idle:
+            self._discard(self.idle.pop()[1])
+        logger.info(f"Grid sessions: {self.created} started, {self.reused} reused")
@@ -5,22 +5,83 @@ Generates comprehensive HTML and JSON reports
 
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
-from config.config import HTML_REPORT_PATH, JSON_REPORT_PATH
+from config.config import (
+    HTML_REPORT_PATH, JSON_REPORT_PATH, RUNS_DIR, RUN_HISTORY_LIMIT, INTERACTION_SLOW_MS, INTERACTION_REPORT_LIMIT, PAYLOAD_REPORT_LIMIT
+)
+from utils.page_metrics import analyze_scaling
+from utils.stats import mean
+from utils.latency_histogram import LatencyAggregator
 
 logger = logging.getLogger(__name__)
 
 
+# Shared by every HTML page the framework generates
+REPORT_CSS = """
+    * { margin: 0; padding: 0; box-sizing: border-box; }
+    body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f5f5f5; padding: 20px; }
+    .container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+    .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 8px 8px 0 0; }
+    .header h1 { margin-bottom: 10px; }
+    .summary { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; padding: 30px; }
+    .summary-card { background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; }
+    .summary-card h3 { font-size: 36px; margin-bottom: 5px; }
+    .summary-card p { color: #666; text-transform: uppercase; font-size: 12px; letter-spacing: 1px; }
+    .passed { color: #28a745; }
+    .failed { color: #dc3545; }
+    .skipped { color: #ffc107; }
+    .section { padding: 30px; border-top: 1px solid #eee; }
+    .section h2 { margin-bottom: 20px; color: #333; }
+    table { width: 100%; border-collapse: collapse; }
+    th, td { padding: 12px; text-align: left; border-bottom: 1px solid #eee; }
+    th { background: #f8f9fa; font-weight: 600; color: #666; }
+    .status { padding: 4px 12px; border-radius: 4px; font-size: 12px; font-weight: 600; }
+    .status.passed { background: #d4edda; color: #155724; }
+    .status.failed { background: #f8d7da; color: #721c24; }
+    .status.skipped { background: #fff3cd; color: #856404; }
+    .error-message { color: #dc3545; font-size: 12px; margin-top: 5px; }
+    .api-error { background: #f8d7da; padding: 15px; margin-bottom: 10px; border-left: 4px solid #dc3545; border-radius: 4px; }
+    .api-error strong { display: block; margin-bottom: 5px; }
+    .footer { padding: 20px; text-align: center; color: #666; border-top: 1px solid #eee; }
+"""
+
+
 class ReportGenerator:
     """Generate test execution reports"""
 
-    def __init__(self):
+    # Result lists exported by xdist workers and merged on the controller
+    MERGED_LISTS = [
+        'test_results', 'api_errors', 'screenshots', 'benchmark_results', 'page_snapshots',
+        'blocking_savings', 'memory_leaks', 'interactions', 'api_call_patterns', 'payloads',
+        'cache_comparisons', 'form_fills', 'element_cache'
+    ]
+
+    def __init__(self, worker='master'):
+        self.worker = worker
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.latency = LatencyAggregator(worker)
         self.test_results = []
         self.api_errors = []
         self.screenshots = []
+        self.benchmark_results = []
+        self.page_snapshots = []
+        self.blocking_savings = []
+        self.memory_leaks = []
+        self.interactions = []
+        self.api_call_patterns = []
+        self.payloads = []
+        self.cache_comparisons = []
+        self.form_fills = []
+        self.element_cache = []
+        self.resource_usage = None
+        self.flakiness = {}
+        self.stages = []
 
-    def add_test_result(self, test_name, status, duration, error_message=None, screenshot_path=None):
+    def add_test_result(self, test_name, status, duration, error_message=None, screenshot_path=None,
+                        profile='none', quarantined=False, attempts=1, retry_time_s=0.0, passed_on_retry=False,
+                        cached=False):
         """Add a test result"""
         result = {
             'test_name': test_name,
@@ -28,10 +89,24 @@ class ReportGenerator:
             'duration': duration,
             'error_message': error_message,
             'screenshot': screenshot_path,
+            'profile': profile,
+            'quarantined': quarantined,
+            'attempts': attempts,
+            'retry_time_s': retry_time_s,
+            'passed_on_retry': passed_on_retry,
+            'cached': cached,
             'timestamp': datetime.now().isoformat()
         }
         self.test_results.append(result)
 
+    def attach_trace(self, test_name, path):
+        """Link a performance trace to a test result"""
+        for result in reversed(self.test_results):
+            if result['test_name'] == test_name:
+                result['trace'] = str(path)
+                return
+        logger.debug(f"No result to attach trace to: {test_name}")
+
     def add_api_error(self, page, url, status, error):
         """Add an API error"""
         api_error = {
@@ -51,19 +126,267 @@ class ReportGenerator:
             'timestamp': datetime.now().isoformat()
         })
 
+    def add_benchmark_result(self, page, size, metrics):
+        """Add a data-volume benchmark measurement"""
+        self.benchmark_results.append({
+            'page': page,
+            'size': size,
+            'metrics': metrics,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def add_page_snapshot(self, snapshot):
+        """Add a cached page visit snapshot (API call details omitted)"""
+        self.page_snapshots.append({
+            'name': snapshot['name'],
+            'path': snapshot['path'],
+            'profile': snapshot.get('profile', 'none'),
+            'url': snapshot['url'],
+            'title': snapshot['title'],
+            'api_call_count': len(snapshot['api_calls']),
+            'api_error_count': len(snapshot['api_errors']),
+            'metrics': snapshot['metrics'],
+            'dom': snapshot['dom'],
+            'error': snapshot['error'],
+            'timestamp': snapshot['visited_at']
+        })
+
+    def add_blocking_savings(self, test_name, savings):
+        """Add requests/bytes saved by the request blocking profile"""
+        self.blocking_savings.append(dict(savings, test_name=test_name))
+
+    def summarize_blocking_savings(self):
+        """Total blocking savings per profile"""
+        summary = {}
+        for savings in self.blocking_savings:
+            profile = summary.setdefault(savings['profile'], {
+                'tests': 0, 'blocked_requests': 0, 'blocked_bytes': 0, 'unknown_size_requests': 0
+            })
+            profile['tests'] += 1
+            profile['blocked_requests'] += savings['blocked_requests']
+            profile['blocked_bytes'] += savings['blocked_bytes']
+            profile['unknown_size_requests'] += savings['unknown_size_requests']
+        return summary
+
+    def add_api_calls(self, calls, profile='none'):
+        """Feed API call durations into the latency histograms of each endpoint under a profile"""
+        self.latency.record_all(calls, profile)
+
+    def add_api_call_analysis(self, analysis):
+        """Add duplicate/waterfall/N+1 findings for one page load"""
+        if analysis['duplicates'] or analysis['n_plus_one'] or analysis['waterfalls']:
+            self.api_call_patterns.append(analysis)
+
+    def add_payload(self, payload, profile='none'):
+        """Add the payload accounting of one page load under an emulation profile"""
+        self.payloads.append({**payload, 'profile': profile})
+
+    def summarize_payloads(self):
+        """Bytes per page, bytes per endpoint and profile, and the largest responses of the run"""
+        endpoints = {}
+        largest = []
+        for payload in self.payloads:
+            profile = payload.get('profile', 'none')
+            for template, data in payload['endpoints'].items():
+                totals = endpoints.setdefault((template, profile), {
+                    'endpoint': template, 'profile': profile,
+                    'requests': 0, 'transfer_bytes': 0, 'decoded_bytes': 0, 'max_decoded_bytes': 0
+                })
+                totals['requests'] += data['requests']
+                totals['transfer_bytes'] += data['transfer_bytes']
+                totals['decoded_bytes'] += data['decoded_bytes']
+                totals['max_decoded_bytes'] = max(totals['max_decoded_bytes'], data['max_decoded_bytes'])
+            largest.extend({**r, 'page': payload['page'], 'profile': profile} for r in payload['largest'])
+        return {
+            'pages': sorted(self.payloads, key=lambda p: p['transfer_bytes'], reverse=True),
+            'endpoints': sorted(endpoints.values(), key=lambda e: e['decoded_bytes'], reverse=True),
+            'largest': sorted(largest, key=lambda r: r['decoded_bytes'], reverse=True)[:PAYLOAD_REPORT_LIMIT],
+        }
+
+    def add_cache_comparison(self, comparison):
+        """Add a cold vs warm load comparison of one page"""
+        self.cache_comparisons.append(comparison)
+
+    def export(self):
+        """Serializable results, sent from an xdist worker to the controller"""
+        data = {name: getattr(self, name) for name in self.MERGED_LISTS}
+        data['latency'] = self.latency.to_dict()
+        return data
+
+    def merge(self, data):
+        """Add results exported by another worker"""
+        for name in self.MERGED_LISTS:
+            getattr(self, name).extend(data.get(name, []))
+        if data.get('latency'):
+            self.latency.merge(LatencyAggregator.from_dict(data['latency']))
+
+    def load_stage_results(self, path):
+        """Continue the report of earlier pipeline stages saved at path (same run ID)"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.merge(data)
+        self.run_id = data['run_id']
+        self.stages = data.get('stages', [])
+
+    def save_stage_results(self, path):
+        """Save this report's results for the next pipeline stage"""
+        data = self.export()
+        data.update(run_id=self.run_id, stages=self.stages)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(data, f)
+        except OSError as e:
+            logger.warning(f"Could not save results for the next stage: {e}")
+
+    def add_stage(self, name, duration, tests, exit_status):
+        """Add the timing and outcome of a pipeline stage"""
+        self.stages.append({'name': name, 'duration': duration, 'tests': tests, 'exit_status': exit_status})
+
+    def add_flakiness(self, stats):
+        """Add flip statistics of the tests that are flaky or quarantined"""
+        self.flakiness = {test: s for test, s in stats.items() if s['status'] != 'stable'}
+
+    def summarize_flakiness(self):
+        """Retries of this run, what they cost, and the quarantine lane"""
+        retried = [r for r in self.test_results if r.get('attempts', 1) > 1]
+        quarantined = [r for r in self.test_results if r.get('quarantined')]
+        return {
+            'retried_tests': len(retried),
+            'passed_on_retry': len([r for r in retried if r['passed_on_retry']]),
+            'retry_time_s': sum(r['retry_time_s'] for r in retried),
+            'retries': sorted(
+                ({'test_name': r['test_name'], 'attempts': r['attempts'], 'status': r['status'],
+                  'retry_time_s': r['retry_time_s'], 'passed_on_retry': r['passed_on_retry']} for r in retried),
+                key=lambda r: r['retry_time_s'], reverse=True
+            ),
+            'quarantined': [
+                {'test_name': r['test_name'], 'status': r['status'],
+                 'flip_rate': self.flakiness.get(r['test_name'], {}).get('flip_rate')}
+                for r in quarantined
+            ],
+            'history': self.flakiness,
+        }
+
+    def add_resource_usage(self, usage):
+        """Add the run's CPU/memory usage and recommended parallelism"""
+        self.resource_usage = usage
+
+    def add_memory_leak_results(self, analysis):
+        """Add per-route memory growth from a leak soak test"""
+        self.memory_leaks.extend(analysis)
+
+    def add_interactions(self, test_name, interactions, profile='none'):
+        """Add interaction latencies recorded during a test under an emulation profile"""
+        for interaction in interactions:
+            self.interactions.append({**interaction, 'test_name': test_name, 'profile': profile})
+
+    def add_form_fills(self, test_name, fills):
+        """Add bulk form fills (BasePage.fill_form) of a test"""
+        for fill in fills:
+            self.form_fills.append({**fill, 'test_name': test_name})
+
+    def summarize_form_fills(self):
+        """Fields filled in bulk vs typed and the typing time saved"""
+        return {
+            'fills': len(self.form_fills),
+            'fields': sum(f['fields'] for f in self.form_fills),
+            'bulk_fields': sum(f['bulk_fields'] for f in self.form_fills),
+            'typed_fields': sum(f['typed_fields'] for f in self.form_fills),
+            'elapsed_s': sum(f['elapsed_s'] for f in self.form_fills),
+            'saved_s': sum(f['saved_s'] for f in self.form_fills),
+        }
+
+    def add_element_cache(self, stats):
+        """Add the page-object element cache counters of a test's driver"""
+        self.element_cache.append(dict(stats))
+
+    def summarize_element_cache(self):
+        """Element lookups served from page-object caches"""
+        totals = {kind: sum(s[kind] for s in self.element_cache)
+                  for kind in ('hits', 'misses', 'stale', 'invalidations')}
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_rate'] = totals['hits'] / lookups if lookups else 0.0
+        return totals
+
+    def summarize_interactions(self):
+        """Worst interactions and long-task time per page and profile"""
+        summary = {}
+        for interaction in self.interactions:
+            profile = interaction.get('profile', 'none')
+            page = summary.setdefault((interaction['page'], profile), {
+                'page': interaction['page'], 'profile': profile,
+                'interactions': 0, 'slow_interactions': 0, 'long_tasks': 0, 'long_task_ms': 0.0, 'worst': []
+            })
+            page['interactions'] += 1
+            page['long_tasks'] += interaction['long_tasks']
+            page['long_task_ms'] += interaction['long_task_ms']
+            if interaction['latency_ms'] is not None:
+                page['slow_interactions'] += interaction['latency_ms'] >= INTERACTION_SLOW_MS
+                page['worst'].append(interaction)
+        for page in summary.values():
+            page['worst'] = sorted(page['worst'], key=lambda i: i['latency_ms'], reverse=True)[:INTERACTION_REPORT_LIMIT]
+        return sorted(summary.values(), key=lambda p: (p['page'], p['profile']))
+
+    def summarize_profiles(self):
+        """Results and page timings per emulation profile"""
+        summary = {}
+        for result in self.test_results:
+            profile = summary.setdefault(result.get('profile', 'none'), {
+                'tests': 0, 'passed': 0, 'failed': 0, 'total_duration': 0.0,
+                'pages': 0, 'mean_fcp_ms': None, 'mean_load_ms': None
+            })
+            profile['tests'] += 1
+            profile['passed'] += result['status'] == 'PASSED'
+            profile['failed'] += result['status'] == 'FAILED'
+            profile['total_duration'] += result['duration']
+        for name in summary:
+            metrics = [s['metrics'] for s in self.page_snapshots if s['profile'] == name and not s['error']]
+            fcp = [m['first_contentful_paint_ms'] for m in metrics if m.get('first_contentful_paint_ms')]
+            load = [m['load_ms'] for m in metrics if m.get('load_ms')]
+            summary[name].update({
+                'pages': len(metrics),
+                'mean_fcp_ms': mean(fcp),
+                'mean_load_ms': mean(load),
+            })
+        return summary
+
     def generate_json_report(self):
         """Generate JSON report"""
         try:
             report = {
+                'run_id': self.run_id,
                 'execution_date': datetime.now().isoformat(),
                 'total_tests': len(self.test_results),
                 'passed': len([r for r in self.test_results if r['status'] == 'PASSED']),
-                'failed': len([r for r in self.test_results if r['status'] == 'FAILED']),
+                'failed': len([r for r in self.test_results if r['status'] == 'FAILED' and not r.get('quarantined')]),
+                'quarantined_failed': len([r for r in self.test_results if r['status'] == 'FAILED' and r.get('quarantined')]),
                 'skipped': len([r for r in self.test_results if r['status'] == 'SKIPPED']),
+                'cached': len([r for r in self.test_results if r.get('cached')]),
                 'total_api_errors': len(self.api_errors),
+                'total_api_calls': sum(e['histogram'].count for e in self.latency.endpoints.values()),
                 'test_results': self.test_results,
                 'api_errors': self.api_errors,
-                'screenshots': self.screenshots
+                'api_latency': self.latency.summary(),
+                'payloads': self.summarize_payloads(),
+                'cache_comparisons': self.cache_comparisons,
+                'api_call_patterns': sorted(self.api_call_patterns, key=lambda a: a['savings_ms'], reverse=True),
+                'screenshots': self.screenshots,
+                'profiles': self.summarize_profiles(),
+                'page_snapshots': self.page_snapshots,
+                'request_blocking': self.summarize_blocking_savings(),
+                'interactions': self.summarize_interactions(),
+                'form_fills': self.summarize_form_fills(),
+                'element_cache': self.summarize_element_cache(),
+                'memory_leaks': self.memory_leaks,
+                'flakiness': self.summarize_flakiness(),
+                'stages': self.stages,
+                'resources': self.resource_usage,
+                'benchmarks': self.benchmark_results,
+                'scaling': analyze_scaling(self.benchmark_results)
             }
             
             # Create directory if it doesn't exist
@@ -80,10 +403,27 @@ class ReportGenerator:
             logger.error(f"Failed to generate JSON report: {e}")
             return None
 
-    def generate_html_report(self):
-        """Generate HTML report"""
+    def archive_run(self, report):
+        """Keep a copy of the JSON report under reports/runs/<run_id> for run-to-run diffs"""
+        try:
+            run_dir = RUNS_DIR / self.run_id
+            run_dir.mkdir(parents=True, exist_ok=True)
+            with open(run_dir / JSON_REPORT_PATH.name, 'w') as f:
+                json.dump(report, f, indent=2)
+            
+            # Drop the oldest runs beyond the history limit
+            runs = sorted(d for d in RUNS_DIR.iterdir() if d.is_dir())
+            for old_run in runs[:-RUN_HISTORY_LIMIT]:
+                for path in old_run.iterdir():
+                    path.unlink()
+                old_run.rmdir()
+        except OSError as e:
+            logger.warning(f"Could not archive run {self.run_id}: {e}")
+
+    def generate_html_report(self, report=None):
+        """Generate HTML report, from an already generated JSON report if given"""
         try:
-            report = self.generate_json_report()
+            report = report or self.generate_json_report()
             if not report:
                 return None
             
@@ -95,38 +435,14 @@ class ReportGenerator:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>UtilityHub360 Test Report</title>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f5f5f5; padding: 20px; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 8px 8px 0 0; }}
-        .header h1 {{ margin-bottom: 10px; }}
-        .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; padding: 30px; }}
-        .summary-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; }}
-        .summary-card h3 {{ font-size: 36px; margin-bottom: 5px; }}
-        .summary-card p {{ color: #666; text-transform: uppercase; font-size: 12px; letter-spacing: 1px; }}
-        .passed {{ color: #28a745; }}
-        .failed {{ color: #dc3545; }}
-        .skipped {{ color: #ffc107; }}
-        .section {{ padding: 30px; border-top: 1px solid #eee; }}
-        .section h2 {{ margin-bottom: 20px; color: #333; }}
-        table {{ width: 100%; border-collapse: collapse; }}
-        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #eee; }}
-        th {{ background: #f8f9fa; font-weight: 600; color: #666; }}
-        .status {{ padding: 4px 12px; border-radius: 4px; font-size: 12px; font-weight: 600; }}
-        .status.passed {{ background: #d4edda; color: #155724; }}
-        .status.failed {{ background: #f8d7da; color: #721c24; }}
-        .status.skipped {{ background: #fff3cd; color: #856404; }}
-        .error-message {{ color: #dc3545; font-size: 12px; margin-top: 5px; }}
-        .api-error {{ background: #f8d7da; padding: 15px; margin-bottom: 10px; border-left: 4px solid #dc3545; border-radius: 4px; }}
-        .api-error strong {{ display: block; margin-bottom: 5px; }}
-        .footer {{ padding: 20px; text-align: center; color: #666; border-top: 1px solid #eee; }}
+        {REPORT_CSS}
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>🎯 UtilityHub360 Test Execution Report</h1>
-            <p>Execution Date: {report['execution_date']}</p>
+            <p>Execution Date: {report['execution_date']} · Run ID: {report['run_id']}</p>
         </div>
         
         <div class="summary">
@@ -165,10 +481,13 @@ class ReportGenerator:
             for result in report['test_results']:
                 status_class = result['status'].lower()
                 error_html = f"<div class='error-message'>{result['error_message']}</div>" if result['error_message'] else ""
+                if result.get('trace'):
+                    trace_href = os.path.relpath(result['trace'], HTML_REPORT_PATH.parent)
+                    error_html += f"<a href='{trace_href}'>📈 Performance trace</a>"
                 html_content += f"""
                     <tr>
                         <td>{result['test_name']}</td>
-                        <td><span class="status {status_class}">{result['status']}</span></td>
+                        <td><span class="status {status_class}">{result['status']}</span>{' (cached)' if result.get('cached') else ''}</td>
                         <td>{result['duration']:.2f}</td>
                         <td>{error_html}</td>
                     </tr>
@@ -198,6 +517,582 @@ class ReportGenerator:
         </div>
 """
             
+            if report['api_latency']:
+                html_content += """
+        <div class="section">
+            <h2>⏱️ API Latency by Endpoint</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Endpoint</th>
+                        <th>Calls</th>
+                        <th>Error Rate</th>
+                        <th>p50 (ms)</th>
+                        <th>p95 (ms)</th>
+                        <th>p99 (ms)</th>
+                        <th>Max (ms)</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for endpoint in report['api_latency']:
+                    status_class = 'failed' if endpoint['errors'] else 'passed'
+                    html_content += f"""
+                    <tr>
+                        <td>{endpoint['endpoint']} <small>({endpoint['profile']})</small><br><small>{len(endpoint['workers'])} worker(s)</small></td>
+                        <td>{endpoint['count']}</td>
+                        <td><span class="status {status_class}">{endpoint['error_rate']:.1%}</span></td>
+                        <td>{endpoint['p50_ms']:.0f}</td>
+                        <td>{endpoint['p95_ms']:.0f}</td>
+                        <td>{endpoint['p99_ms']:.0f}</td>
+                        <td>{endpoint['max_ms']:.0f}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if report['payloads']['pages']:
+                html_content += """
+        <div class="section">
+            <h2>📦 Payload Sizes</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Page</th>
+                        <th>Requests</th>
+                        <th>Transferred</th>
+                        <th>Decoded</th>
+                        <th>From Cache</th>
+                        <th>Flagged Resources</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for payload in report['payloads']['pages']:
+                    flags_html = '<br>'.join(
+                        payload['flags'] + [f"{r['url']}: {', '.join(r['flags'])}" for r in payload['flagged']])
+                    status_class = 'failed' if flags_html else 'passed'
+                    html_content += f"""
+                    <tr>
+                        <td>{payload['page']} <small>({payload['profile']})</small></td>
+                        <td>{payload['requests']}</td>
+                        <td><span class="status {status_class}">{payload['transfer_bytes'] / 1024:.0f} KB</span></td>
+                        <td>{payload['decoded_bytes'] / 1024:.0f} KB</td>
+                        <td>{payload['cached_requests']}</td>
+                        <td><small>{flags_html or '-'}</small></td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+            <h3>Largest Responses</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Resource</th>
+                        <th>Page</th>
+                        <th>Transferred</th>
+                        <th>Decoded</th>
+                        <th>Encoding</th>
+                        <th>Cache</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for resource in report['payloads']['largest']:
+                    html_content += f"""
+                    <tr>
+                        <td><small>{resource['url']}</small></td>
+                        <td>{resource['page']} <small>({resource['profile']})</small></td>
+                        <td>{resource['transfer_bytes'] / 1024:.1f} KB</td>
+                        <td>{resource['decoded_bytes'] / 1024:.1f} KB</td>
+                        <td>{resource['content_encoding'] or 'none'}</td>
+                        <td>{resource['cache_status']}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+            <h3>Bytes per Endpoint</h3>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Endpoint</th>
+                        <th>Requests</th>
+                        <th>Transferred</th>
+                        <th>Decoded</th>
+                        <th>Largest Response</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for totals in report['payloads']['endpoints']:
+                    html_content += f"""
+                    <tr>
+                        <td>{totals['endpoint']} <small>({totals['profile']})</small></td>
+                        <td>{totals['requests']}</td>
+                        <td>{totals['transfer_bytes'] / 1024:.1f} KB</td>
+                        <td>{totals['decoded_bytes'] / 1024:.1f} KB</td>
+                        <td>{totals['max_decoded_bytes'] / 1024:.1f} KB</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if report['cache_comparisons']:
+                html_content += """
+        <div class="section">
+            <h2>🗄️ Warm vs Cold Cache</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Page</th>
+                        <th>Requests (cold → warm)</th>
+                        <th>Transferred (cold → warm)</th>
+                        <th>FCP (cold → warm, ms)</th>
+                        <th>Load (cold → warm, ms)</th>
+                        <th>Re-downloaded Cacheable Resources</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for comparison in report['cache_comparisons']:
+                    cold, warm = comparison['cold'], comparison['warm']
+                    redownloaded_html = '<br>'.join(
+                        f"{r['url']} ({r['cache_control']})" for r in comparison['redownloaded'])
+                    status_class = 'failed' if comparison['redownloaded'] else 'passed'
+                    service_worker = ' <small>(service worker)</small>' if comparison['service_worker'] else ''
+                    html_content += f"""
+                    <tr>
+                        <td>{comparison['page']}{service_worker}</td>
+                        <td>{cold['requests']} → {warm['requests']} ({warm['cached_requests']} cached)</td>
+                        <td><span class="status {status_class}">{cold['transfer_bytes'] / 1024:.0f} → {warm['transfer_bytes'] / 1024:.0f} KB</span></td>
+                        <td>{cold['first_contentful_paint_ms'] or 0:.0f} → {warm['first_contentful_paint_ms'] or 0:.0f}</td>
+                        <td>{cold['load_ms'] or 0:.0f} → {warm['load_ms'] or 0:.0f}</td>
+                        <td><small>{redownloaded_html or '-'}</small></td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if report['api_call_patterns']:
+                html_content += """
+        <div class="section">
+            <h2>🔁 Redundant API Calls</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Page</th>
+                        <th>Calls</th>
+                        <th>Duplicates</th>
+                        <th>N+1 Loops</th>
+                        <th>Waterfalls</th>
+                        <th>Potential Savings (ms)</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for analysis in report['api_call_patterns']:
+                    duplicates_html = '<br>'.join(f"{d['request']} ×{d['count']}" for d in analysis['duplicates'])
+                    n_plus_one_html = '<br>'.join(
+                        f"{p['endpoint']} ×{p['count']} ({p['distinct_items']} items)" for p in analysis['n_plus_one'])
+                    waterfalls_html = '<br>'.join(
+                        f"{' → '.join(w['chain'])} ({w['sequential_ms']:.0f} ms)" for w in analysis['waterfalls'])
+                    html_content += f"""
+                    <tr>
+                        <td>{analysis['page']}</td>
+                        <td>{analysis['calls']}</td>
+                        <td><small>{duplicates_html or '-'}</small></td>
+                        <td><small>{n_plus_one_html or '-'}</small></td>
+                        <td><small>{waterfalls_html or '-'}</small></td>
+                        <td>{analysis['savings_ms']:.0f}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if set(report['profiles']) - {'none'}:
+                html_content += """
+        <div class="section">
+            <h2>🐢 Emulation Profiles</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Profile</th>
+                        <th>Tests</th>
+                        <th>Passed</th>
+                        <th>Failed</th>
+                        <th>Duration (s)</th>
+                        <th>Mean FCP (ms)</th>
+                        <th>Mean Load (ms)</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for profile, totals in report['profiles'].items():
+                    fcp = totals['mean_fcp_ms']
+                    load = totals['mean_load_ms']
+                    html_content += f"""
+                    <tr>
+                        <td>{profile}</td>
+                        <td>{totals['tests']}</td>
+                        <td>{totals['passed']}</td>
+                        <td>{totals['failed']}</td>
+                        <td>{totals['total_duration']:.2f}</td>
+                        <td>{f"{fcp:.0f}" if fcp else '-'}</td>
+                        <td>{f"{load:.0f}" if load else '-'}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if any(p['blocked_requests'] for p in report['request_blocking'].values()):
+                html_content += """
+        <div class="section">
+            <h2>🚫 Request Blocking Savings</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Profile</th>
+                        <th>Tests</th>
+                        <th>Requests Blocked</th>
+                        <th>Bytes Saved (est.)</th>
+                        <th>Unknown Size</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for profile, totals in report['request_blocking'].items():
+                    html_content += f"""
+                    <tr>
+                        <td>{profile}</td>
+                        <td>{totals['tests']}</td>
+                        <td>{totals['blocked_requests']}</td>
+                        <td>{totals['blocked_bytes'] / 1024:.1f} KB</td>
+                        <td>{totals['unknown_size_requests']}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if report['page_snapshots']:
+                html_content += """
+        <div class="section">
+            <h2>🧭 Page Snapshots</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Page</th>
+                        <th>Title</th>
+                        <th>API Calls</th>
+                        <th>API Errors</th>
+                        <th>FCP (ms)</th>
+                        <th>Load (ms)</th>
+                        <th>DOM Nodes</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for snapshot in report['page_snapshots']:
+                    metrics = snapshot['metrics']
+                    fcp = metrics.get('first_contentful_paint_ms')
+                    load = metrics.get('load_ms')
+                    error_html = f"<div class='error-message'>{snapshot['error']}</div>" if snapshot['error'] else ""
+                    html_content += f"""
+                    <tr>
+                        <td>{snapshot['name']} <small>({snapshot['profile']})</small><br><small>{snapshot['url'] or snapshot['path']}</small>{error_html}</td>
+                        <td>{snapshot['title'] or ''}</td>
+                        <td>{snapshot['api_call_count']}</td>
+                        <td>{snapshot['api_error_count']}</td>
+                        <td>{f"{fcp:.0f}" if fcp else '-'}</td>
+                        <td>{f"{load:.0f}" if load else '-'}</td>
+                        <td>{snapshot['dom'].get('node_count', '-')}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if any(p['worst'] for p in report['interactions']):
+                html_content += """
+        <div class="section">
+            <h2>🐌 Slowest Interactions</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Page</th>
+                        <th>Action</th>
+                        <th>Latency (ms)</th>
+                        <th>Input Delay / Processing / Paint (ms)</th>
+                        <th>Long Tasks</th>
+                        <th>Test</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for page in report['interactions']:
+                    for interaction in page['worst']:
+                        status_class = 'failed' if interaction['latency_ms'] >= INTERACTION_SLOW_MS else 'passed'
+                        html_content += f"""
+                    <tr>
+                        <td>{page['page']} <small>({page['profile']})</small><br><small>{page['slow_interactions']} of {page['interactions']} slow</small></td>
+                        <td>{interaction['action']} ({interaction['event']})<br><small>{interaction['target']}</small></td>
+                        <td><span class="status {status_class}">{interaction['latency_ms']:.0f}</span></td>
+                        <td>{interaction['input_delay_ms']:.0f} / {interaction['processing_ms']:.0f} / {interaction['presentation_delay_ms']:.0f}</td>
+                        <td>{interaction['long_tasks']} ({interaction['long_task_ms']:.0f} ms)</td>
+                        <td>{interaction['test_name']}</td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            form_fills = report['form_fills']
+            element_cache = report['element_cache']
+            if form_fills['fills'] or element_cache['hits'] + element_cache['misses']:
+                html_content += """
+        <div class="section">
+            <h2>⌨️ Page Object Round Trips</h2>
+"""
+                if form_fills['fills']:
+                    html_content += f"""
+            <p>Form filling: {form_fills['fields']} fields in {form_fills['fills']} forms, {form_fills['bulk_fields']} set in bulk,
+               {form_fills['typed_fields']} typed · {form_fills['elapsed_s']:.1f}s spent,
+               ~{form_fills['saved_s']:.1f}s saved compared to typing every field</p>
+"""
+                if element_cache['hits'] + element_cache['misses']:
+                    html_content += f"""
+            <p>Element cache: {element_cache['hits']} of {element_cache['hits'] + element_cache['misses']} lookups
+               served from cache ({element_cache['hit_rate']:.0%}) · {element_cache['stale']} stale handles re-found ·
+               {element_cache['invalidations']} invalidations on navigation</p>
+"""
+                html_content += """
+        </div>
+"""
+            
+            if report['memory_leaks']:
+                html_content += """
+        <div class="section">
+            <h2>💧 Memory Leak Soak</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Route</th>
+                        <th>Cycles</th>
+                        <th>JS Heap (MB)</th>
+                        <th>Heap Growth (KB/cycle)</th>
+                        <th>DOM Nodes/cycle</th>
+                        <th>Listeners/cycle</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for leak in report['memory_leaks']:
+                    slopes = leak['slopes']
+                    first_heap = leak['first'].get('js_heap_bytes')
+                    last_heap = leak['last'].get('js_heap_bytes')
+                    heap_slope = slopes.get('js_heap_bytes')
+                    node_slope = slopes.get('dom_nodes')
+                    listener_slope = slopes.get('event_listeners')
+                    status_class = 'failed' if leak['leaking'] else 'passed'
+                    reasons_html = f"<div class='error-message'>{'; '.join(leak['reasons'])}</div>" if leak['reasons'] else ""
+                    html_content += f"""
+                    <tr>
+                        <td>{leak['page']}{reasons_html}</td>
+                        <td>{leak['iterations']}</td>
+                        <td>{f"{first_heap / 1048576:.1f} → {last_heap / 1048576:.1f}" if first_heap and last_heap else '-'}</td>
+                        <td>{f"{heap_slope / 1024:.1f}" if heap_slope is not None else '-'}</td>
+                        <td>{f"{node_slope:.1f}" if node_slope is not None else '-'}</td>
+                        <td>{f"{listener_slope:.1f}" if listener_slope is not None else '-'}</td>
+                        <td><span class="status {status_class}">{'LEAKING' if leak['leaking'] else 'OK'}</span></td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if report['stages']:
+                html_content += """
+        <div class="section">
+            <h2>🚦 Pipeline Stages</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Stage</th>
+                        <th>Tests</th>
+                        <th>Duration (s)</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for stage in report['stages']:
+                    status = 'PASSED' if stage['exit_status'] in (0, 5) else 'FAILED'
+                    html_content += f"""
+                    <tr>
+                        <td>{stage['name']}</td>
+                        <td>{stage['tests']}</td>
+                        <td>{stage['duration']:.1f}</td>
+                        <td><span class="status {status.lower()}">{status}</span></td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            flakiness = report['flakiness']
+            if flakiness['retries'] or flakiness['quarantined']:
+                html_content += f"""
+        <div class="section">
+            <h2>🔁 Flaky Tests</h2>
+            <p>{flakiness['retried_tests']} known-flaky tests retried in place,
+               {flakiness['passed_on_retry']} passed on retry · retries cost {flakiness['retry_time_s']:.1f}s ·
+               {len(flakiness['quarantined'])} quarantined (non-blocking), {report['quarantined_failed']} of them failed</p>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Test</th>
+                        <th>Lane</th>
+                        <th>Attempts</th>
+                        <th>Retry Time (s)</th>
+                        <th>Flip Rate</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                rows = [dict(r, lane='retry') for r in flakiness['retries']] + \
+                    [dict(r, lane='quarantine', attempts=1, retry_time_s=0.0) for r in flakiness['quarantined']]
+                for row in rows:
+                    flip_rate = row.get('flip_rate') or flakiness['history'].get(row['test_name'], {}).get('flip_rate')
+                    html_content += f"""
+                    <tr>
+                        <td>{row['test_name']}</td>
+                        <td>{row['lane']}</td>
+                        <td>{row['attempts']}</td>
+                        <td>{row['retry_time_s']:.1f}</td>
+                        <td>{f"{flip_rate:.0%}" if flip_rate is not None else '-'}</td>
+                        <td><span class="status {row['status'].lower()}">{row['status']}</span></td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
+            if report['resources']:
+                usage = report['resources']
+                recommendation = usage['recommendation']
+                advice = ('run with fewer workers' if recommendation['workers'] < usage['workers']
+                          else 'room for more workers' if recommendation['workers'] > usage['workers']
+                          else 'worker count fits this machine')
+                html_content += f"""
+        <div class="section">
+            <h2>🖥️ Resource Usage</h2>
+            <p>{usage['workers']} workers on {usage['cpu_count']} cores · peak load {usage['peak_load_1m']:.1f} ·
+               contended {usage['contention'] * 100:.0f}% of the run ·
+               recommended <strong>{recommendation['workers']} workers</strong>
+               (limited by {recommendation['limited_by']}; {advice})</p>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Processes</th>
+                        <th>Count (peak)</th>
+                        <th>CPU cores (mean / peak)</th>
+                        <th>RSS (peak MB)</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for group, stats in usage['groups'].items():
+                    per_browser = stats.get('peak_rss_per_browser_bytes')
+                    html_content += f"""
+                    <tr>
+                        <td>{group}</td>
+                        <td>{stats['peak_processes']}</td>
+                        <td>{stats['mean_cpu_cores']:.2f} / {stats['peak_cpu_cores']:.2f}</td>
+                        <td>{stats['peak_rss_bytes'] / 1048576:.0f}{f" ({per_browser / 1048576:.0f} per browser)" if per_browser else ''}</td>
+                    </tr>
+"""
+                html_content += f"""
+                </tbody>
+            </table>
+            <p><small>Per worker: {usage['per_worker']['cpu_per_worker']:.2f} cores (p90),
+               {usage['per_worker']['rss_per_worker'] / 1048576:.0f} MB peak RSS</small></p>
+        </div>
+"""
+            
+            if report['scaling']:
+                html_content += """
+        <div class="section">
+            <h2>📈 Data-Volume Scaling</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Page</th>
+                        <th>Sizes</th>
+                        <th>Rendered (ms)</th>
+                        <th>DOM Nodes</th>
+                        <th>JS Heap (MB)</th>
+                        <th>Growth (render / DOM / heap)</th>
+                        <th>Recommendation</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+                for page in report['scaling']:
+                    curves = page['curves']
+                    rendered = ', '.join(f"{v:.0f}" if v is not None else '-' for v in curves['time_to_rendered_ms']['values'])
+                    dom_nodes = ', '.join(str(v) if v is not None else '-' for v in curves['dom_nodes']['values'])
+                    heap = ', '.join(f"{v / 1048576:.1f}" if v is not None else '-' for v in curves['js_heap_bytes']['values'])
+                    growth = ' / '.join(curves[m]['growth'] for m in ('time_to_rendered_ms', 'dom_nodes', 'js_heap_bytes'))
+                    recommendation = '<br>'.join(page['recommendations']) or 'OK'
+                    status_class = 'failed' if page['recommendations'] else 'passed'
+                    html_content += f"""
+                    <tr>
+                        <td>{page['page']}</td>
+                        <td>{', '.join(str(size) for size in page['sizes'])}</td>
+                        <td>{rendered}</td>
+                        <td>{dom_nodes}</td>
+                        <td>{heap}</td>
+                        <td>{growth}</td>
+                        <td><span class="status {status_class}">{recommendation}</span></td>
+                    </tr>
+"""
+                html_content += """
+                </tbody>
+            </table>
+        </div>
+"""
+            
             html_content += """
         <div class="footer">
             <p>Generated by UtilityHub360 Automation Framework</p>
@@ -0,0 +1,159 @@
+"""
+Request Blocking Utility
+Blocks fonts, analytics, images and other non-essential requests during functional runs
+"""
+
+import os
+import json
+import logging
+import requests
+from config.config import REQUEST_BLOCKING_PROFILES, RESOURCE_SIZES_FILE, RESOURCE_SIZE_TIMEOUT
+from utils.cdp import execute_cdp, is_chromium
+from utils.network_log import get_network_log
+
+logger = logging.getLogger(__name__)
+
+# URL patterns used to block resource types (CDP blocks by URL only, so by file extension)
+RESOURCE_TYPE_PATTERNS = {
+    'font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.bmp*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.ogg*', '*.wav*'],
+}
+
+# Firefox preferences that approximate resource type blocking
+FIREFOX_TYPE_PREFERENCES = {
+    'font': {'gfx.downloadable_fonts.enabled': False, 'browser.display.use_document_fonts': 0},
+    'image': {'permissions.default.image': 2},
+    'media': {'media.autoplay.default': 5, 'media.preload.default': 0},
+}
+
+
+class RequestBlocker:
+    """Apply a request blocking profile to a browser and report its savings"""
+
+    def __init__(self, profile_name):
+        if profile_name not in REQUEST_BLOCKING_PROFILES:
+            raise ValueError(f"Unknown request blocking profile: {profile_name} "
+                             f"(available: {', '.join(REQUEST_BLOCKING_PROFILES)})")
+        self.profile_name = profile_name
+        self.profile = REQUEST_BLOCKING_PROFILES[profile_name]
+
+    @property
+    def blocks_anything(self):
+        return bool(self.profile['url_patterns'] or self.profile['resource_types'])
+
+    def url_patterns(self):
+        """All URL patterns to block, including resource type patterns"""
+        patterns = list(self.profile['url_patterns'])
+        for resource_type in self.profile['resource_types']:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        return patterns
+
+    def firefox_preferences(self):
+        """Preferences approximating the profile on Firefox (no URL patterns)"""
+        preferences = {}
+        for resource_type in self.profile['resource_types']:
+            preferences.update(FIREFOX_TYPE_PREFERENCES.get(resource_type, {}))
+        return preferences
+
+    def activate(self, driver):
+        """Start blocking on a Chromium browser"""
+        if not is_chromium(driver):
+            if self.profile['url_patterns']:
+                logger.debug("URL pattern blocking needs CDP; only resource type prefs applied")
+            return
+        if not self.blocks_anything:
+            return
+        execute_cdp(driver, 'Network.enable')
+        execute_cdp(driver, 'Network.setBlockedURLs', {'urls': self.url_patterns()})
+        logger.debug(f"Request blocking profile '{self.profile_name}' active")
+
+    def collect_savings(self, driver):
+        """Count blocked requests and the bytes they would have cost
+
+        Sizes of blocked URLs come from the table learned from unblocked
+        (full-fidelity) loads; URLs not in it yet are fetched directly
+        once and their response size is added to the table.
+        """
+        savings = {
+            'profile': self.profile_name,
+            'measured': is_chromium(driver),
+            'blocked_requests': 0,
+            'blocked_bytes': 0,
+            'unknown_size_requests': 0,
+            'by_type': {},
+        }
+        if not savings['measured']:
+            return savings
+
+        known_sizes = load_resource_sizes()
+        learned = {}
+        for record in get_network_log(driver).requests().values():
+            url = record['url']
+            if not url:
+                continue
+            if record['blocked_reason']:
+                resource_type = (record['type'] or 'Other').lower()
+                by_type = savings['by_type'].setdefault(resource_type, {'requests': 0, 'bytes': 0})
+                savings['blocked_requests'] += 1
+                by_type['requests'] += 1
+                key = url.split('?')[0]
+                size = known_sizes.get(key, learned.get(key))
+                if size is None:
+                    size = fetch_size(url)
+                    if size is not None:
+                        learned[key] = size
+                if size is None:
+                    savings['unknown_size_requests'] += 1
+                else:
+                    savings['blocked_bytes'] += size
+                    by_type['bytes'] += size
+            elif record['encoded_bytes'] and not record['failed']:
+                learned[url.split('?')[0]] = record['encoded_bytes']
+
+        if learned:
+            known_sizes.update(learned)
+            save_resource_sizes(known_sizes)
+        return savings
+
+
+# URLs whose size could not be fetched in this process, so they are not retried
+_unfetchable = set()
+
+
+def fetch_size(url):
+    """Bytes a URL's response transfers, fetched outside the browser; None if it can't be fetched"""
+    if url in _unfetchable:
+        return None
+    try:
+        with requests.get(url, stream=True, timeout=RESOURCE_SIZE_TIMEOUT) as response:
+            response.raise_for_status()
+            length = response.headers.get('content-length', '')
+            if length.isdigit():
+                return int(length)
+            return sum(len(chunk) for chunk in response.raw.stream(65536, decode_content=False))
+    except requests.RequestException as e:
+        logger.debug(f"Could not fetch size of blocked {url}: {e}")
+        _unfetchable.add(url)
+        return None
+
+
+def load_resource_sizes():
+    """Load the URL -> transfer size table learned from earlier runs"""
+    try:
+        with open(RESOURCE_SIZES_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_resource_sizes(sizes):
+    """Save the URL -> transfer size table (atomic, workers share the file)"""
+    try:
+        RESOURCE_SIZES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = RESOURCE_SIZES_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(sizes, f, indent=2)
+        os.replace(tmp_path, RESOURCE_SIZES_FILE)
+    except OSError as e:
+        logger.debug(f"Could not save resource sizes: {e}")
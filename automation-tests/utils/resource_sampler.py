@@ -0,0 +1,266 @@
+"""
+Resource Sampler Utility
+Samples CPU, RSS and load average of the test run's browser and driver processes from /proc
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from config.config import (
+    RESOURCE_SAMPLE_INTERVAL, RESOURCE_CPU_TARGET, RESOURCE_MEMORY_TARGET, RESOURCE_MAX_WORKERS,
+    WORKER_CPU_ESTIMATE, WORKER_RSS_ESTIMATE, RESOURCE_PROFILE_FILE
+)
+
+logger = logging.getLogger(__name__)
+
+PROC = Path('/proc')
+DRIVER_NAMES = ('chromedriver', 'geckodriver', 'msedgedriver')
+GROUPS = ('pytest', 'driver', 'browser')
+
+
+def proc_available():
+    return (PROC / 'stat').exists()
+
+
+def _clock_ticks():
+    try:
+        return os.sysconf('SC_CLK_TCK')
+    except (ValueError, OSError, AttributeError):
+        return 100
+
+
+def _page_size():
+    try:
+        return os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return 4096
+
+
+def read_process(pid):
+    """{'pid', 'ppid', 'name', 'cpu_ticks', 'rss_bytes'} from /proc/<pid>/stat, or None if it exited"""
+    try:
+        stat = (PROC / str(pid) / 'stat').read_text()
+    except OSError:
+        return None
+    # The name is in parentheses and may itself contain spaces or parentheses
+    name = stat[stat.index('(') + 1:stat.rindex(')')]
+    fields = stat[stat.rindex(')') + 2:].split()
+    return {
+        'pid': pid,
+        'ppid': int(fields[1]),
+        'name': name,
+        'cpu_ticks': int(fields[11]) + int(fields[12]),
+        'rss_bytes': int(fields[21]) * _page_size(),
+    }
+
+
+def process_tree(root_pid):
+    """The root process and all its descendants, classified as pytest, driver or browser"""
+    processes = {}
+    for entry in PROC.iterdir():
+        if entry.name.isdigit():
+            process = read_process(int(entry.name))
+            if process:
+                processes[process['pid']] = process
+
+    children = {}
+    for process in processes.values():
+        children.setdefault(process['ppid'], []).append(process['pid'])
+
+    tree = []
+    stack = [(root_pid, 'pytest')]
+    while stack:
+        pid, group = stack.pop()
+        process = processes.get(pid)
+        if not process:
+            continue
+        if group != 'browser' and process['name'].startswith(DRIVER_NAMES):
+            group = 'driver'
+        process['group'] = group
+        process['browser_root'] = group == 'browser' and processes.get(process['ppid'], {}).get('group') == 'driver'
+        tree.append(process)
+        child_group = 'browser' if group in ('driver', 'browser') else 'pytest'
+        stack.extend((child, child_group) for child in children.get(pid, []))
+    return tree
+
+
+def system_resources():
+    """CPU count, load averages and memory of the machine"""
+    memory = {}
+    try:
+        for line in (PROC / 'meminfo').read_text().splitlines():
+            key, value = line.split(':', 1)
+            memory[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        load = os.getloadavg()
+    except (OSError, AttributeError):
+        load = (0.0, 0.0, 0.0)
+    return {
+        'cpu_count': os.cpu_count() or 1,
+        'load_1m': load[0],
+        'load_5m': load[1],
+        'memory_total_bytes': memory.get('MemTotal'),
+        'memory_available_bytes': memory.get('MemAvailable'),
+    }
+
+
+class ResourceSampler:
+    """Sample the run's process tree in a background thread (Linux only)"""
+
+    def __init__(self, workers, root_pid=None, interval=RESOURCE_SAMPLE_INTERVAL):
+        self.workers = max(1, workers)
+        self.root_pid = root_pid or os.getpid()
+        self.interval = interval
+        self.samples = []
+        self.stopping = threading.Event()
+        self.thread = None
+        self.ticks = _clock_ticks()
+        self.previous = {}  # pid -> CPU ticks at the last sample
+        self.previous_time = None
+
+    def start(self):
+        """Begin sampling; returns False where /proc is not available"""
+        if not proc_available():
+            logger.info("Resource sampling needs /proc (Linux); skipped")
+            return False
+        # Baseline, so the first sample counts the CPU of its interval, not since process start
+        self.previous = {p['pid']: p['cpu_ticks'] for p in process_tree(self.root_pid)}
+        self.previous_time = time.time()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop sampling and summarize"""
+        if not self.thread:
+            return None
+        self.stopping.set()
+        self.thread.join(timeout=self.interval * 2 + 5)
+        return self.summary()
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            now = time.time()
+            elapsed = now - self.previous_time
+            tree = process_tree(self.root_pid)
+            current = {p['pid']: p['cpu_ticks'] for p in tree}
+            sample = {'time': now, **system_resources()}
+            for group in GROUPS:
+                members = [p for p in tree if p['group'] == group]
+                # Processes started since the last sample count from zero
+                ticks = sum(current[p['pid']] - self.previous.get(p['pid'], 0) for p in members)
+                sample[f"{group}_cpu_cores"] = ticks / self.ticks / elapsed if elapsed else 0.0
+                sample[f"{group}_rss_bytes"] = sum(p['rss_bytes'] for p in members)
+                sample[f"{group}_processes"] = len(members)
+            sample['browsers'] = len([p for p in tree if p['browser_root']])
+            self.samples.append(sample)
+            self.previous, self.previous_time = current, now
+
+    def summary(self):
+        """Peaks, averages, per-worker cost, contention and the recommended worker count"""
+        if not self.samples:
+            return None
+        system = system_resources()
+        busy = [s for s in self.samples if s['browsers']] or self.samples
+
+        def mean(values):
+            values = list(values)
+            return sum(values) / len(values) if values else 0.0
+
+        groups = {}
+        for group in GROUPS:
+            groups[group] = {
+                'mean_cpu_cores': mean(s[f"{group}_cpu_cores"] for s in busy),
+                'peak_cpu_cores': max(s[f"{group}_cpu_cores"] for s in self.samples),
+                'peak_rss_bytes': max(s[f"{group}_rss_bytes"] for s in self.samples),
+                'peak_processes': max(s[f"{group}_processes"] for s in self.samples),
+            }
+        peak_browsers = max(s['browsers'] for s in self.samples)
+        if peak_browsers:
+            groups['browser']['peak_rss_per_browser_bytes'] = max(
+                s['browser_rss_bytes'] / s['browsers'] for s in self.samples if s['browsers']
+            )
+
+        run_cpu = [sum(s[f"{g}_cpu_cores"] for g in GROUPS) for s in busy]
+        run_rss = [sum(s[f"{g}_rss_bytes"] for g in GROUPS) for s in self.samples]
+        cpu_count = system['cpu_count']
+        # Contended: more runnable work than cores, or under 10% of memory left
+        contended = [
+            s for s in self.samples
+            if s['load_1m'] > cpu_count or (
+                s['memory_total_bytes'] and s['memory_available_bytes'] is not None
+                and s['memory_available_bytes'] < 0.1 * s['memory_total_bytes'])
+        ]
+        profile = {
+            'cpu_per_worker': sorted(run_cpu)[int(len(run_cpu) * 0.9)] / self.workers,
+            'rss_per_worker': max(run_rss) / self.workers,
+        }
+        return {
+            'workers': self.workers,
+            'samples': len(self.samples),
+            'interval_s': self.interval,
+            'cpu_count': cpu_count,
+            'memory_total_bytes': system['memory_total_bytes'],
+            'peak_load_1m': max(s['load_1m'] for s in self.samples),
+            'min_memory_available_bytes': min(
+                (s['memory_available_bytes'] for s in self.samples if s['memory_available_bytes'] is not None),
+                default=None),
+            'groups': groups,
+            'peak_browsers': peak_browsers,
+            'contention': len(contended) / len(self.samples),
+            'per_worker': profile,
+            'recommendation': recommend_workers(profile, idle=True),
+        }
+
+
+def load_profile(path=RESOURCE_PROFILE_FILE):
+    """Per-worker cost measured by the last run, if any"""
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def save_profile(profile, path=RESOURCE_PROFILE_FILE):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(profile, indent=2), encoding='utf-8')
+    except OSError as e:
+        logger.debug(f"Could not save resource profile: {e}")
+
+
+def recommend_workers(profile=None, idle=False, subtract_load=True):
+    """Workers that fit the machine's CPU and memory
+
+    Uses the per-worker cost of the last measured run (or the configured
+    estimate). At startup the load and memory already in use by other
+    processes are subtracted; idle=True sizes for an otherwise idle machine.
+    subtract_load=False keeps the memory check but ignores the load
+    average, which lags behind processes that just exited.
+    """
+    profile = profile or load_profile() or {}
+    cpu_per_worker = profile.get('cpu_per_worker') or WORKER_CPU_ESTIMATE
+    rss_per_worker = profile.get('rss_per_worker') or WORKER_RSS_ESTIMATE
+    system = system_resources()
+
+    cores = system['cpu_count'] * RESOURCE_CPU_TARGET
+    memory = system['memory_total_bytes'] if idle else system['memory_available_bytes']
+    if not idle and subtract_load:
+        cores -= system['load_1m']
+    by_cpu = int(max(cores, 0) / max(cpu_per_worker, 0.1))
+    by_memory = int(memory * RESOURCE_MEMORY_TARGET / rss_per_worker) if memory else by_cpu
+    workers = max(1, min(by_cpu, by_memory, RESOURCE_MAX_WORKERS))
+    return {
+        'workers': workers,
+        'limited_by': 'cpu' if by_cpu <= by_memory else 'memory',
+        'by_cpu': by_cpu,
+        'by_memory': by_memory,
+        'cpu_per_worker': cpu_per_worker,
+        'rss_per_worker': rss_per_worker,
+        'measured': bool(profile.get('cpu_per_worker')),
+    }
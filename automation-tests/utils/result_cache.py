@@ -0,0 +1,182 @@
+"""
+Result Cache Utility
+Fingerprints the inputs of each test so unchanged passing tests can be skipped
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+import requests
+import config.config as config
+from config.config import (
+    BASE_DIR, BASE_URL, API_BASE_URL, APP_SRC_DIR, TEST_DATA_FILE, SEED_OFFLINE,
+    RESULT_CACHE_FILE, RESULT_CACHE_MAX_AGE_HOURS, RESULT_CACHE_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+# Production builds name their chunks after the content, e.g. main.3f2a1b9c.js
+HASHED_ASSET = re.compile(r'\.[0-9a-f]{8,}\.(js|css)$')
+APP_FILES = ('package.json', 'package-lock.json')
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+    return digest.hexdigest()
+
+
+def source_tree_hash(root=APP_SRC_DIR):
+    """Hash of every file under the app's source directory and its package files"""
+    digest = hashlib.sha256()
+    files = sorted(p for p in Path(root).rglob('*') if p.is_file())
+    files += [Path(root).parent / name for name in APP_FILES if (Path(root).parent / name).exists()]
+    for path in files:
+        digest.update(str(path.relative_to(Path(root).parent)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def bundle_hash(base_url=BASE_URL):
+    """Hash of the frontend that BASE_URL serves, or None if it can't be determined
+
+    A production build's asset-manifest.json lists content-hashed chunk
+    names, so its hash changes with the code. The dev server's manifest
+    names never change, so the local source tree is hashed instead.
+    """
+    try:
+        response = requests.get(f"{base_url}/asset-manifest.json", timeout=RESULT_CACHE_TIMEOUT)
+        response.raise_for_status()
+        manifest = response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"No asset manifest at {base_url}: {e}")
+        return None
+    files = manifest.get('files', {}).values()
+    if any(HASHED_ASSET.search(name) for name in files):
+        return _sha256('manifest', json.dumps(manifest, sort_keys=True))
+    if Path(APP_SRC_DIR).is_dir():
+        return _sha256('source', source_tree_hash())
+    logger.warning(f"{base_url} serves unhashed assets and {APP_SRC_DIR} is missing")
+    return None
+
+
+def backend_hash():
+    """Identity of the backend: the API URL, the test data it is seeded with and the stub server"""
+    parts = [API_BASE_URL, SEED_OFFLINE]
+    if Path(TEST_DATA_FILE).exists():
+        parts.append(Path(TEST_DATA_FILE).read_bytes())
+    if SEED_OFFLINE:
+        parts.append((Path(__file__).parent / 'stub_api.py').read_bytes())
+    return _sha256(*parts)
+
+
+def config_hash():
+    """Hash of the resolved config values (including environment overrides)"""
+    values = {name: repr(getattr(config, name)) for name in dir(config) if name.isupper()}
+    return _sha256(json.dumps(values, sort_keys=True))
+
+
+def _project_module(obj):
+    """The repo module an object (module, class or function) comes from, if any"""
+    module = obj if inspect.ismodule(obj) else sys.modules.get(getattr(obj, '__module__', None) or '')
+    path = getattr(module, '__file__', None)
+    if path and Path(path).resolve().is_relative_to(BASE_DIR):
+        return module
+    return None
+
+
+def source_files(module):
+    """The module's file and every repo module it uses, e.g. page objects and utils"""
+    seen = {}
+    stack = [module]
+    while stack:
+        current = stack.pop()
+        path = Path(current.__file__).resolve()
+        if path in seen:
+            continue
+        seen[path] = current
+        for value in list(vars(current).values()):
+            used = _project_module(value)
+            if used and Path(used.__file__).resolve() not in seen:
+                stack.append(used)
+    return sorted(seen)
+
+
+class ResultCache:
+    """Passing results keyed by node ID, valid while the test's fingerprint is unchanged"""
+
+    def __init__(self, path=RESULT_CACHE_FILE, max_age_hours=RESULT_CACHE_MAX_AGE_HOURS):
+        self.path = path
+        self.max_age = max_age_hours * 3600
+        self.entries = self._load()
+        self.file_hashes = {}
+        self.run_inputs = None
+        self.passed = {}  # node ID -> call duration, until teardown has passed too
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, indent=2), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Could not save result cache: {e}")
+
+    def prepare(self, options):
+        """Hash the inputs shared by all tests; False if the bundle can't be identified"""
+        bundle = bundle_hash()
+        if bundle is None:
+            logger.warning("Result cache disabled: the served frontend could not be fingerprinted")
+            return False
+        self.run_inputs = _sha256(bundle, backend_hash(), config_hash(), json.dumps(options, sort_keys=True))
+        return True
+
+    def _file_hash(self, path):
+        if path not in self.file_hashes:
+            self.file_hashes[path] = _sha256(path.read_bytes())
+        return self.file_hashes[path]
+
+    def fingerprint(self, nodeid, module, extra_files=()):
+        """Fingerprint of a test: run inputs, its node ID (with parameters) and its source files"""
+        files = sorted(set(source_files(module)) | {Path(p).resolve() for p in extra_files})
+        return _sha256(self.run_inputs, nodeid, *(f"{p}:{self._file_hash(p)}" for p in files))
+
+    def lookup(self, nodeid, fingerprint):
+        """The cached pass of a test, if its inputs are unchanged and it isn't too old"""
+        entry = self.entries.get(nodeid)
+        if not entry or entry['fingerprint'] != fingerprint:
+            return None
+        if self.max_age and time.time() - entry['passed_at'] > self.max_age:
+            return None
+        return entry
+
+    def record(self, nodeid, when, outcome, duration, fingerprint, run_id):
+        """Cache a test once setup, call and teardown have passed; forget it when a phase fails"""
+        if outcome == 'failed':
+            self.passed.pop(nodeid, None)
+            self.discard(nodeid)
+        elif when == 'call' and outcome == 'passed':
+            self.passed[nodeid] = duration
+        elif when == 'teardown' and nodeid in self.passed:
+            self.store(nodeid, fingerprint, self.passed.pop(nodeid), run_id)
+
+    def store(self, nodeid, fingerprint, duration, run_id):
+        self.entries[nodeid] = {
+            'fingerprint': fingerprint,
+            'duration': duration,
+            'run_id': run_id,
+            'passed_at': time.time(),
+        }
+
+    def discard(self, nodeid):
+        self.entries.pop(nodeid, None)
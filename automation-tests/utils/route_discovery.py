@@ -0,0 +1,280 @@
+"""
+Route Discovery Utility
+Builds the page matrix from the app's React Router table, cached by the route files' hash
+"""
+
+import hashlib
+import json
+import logging
+import re
+from functools import lru_cache
+from config.config import (
+    PAGES_TO_TEST, ROUTE_DISCOVERY, ROUTE_FILES, ROUTE_CACHE_FILE, ROUTE_DISCOVERY_EXCLUDE
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing changes so cached route tables are rebuilt
+PARSER_VERSION = 2
+
+ROUTE_TAG = re.compile(r'<Route(?=[\s/>])|</Route>')
+CONSTANT = re.compile(r'export\s+const\s+(\w+)\s*=\s*[\'"]([^\'"]+)[\'"]')
+ATTRIBUTE = re.compile(r'\s*([\w-]+)')
+PREMIUM_FEATURE = re.compile(r'<PremiumRoute\s+feature=["\'](\w+)["\']')
+NAVIGATE_TARGET = re.compile(r'<Navigate\s+to=["\']([^"\']+)["\']')
+COMPONENT = re.compile(r'<([A-Z]\w*)')
+
+# Sidebar entries and the link inside each, in one round trip
+SIDEBAR_LINKS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(function(item) {
+    var link = item.closest('a[href]') || item.querySelector('a[href]');
+    return link ? {text: item.innerText.trim(), path: new URL(link.href).pathname} : null;
+}).filter(Boolean);
+"""
+
+
+def _read_tag(source, start):
+    """Attribute text of the tag opened at start, and whether it self-closes
+
+    Braces are balanced so JSX inside element={...} doesn't end the tag.
+    """
+    depth = 0
+    quote = None
+    for i in range(start, len(source)):
+        c = source[i]
+        if quote:
+            if c == quote:
+                quote = None
+        elif depth == 0 and c in '"\'':
+            quote = c
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+        elif depth == 0 and c == '>':
+            self_closing = source[i - 1] == '/'
+            return source[start:i - 1 if self_closing else i], self_closing, i + 1
+    raise ValueError(f"Unterminated <Route> tag at offset {start}")
+
+
+def _read_attributes(tag):
+    """name -> value ('"text"', '{expression}' or True) of a JSX tag"""
+    attributes = {}
+    i = 0
+    while i < len(tag):
+        match = ATTRIBUTE.match(tag, i)
+        if not match or not match.group(1):
+            i += 1
+            continue
+        name, i = match.group(1), match.end()
+        if i >= len(tag) or tag[i] != '=':
+            attributes[name] = True
+            continue
+        i += 1
+        if tag[i] in '"\'':
+            end = tag.index(tag[i], i + 1)
+            attributes[name] = tag[i:end + 1]
+            i = end + 1
+        elif tag[i] == '{':
+            depth = 0
+            for end in range(i, len(tag)):
+                depth += {'{': 1, '}': -1}.get(tag[end], 0)
+                if depth == 0:
+                    break
+            attributes[name] = tag[i:end + 1]
+            i = end + 1
+    return attributes
+
+
+def _resolve_path(value, constants):
+    """Route path from path="x" or path={CONSTANT}; None if it can't be resolved"""
+    if value[0] in '"\'':
+        return value[1:-1]
+    expression = value.strip('{} ')
+    if expression in constants:
+        return constants[expression]
+    logger.warning(f"Cannot resolve route path {value}")
+    return None
+
+
+def _join(parent, path):
+    if path.startswith('/'):
+        return path
+    return f"{parent.rstrip('/')}/{path}"
+
+
+def parse_routes(app_source, constants=None):
+    """Every <Route> of a route table as {'path', 'requires_auth', 'redirect', 'redirect_to',
+    'premium', 'components'}
+
+    Paths are absolute, index routes take their parent's path and auth
+    is inherited from ProtectedRoute wrappers of enclosing layout routes.
+    components are the JSX components rendering the route, including
+    guards and the layouts of enclosing routes.
+    """
+    constants = constants or {}
+    routes = []
+    stack = []  # open layout routes: {'path', 'requires_auth', 'components'}
+    position = 0
+    while True:
+        match = ROUTE_TAG.search(app_source, position)
+        if not match:
+            break
+        if match.group(0) == '</Route>':
+            if stack:
+                stack.pop()
+            position = match.end()
+            continue
+
+        tag, self_closing, position = _read_tag(app_source, match.end())
+        attributes = _read_attributes(tag)
+        parent = stack[-1] if stack else {'path': '', 'requires_auth': False, 'components': []}
+        element = attributes.get('element', '') if isinstance(attributes.get('element'), str) else ''
+
+        if attributes.get('index'):
+            path = parent['path'] or '/'
+        elif 'path' in attributes:
+            relative = _resolve_path(attributes['path'], constants)
+            path = _join(parent['path'], relative) if relative is not None else None
+        else:
+            path = parent['path']
+
+        route = {
+            'path': path,
+            'requires_auth': parent['requires_auth'] or 'ProtectedRoute' in element,
+            'redirect': element.strip('{} \n').startswith('<Navigate'),
+            'redirect_to': None,
+            'premium': None,
+            'components': parent['components'] + [c for c in COMPONENT.findall(element)
+                                                  if c not in parent['components']],
+        }
+        premium = PREMIUM_FEATURE.search(element)
+        if premium:
+            route['premium'] = premium.group(1)
+        target = NAVIGATE_TARGET.search(element)
+        if route['redirect'] and target:
+            route['redirect_to'] = target.group(1)
+        if path is not None:
+            routes.append(route)
+        if not self_closing:
+            stack.append({'path': path or parent['path'], 'requires_auth': route['requires_auth'],
+                          'components': route['components']})
+    return routes
+
+
+def parse_constants(source):
+    """String constants exported by a module, e.g. FMS_BASE = '/fms'"""
+    return dict(CONSTANT.findall(source))
+
+
+def page_name(path):
+    """Readable page name from a route path, e.g. /fms/bank-accounts -> Bank Accounts"""
+    segments = [s for s in path.strip('/').split('/') if s]
+    if not segments:
+        return 'Landing'
+    prefix = ''
+    if segments[0] in ('fms', 'pms'):
+        prefix = segments.pop(0).upper()
+    words = ' '.join(s.replace('-', ' ').title() for s in segments)
+    if not words:
+        return f"{prefix} Home"
+    return f"PMS {words}" if prefix == 'PMS' else words
+
+
+def route_files_hash(files=ROUTE_FILES):
+    """Hash of the route files' contents and the parser version"""
+    digest = hashlib.sha256(f"v{PARSER_VERSION}".encode())
+    for path in files:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_routes(files=ROUTE_FILES, cache_file=ROUTE_CACHE_FILE):
+    """Parsed route table, reusing the cache while the route files are unchanged"""
+    key = route_files_hash(files)
+    try:
+        cached = json.loads(cache_file.read_text(encoding='utf-8'))
+        if cached.get('hash') == key:
+            return cached['routes']
+    except (OSError, ValueError):
+        pass
+
+    app_file, *constant_files = files
+    constants = {}
+    for path in constant_files:
+        constants.update(parse_constants(path.read_text(encoding='utf-8')))
+    routes = parse_routes(app_file.read_text(encoding='utf-8'), constants)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({'hash': key, 'routes': routes}, indent=2), encoding='utf-8')
+    except OSError as e:
+        logger.debug(f"Could not cache route table: {e}")
+    logger.info(f"Discovered {len(routes)} routes in {app_file.name}")
+    return routes
+
+
+def covers(page_path, route_path):
+    """A hand-listed path covers a route if it is the route or its legacy /fms-less form"""
+    return route_path in (page_path, f"/fms{page_path}")
+
+
+def build_page_matrix(pages=PAGES_TO_TEST, routes=None):
+    """PAGES_TO_TEST plus every loadable route it doesn't cover
+
+    Dynamic (:id), wildcard and redirect routes are left out. Hand-listed
+    pages that match no route are logged as drift but kept.
+    """
+    routes = load_routes() if routes is None else routes
+    matrix = [dict(page) for page in pages]
+
+    for page in pages:
+        if not any(covers(page['path'], route['path']) for route in routes):
+            logger.warning(f"{page['name']} ({page['path']}) is not in the app's route table")
+
+    seen = set()
+    for route in routes:
+        path = route['path']
+        if (route['redirect'] or ':' in path or '*' in path or path in seen
+                or path in ROUTE_DISCOVERY_EXCLUDE
+                or any(covers(page['path'], path) for page in pages)):
+            continue
+        seen.add(path)
+        page = {'name': page_name(path), 'path': path, 'requires_auth': route['requires_auth']}
+        if route['premium']:
+            page['premium'] = route['premium']
+        matrix.append(page)
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def _page_matrix():
+    if not ROUTE_DISCOVERY:
+        return PAGES_TO_TEST
+    try:
+        return build_page_matrix()
+    except (OSError, ValueError) as e:
+        logger.warning(f"Route discovery failed, using PAGES_TO_TEST: {e}")
+        return PAGES_TO_TEST
+
+
+def page_matrix():
+    """Pages for per-page tests (copy of the cached matrix)"""
+    return [dict(page) for page in _page_matrix()]
+
+
+def uncovered_pages(pages, matrix):
+    """Pages (e.g. crawled sidebar links) that no page of the matrix covers"""
+    return [page for page in pages if not any(covers(known['path'], page['path']) for known in matrix)]
+
+
+def crawl_sidebar_pages(driver, menu_items_css):
+    """Pages linked from the sidebar of the current (logged-in) page"""
+    pages = {}
+    for link in driver.execute_script(SIDEBAR_LINKS_SCRIPT, menu_items_css) or []:
+        pages.setdefault(link['path'], {
+            'name': link['text'] or page_name(link['path']),
+            'path': link['path'],
+            'requires_auth': True,
+        })
+    return list(pages.values())
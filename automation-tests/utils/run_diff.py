@@ -0,0 +1,364 @@
+"""
+Run Diff Utility
+Compares the JSON reports of two test runs: durations, outcomes, page metrics and API latency
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from config.config import (
+    JSON_REPORT_PATH, RUNS_DIR, RUN_DIFF_REPORT_PATH, RUN_DIFF_MIN_CHANGE, RUN_DIFF_MIN_DELTA_S,
+    RUN_DIFF_SIGNIFICANCE
+)
+from utils.report_generator import REPORT_CSS
+from utils.stats import mean, welch_t_test
+
+logger = logging.getLogger(__name__)
+
+# Page snapshot metrics compared between runs (lower is better)
+PAGE_METRICS = ['first_contentful_paint_ms', 'load_ms', 'visit_duration_s', 'js_heap_bytes']
+# Endpoint latency fields compared between runs
+ENDPOINT_METRICS = ['p50_ms', 'p95_ms', 'p99_ms', 'error_rate']
+
+
+def list_runs():
+    """Archived run IDs, oldest first"""
+    if not RUNS_DIR.exists():
+        return []
+    return sorted(d.name for d in RUNS_DIR.iterdir() if (d / JSON_REPORT_PATH.name).exists())
+
+
+def resolve_run(ref):
+    """Path of a run's JSON report from a file path, a run ID, 'latest' or 'previous'"""
+    path = Path(ref)
+    if path.is_file():
+        return path
+    runs = list_runs()
+    aliases = {'latest': -1, 'previous': -2}
+    if ref in aliases:
+        if len(runs) < -aliases[ref]:
+            raise FileNotFoundError(f"Not enough archived runs in {RUNS_DIR} for '{ref}'")
+        ref = runs[aliases[ref]]
+    run_file = RUNS_DIR / ref / JSON_REPORT_PATH.name
+    if not run_file.exists():
+        raise FileNotFoundError(f"No report for run '{ref}' (expected a file or one of: {', '.join(runs[-5:])})")
+    return run_file
+
+
+def load_runs(refs):
+    """Load one or more reports; several runs are pooled as repeated samples"""
+    reports = []
+    for ref in refs:
+        with open(resolve_run(ref), 'r') as f:
+            reports.append(json.load(f))
+    return reports
+
+
+def _run_label(reports):
+    return ', '.join(r.get('run_id') or r.get('execution_date', '?') for r in reports)
+
+
+def _relative(before, after):
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before
+
+
+def _is_notable(before, after):
+    change = _relative(before, after)
+    return change is not None and abs(change) >= RUN_DIFF_MIN_CHANGE
+
+
+def diff_tests(base_reports, head_reports):
+    """Per-test duration changes and outcome flips
+
+    Passes replayed from the result cache count for outcomes but not as
+    duration samples, since they repeat an older run's duration.
+    """
+    def collect(reports):
+        tests = {}
+        for report in reports:
+            for result in report['test_results']:
+                test = tests.setdefault(result['test_name'], {'durations': [], 'statuses': []})
+                test['statuses'].append(result['status'])
+                if not result.get('cached'):
+                    test['durations'].append(result['duration'])
+        return tests
+
+    base, head = collect(base_reports), collect(head_reports)
+    changes = []
+    for name in sorted(set(base) | set(head)):
+        before, after = base.get(name), head.get(name)
+        if not before or not after:
+            changes.append({'test_name': name, 'change': 'added' if after else 'removed'})
+            continue
+
+        was_failing = 'FAILED' in before['statuses']
+        is_failing = 'FAILED' in after['statuses']
+        change = 'newly failing' if is_failing and not was_failing else \
+                 'fixed' if was_failing and not is_failing else 'duration'
+        if not before['durations'] or not after['durations']:
+            if change != 'duration':
+                changes.append({'test_name': name, 'change': change})
+            continue
+
+        before_mean, after_mean = mean(before['durations']), mean(after['durations'])
+        test = welch_t_test(before['durations'], after['durations'])
+        if test:
+            significant = test['p'] < RUN_DIFF_SIGNIFICANCE
+            significance = f"p={test['p']:.3f}"
+        else:
+            # One sample per side: only a large relative change counts
+            significant = _is_notable(before_mean, after_mean)
+            significance = 'single run'
+        changes.append({
+            'test_name': name,
+            'change': change,
+            'before_s': before_mean,
+            'after_s': after_mean,
+            'delta_s': after_mean - before_mean,
+            'relative': _relative(before_mean, after_mean),
+            'samples': (len(before['durations']), len(after['durations'])),
+            'significance': significance,
+            # Sub-RUN_DIFF_MIN_DELTA_S changes are noise however significant
+            'significant': significant and abs(after_mean - before_mean) >= RUN_DIFF_MIN_DELTA_S,
+        })
+    return sorted(changes, key=lambda c: abs(c.get('delta_s') or 0), reverse=True)
+
+
+def diff_pages(base_reports, head_reports):
+    """Page snapshot timing and payload changes"""
+    def collect(reports):
+        pages = {}
+        for report in reports:
+            for snapshot in report.get('page_snapshots', []):
+                page = pages.setdefault((snapshot['name'], snapshot.get('profile', 'none')), {})
+                for metric in PAGE_METRICS:
+                    if snapshot['metrics'].get(metric) is not None:
+                        page.setdefault(metric, []).append(snapshot['metrics'][metric])
+            for payload in report.get('payloads', {}).get('pages', []):
+                page = pages.setdefault((payload['page'], payload.get('profile', 'none')), {})
+                page.setdefault('transfer_bytes', []).append(payload['transfer_bytes'])
+        return pages
+
+    base, head = collect(base_reports), collect(head_reports)
+    changes = []
+    for key in sorted(set(base) & set(head)):
+        for metric in set(base[key]) & set(head[key]):
+            before, after = mean(base[key][metric]), mean(head[key][metric])
+            if _is_notable(before, after):
+                changes.append({
+                    'page': key[0] if key[1] == 'none' else f"{key[0]} ({key[1]})",
+                    'metric': metric,
+                    'before': before,
+                    'after': after,
+                    'relative': _relative(before, after),
+                })
+    return sorted(changes, key=lambda c: abs(c['relative']), reverse=True)
+
+
+def diff_endpoints(base_reports, head_reports):
+    """Per-endpoint latency and error rate changes, weighted by call volume
+
+    Error rate changes come first, ranked by the extra failed calls;
+    latency changes follow, ranked by the extra milliseconds.
+    """
+    def collect(reports):
+        endpoints = {}
+        for report in reports:
+            for row in report.get('api_latency', []):
+                endpoints.setdefault((row['endpoint'], row.get('profile', 'none')), []).append(row)
+        return endpoints
+
+    base, head = collect(base_reports), collect(head_reports)
+    changes = []
+    for key in sorted(set(base) & set(head)):
+        calls = sum(r['count'] for r in head[key])
+        for metric in ENDPOINT_METRICS:
+            before = mean(r[metric] for r in base[key] if r[metric] is not None)
+            after = mean(r[metric] for r in head[key] if r[metric] is not None)
+            if metric == 'error_rate':
+                notable = before is not None and after is not None and abs(after - before) >= 0.01
+            else:
+                notable = _is_notable(before, after)
+            if notable:
+                changes.append({
+                    'endpoint': key[0] if key[1] == 'none' else f"{key[0]} ({key[1]})",
+                    'metric': metric,
+                    'before': before,
+                    'after': after,
+                    'relative': _relative(before, after),
+                    'calls': calls,
+                    # Extra failed calls, or extra time spent across the run at the new latency
+                    'impact': (after - before) * calls,
+                })
+    return sorted(changes, key=lambda c: (c['metric'] != 'error_rate', -abs(c['impact'])))
+
+
+def diff_runs(base_refs, head_refs):
+    """Full comparison of the baseline runs against the current runs"""
+    base_reports, head_reports = load_runs(base_refs), load_runs(head_refs)
+    tests = diff_tests(base_reports, head_reports)
+    return {
+        'generated': datetime.now().isoformat(),
+        'baseline': _run_label(base_reports),
+        'current': _run_label(head_reports),
+        'newly_failing': [t for t in tests if t['change'] == 'newly failing'],
+        'fixed': [t for t in tests if t['change'] == 'fixed'],
+        'added': [t['test_name'] for t in tests if t['change'] == 'added'],
+        'removed': [t['test_name'] for t in tests if t['change'] == 'removed'],
+        'slower': [t for t in tests if t['change'] == 'duration' and t['significant'] and t['delta_s'] > 0],
+        'faster': [t for t in tests if t['change'] == 'duration' and t['significant'] and t['delta_s'] < 0],
+        'pages': diff_pages(base_reports, head_reports),
+        'endpoints': diff_endpoints(base_reports, head_reports),
+    }
+
+
+def _format_value(metric, value):
+    if value is None:
+        return '-'
+    if metric == 'error_rate':
+        return f"{value:.1%}"
+    if metric.endswith('_bytes'):
+        return f"{value / 1024:.0f} KB"
+    if metric.endswith('_s'):
+        return f"{value:.2f}s"
+    return f"{value:.0f}ms"
+
+
+def _format_change(relative):
+    return f"{relative:+.0%}" if relative is not None else 'new'
+
+
+def format_terminal(diff, limit=10):
+    """Plain-text summary for the console"""
+    lines = [
+        f"Run diff: {diff['baseline']} → {diff['current']}",
+        f"  {len(diff['newly_failing'])} newly failing, {len(diff['fixed'])} fixed, "
+        f"{len(diff['slower'])} slower, {len(diff['faster'])} faster, "
+        f"{len(diff['added'])} added, {len(diff['removed'])} removed",
+    ]
+    for title, tests in (('Newly failing', diff['newly_failing']), ('Fixed', diff['fixed'])):
+        if tests:
+            lines.append(f"\n{title}:")
+            lines.extend(f"  {t['test_name']}" for t in tests[:limit])
+    for title, tests in (('Slower', diff['slower']), ('Faster', diff['faster'])):
+        if tests:
+            lines.append(f"\n{title} tests:")
+            lines.extend(
+                f"  {t['delta_s']:+.2f}s ({_format_change(t['relative'])}, {t['significance']})  {t['test_name']}"
+                for t in tests[:limit]
+            )
+    if diff['pages']:
+        lines.append("\nPage metrics:")
+        lines.extend(
+            f"  {c['page']} {c['metric']}: {_format_value(c['metric'], c['before'])} → "
+            f"{_format_value(c['metric'], c['after'])} ({_format_change(c['relative'])})"
+            for c in diff['pages'][:limit]
+        )
+    if diff['endpoints']:
+        lines.append("\nAPI endpoints:")
+        lines.extend(
+            f"  {c['endpoint']} {c['metric']}: {_format_value(c['metric'], c['before'])} → "
+            f"{_format_value(c['metric'], c['after'])} ({_format_change(c['relative'])}, {c['calls']} calls)"
+            for c in diff['endpoints'][:limit]
+        )
+    return '\n'.join(lines)
+
+
+def _rows(items, columns):
+    """Table rows from dicts; columns is a list of (header, callable)"""
+    header = ''.join(f"<th>{name}</th>" for name, _ in columns)
+    body = ''.join(
+        "<tr>" + ''.join(f"<td>{render(item)}</td>" for _, render in columns) + "</tr>"
+        for item in items
+    )
+    return f"<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def _status(relative, text):
+    status_class = 'failed' if relative and relative > 0 else 'passed'
+    return f"<span class='status {status_class}'>{text}</span>"
+
+
+def generate_html(diff, path=RUN_DIFF_REPORT_PATH):
+    """Write the diff as an HTML page in the style of the test report"""
+    sections = []
+    if diff['newly_failing'] or diff['fixed']:
+        sections.append(("🚨 Outcome Changes", _rows(diff['newly_failing'] + diff['fixed'], [
+            ('Test', lambda t: t['test_name']),
+            ('Change', lambda t: _status(1 if t['change'] == 'newly failing' else -1, t['change'].upper())),
+        ])))
+    if diff['slower'] or diff['faster']:
+        sections.append(("⏱️ Test Duration Changes", _rows(diff['slower'] + diff['faster'], [
+            ('Test', lambda t: t['test_name']),
+            ('Before', lambda t: f"{t['before_s']:.2f}s"),
+            ('After', lambda t: f"{t['after_s']:.2f}s"),
+            ('Change', lambda t: _status(t['relative'], f"{t['delta_s']:+.2f}s ({_format_change(t['relative'])})")),
+            ('Significance', lambda t: f"{t['significance']} ({t['samples'][0]} vs {t['samples'][1]} runs)"),
+        ])))
+    if diff['pages']:
+        sections.append(("🧭 Page Metric Changes", _rows(diff['pages'], [
+            ('Page', lambda c: c['page']),
+            ('Metric', lambda c: c['metric']),
+            ('Before', lambda c: _format_value(c['metric'], c['before'])),
+            ('After', lambda c: _format_value(c['metric'], c['after'])),
+            ('Change', lambda c: _status(c['relative'], _format_change(c['relative']))),
+        ])))
+    if diff['endpoints']:
+        sections.append(("🌐 API Endpoint Changes", _rows(diff['endpoints'], [
+            ('Endpoint', lambda c: c['endpoint']),
+            ('Metric', lambda c: c['metric']),
+            ('Before', lambda c: _format_value(c['metric'], c['before'])),
+            ('After', lambda c: _format_value(c['metric'], c['after'])),
+            ('Change', lambda c: _status(c['relative'], _format_change(c['relative']))),
+            ('Calls', lambda c: c['calls']),
+        ])))
+    if diff['added'] or diff['removed']:
+        sections.append(("➕ Added / Removed Tests", _rows(
+            [{'name': n, 'change': 'added'} for n in diff['added']] +
+            [{'name': n, 'change': 'removed'} for n in diff['removed']],
+            [('Test', lambda t: t['name']), ('Change', lambda t: t['change'])]
+        )))
+
+    cards = [
+        (len(diff['newly_failing']), 'failed', 'Newly Failing'),
+        (len(diff['fixed']), 'passed', 'Fixed'),
+        (len(diff['slower']), 'failed', 'Slower'),
+        (len(diff['faster']), 'passed', 'Faster'),
+    ]
+    html_content = f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>UtilityHub360 Run Diff</title>
+    <style>
+        {REPORT_CSS}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔍 UtilityHub360 Run Comparison</h1>
+            <p>Baseline: {diff['baseline']} → Current: {diff['current']}</p>
+        </div>
+        <div class="summary">
+            {''.join(f'<div class="summary-card"><h3 class="{cls}">{count}</h3><p>{label}</p></div>' for count, cls, label in cards)}
+        </div>
+        {''.join(f'<div class="section"><h2>{title}</h2>{table}</div>' for title, table in sections)
+         or '<div class="section"><h2>✓ No notable changes</h2></div>'}
+        <div class="footer">
+            <p>Generated by UtilityHub360 Automation Framework · {diff['generated']}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    logger.info(f"Run diff report generated: {path}")
+    return str(path)
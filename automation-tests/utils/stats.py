@@ -0,0 +1,138 @@
+"""
+Statistics Helpers
+Small numeric helpers shared by the performance utilities
+"""
+
+import math
+
+
+def mean(values):
+    """Arithmetic mean, None for an empty sequence"""
+    values = list(values)
+    return sum(values) / len(values) if values else None
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0..100)"""
+    values = sorted(values)
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    rank = (len(values) - 1) * pct / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def linear_fit(xs, ys):
+    """Least-squares fit y = slope * x + intercept
+
+    Returns a dict with slope, intercept and r2, or None if there are
+    fewer than two distinct x values.
+    """
+    xs = list(xs)
+    ys = list(ys)
+    n = len(xs)
+    if n < 2 or len(set(xs)) < 2:
+        return None
+
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    ss_res = sum((y - (slope * x + intercept)) ** 2 for x, y in zip(xs, ys))
+    r2 = 1 - ss_res / ss_tot if ss_tot else 1.0
+    return {'slope': slope, 'intercept': intercept, 'r2': r2}
+
+
+def power_law_fit(xs, ys):
+    """Fit y = coefficient * x ** exponent via a log-log linear fit
+
+    Non-positive points are ignored. Returns exponent, coefficient and r2,
+    or None if not enough usable points remain.
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y and y > 0]
+    fit = linear_fit([p[0] for p in points], [p[1] for p in points])
+    if not fit:
+        return None
+    return {
+        'exponent': fit['slope'],
+        'coefficient': math.exp(fit['intercept']),
+        'r2': fit['r2'],
+    }
+
+
+def classify_growth(exponent):
+    """Describe a power-law exponent in complexity terms"""
+    if exponent is None:
+        return 'unknown'
+    if exponent < 0.2:
+        return 'constant'
+    if exponent < 0.8:
+        return 'sub-linear'
+    if exponent < 1.2:
+        return 'linear'
+    return 'super-linear'
+
+
+def variance(values):
+    """Sample variance, None for fewer than two values"""
+    values = list(values)
+    if len(values) < 2:
+        return None
+    m = sum(values) / len(values)
+    return sum((v - m) ** 2 for v in values) / (len(values) - 1)
+
+
+def _incomplete_beta(a, b, x):
+    """Regularized incomplete beta I_x(a, b) by continued fraction"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _incomplete_beta(b, a, 1 - x)
+
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 200):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < 1e-10:
+            break
+    return front * result
+
+
+def welch_t_test(a, b):
+    """Two-sided Welch's t-test for a difference in means
+
+    Returns t, degrees of freedom and p-value, or None if either sample
+    has fewer than two values.
+    """
+    var_a, var_b = variance(a), variance(b)
+    if var_a is None or var_b is None:
+        return None
+    se_a, se_b = var_a / len(a), var_b / len(b)
+    if se_a + se_b == 0:
+        return {'t': 0.0, 'df': len(a) + len(b) - 2, 'p': 1.0 if mean(a) == mean(b) else 0.0}
+    t = (mean(b) - mean(a)) / math.sqrt(se_a + se_b)
+    df = (se_a + se_b) ** 2 / (
+        (se_a ** 2 / (len(a) - 1) if se_a else 0) + (se_b ** 2 / (len(b) - 1) if se_b else 0)
+    )
+    p = _incomplete_beta(df / 2, 0.5, df / (df + t * t))
+    return {'t': t, 'df': df, 'p': p}
@@ -0,0 +1,299 @@
+"""
+Stub API Server
+In-memory stand-in for the UtilityHub360 API used for offline runs
+"""
+
+import json
+import logging
+import re
+import threading
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from config.config import STUB_API_HOST, STUB_API_PORT, TEST_USERS
+
+logger = logging.getLogger(__name__)
+
+
+class StubAPIStore:
+    """Thread-safe in-memory storage for stub API resources"""
+
+    RESOURCES = ('bank_accounts', 'bills', 'loans', 'transactions')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {resource: {} for resource in self.RESOURCES}
+        self.tokens = {}
+
+    def create(self, resource, user_id, payload):
+        """Store a new record and return it"""
+        now = datetime.now().isoformat()
+        record = dict(payload)
+        record.update({
+            'id': str(uuid.uuid4()),
+            'userId': user_id,
+            'createdAt': now,
+            'updatedAt': now,
+        })
+        with self.lock:
+            self.records[resource][record['id']] = record
+        return record
+
+    def list(self, resource, user_id):
+        """List records owned by a user"""
+        with self.lock:
+            return [r for r in self.records[resource].values() if r['userId'] == user_id]
+
+    def delete(self, resource, user_id, record_id):
+        """Delete a record, returning True if it existed"""
+        with self.lock:
+            record = self.records[resource].get(record_id)
+            if not record or record['userId'] != user_id:
+                return False
+            del self.records[resource][record_id]
+            return True
+
+    def count(self, resource):
+        """Total number of records of a resource"""
+        with self.lock:
+            return len(self.records[resource])
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the subset of endpoints the suite uses"""
+
+    store = None  # Bound by StubAPIServer
+
+    # (method, path regex, handler name)
+    ROUTES = [
+        ('POST', r'^/api/Auth/login$', 'handle_login'),
+        ('GET', r'^/api/Auth/me$', 'handle_me'),
+        ('GET', r'^/api/bankaccounts$', 'handle_list_bank_accounts'),
+        ('POST', r'^/api/bankaccounts$', 'handle_create_bank_account'),
+        ('POST', r'^/api/bankaccounts/(?P<id>[^/]+)/delete$', 'handle_delete_bank_account'),
+        ('GET', r'^/api/bills$', 'handle_list_bills'),
+        ('POST', r'^/api/bills$', 'handle_create_bill'),
+        ('DELETE', r'^/api/bills/(?P<id>[^/]+)$', 'handle_delete_bill'),
+        ('POST', r'^/api/Loans/apply$', 'handle_create_loan'),
+        ('GET', r'^/api/Loans/user/(?P<user_id>[^/]+)$', 'handle_list_loans'),
+        ('POST', r'^/api/Loans/(?P<id>[^/]+)/delete$', 'handle_delete_loan'),
+        ('GET', r'^/api/BankAccounts/transactions$', 'handle_list_transactions'),
+        ('POST', r'^/api/BankAccounts/transactions$', 'handle_create_transaction'),
+        ('POST', r'^/api/BankAccounts/transactions/(?P<id>[^/]+)/delete$', 'handle_delete_transaction'),
+    ]
+
+    def log_message(self, format, *args):
+        """Route request logging through the framework logger"""
+        logger.debug(f"Stub API: {format % args}")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._send_cors_headers()
+        self.end_headers()
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        """Match the request against ROUTES and call its handler"""
+        parsed = urlparse(self.path)
+        self.query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        for route_method, pattern, handler_name in self.ROUTES:
+            match = re.match(pattern, parsed.path, re.IGNORECASE)
+            if route_method == method and match:
+                try:
+                    getattr(self, handler_name)(**match.groupdict())
+                except Exception as e:
+                    logger.error(f"Stub API handler {handler_name} failed: {e}")
+                    self._send_json(500, self._envelope(None, success=False, message=str(e)))
+                return
+        self._send_json(404, self._envelope(None, success=False, message=f"No stub for {method} {parsed.path}"))
+
+    # Helpers
+
+    def _send_cors_headers(self):
+        self.send_header('Access-Control-Allow-Origin', self.headers.get('Origin') or '*')
+        self.send_header('Access-Control-Allow-Credentials', 'true')
+        self.send_header('Access-Control-Allow-Headers', 'Authorization, Content-Type')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self._send_cors_headers()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    @staticmethod
+    def _envelope(data, success=True, message='OK'):
+        return {'success': success, 'message': message, 'data': data, 'errors': []}
+
+    def _current_user(self):
+        """Resolve the user from the bearer token, sending 401 if missing"""
+        auth = self.headers.get('Authorization', '')
+        token = auth[len('Bearer '):] if auth.startswith('Bearer ') else None
+        user = self.store.tokens.get(token)
+        if not user:
+            self._send_json(401, self._envelope(None, success=False, message='Unauthorized'))
+        return user
+
+    def _paginate(self, items):
+        page = int(self.query.get('page', 1))
+        limit = int(self.query.get('limit', 10))
+        start = (page - 1) * limit
+        return {
+            'data': items[start:start + limit],
+            'page': page,
+            'limit': limit,
+            'totalCount': len(items),
+        }
+
+    def _create(self, resource):
+        user = self._current_user()
+        if user:
+            record = self.store.create(resource, user['id'], self._read_json())
+            self._send_json(200, self._envelope(record))
+
+    def _delete(self, resource, record_id):
+        user = self._current_user()
+        if user:
+            if self.store.delete(resource, user['id'], record_id):
+                self._send_json(200, self._envelope(True))
+            else:
+                self._send_json(404, self._envelope(False, success=False, message='Not found'))
+
+    # Handlers
+
+    def handle_login(self):
+        credentials = self._read_json()
+        user_key = next((k for k, u in TEST_USERS.items()
+                         if u['email'] == credentials.get('email')
+                         and u['password'] == credentials.get('password')
+                         and k != 'invalid_user'), None)
+        if not user_key:
+            self._send_json(401, self._envelope(None, success=False, message='Invalid email or password'))
+            return
+        token = uuid.uuid4().hex
+        user = {
+            'id': f"stub-{user_key}",
+            'name': user_key.replace('_', ' ').title(),
+            'email': credentials['email'],
+            'phone': '',
+            'role': 'ADMIN' if user_key == 'admin_user' else 'USER',
+            'isActive': True,
+        }
+        self.store.tokens[token] = user
+        self._send_json(200, self._envelope({
+            'token': token,
+            'refreshToken': uuid.uuid4().hex,
+            'expiresAt': (datetime.now() + timedelta(hours=1)).isoformat(),
+            'user': user,
+        }))
+
+    def handle_me(self):
+        user = self._current_user()
+        if user:
+            self._send_json(200, self._envelope(user))
+
+    def handle_list_bank_accounts(self):
+        user = self._current_user()
+        if user:
+            self._send_json(200, self._envelope(self.store.list('bank_accounts', user['id'])))
+
+    def handle_create_bank_account(self):
+        self._create('bank_accounts')
+
+    def handle_delete_bank_account(self, id):
+        self._delete('bank_accounts', id)
+
+    def handle_list_bills(self):
+        user = self._current_user()
+        if user:
+            self._send_json(200, self._envelope(self._paginate(self.store.list('bills', user['id']))))
+
+    def handle_create_bill(self):
+        self._create('bills')
+
+    def handle_delete_bill(self, id):
+        self._delete('bills', id)
+
+    def handle_create_loan(self):
+        self._create('loans')
+
+    def handle_list_loans(self, user_id):
+        user = self._current_user()
+        if user:
+            self._send_json(200, self._envelope(self.store.list('loans', user['id'])))
+
+    def handle_delete_loan(self, id):
+        self._delete('loans', id)
+
+    def handle_list_transactions(self):
+        user = self._current_user()
+        if user:
+            transactions = self.store.list('transactions', user['id'])
+            account_id = self.query.get('bankAccountId')
+            if account_id:
+                transactions = [t for t in transactions if t.get('bankAccountId') == account_id]
+            self._send_json(200, self._envelope(self._paginate(transactions)))
+
+    def handle_create_transaction(self):
+        self._create('transactions')
+
+    def handle_delete_transaction(self, id):
+        self._delete('transactions', id)
+
+
+class StubAPIServer:
+    """Run the stub API in a background thread"""
+
+    def __init__(self, host=STUB_API_HOST, port=STUB_API_PORT):
+        self.host = host
+        self.port = port
+        self.store = StubAPIStore()
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """API base URL, equivalent to API_BASE_URL"""
+        return f"http://{self.host}:{self.port}/api"
+
+    def start(self):
+        """Start serving requests"""
+        handler = type('BoundStubAPIHandler', (StubAPIHandler,), {'store': self.store})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Stub API server running at {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop serving requests"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+            logger.info("Stub API server stopped")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
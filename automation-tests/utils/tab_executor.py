@@ -0,0 +1,135 @@
+"""
+Tab Executor
+Loads several pages as concurrent tabs of one browser and captures each tab once it settles
+"""
+
+import logging
+import time
+from config.config import BASE_URL, PAGE_SETTLE_TIMEOUT, PAGE_IDLE_MS, TAB_CONCURRENCY, TAB_POLL_INTERVAL
+from utils.cdp import main_frame_id
+from utils.network_log import get_network_log
+
+logger = logging.getLogger(__name__)
+
+# Load state of the current tab in one round trip
+TAB_STATE_SCRIPT = """
+return {
+    href: location.href,
+    ready: document.readyState,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+
+class TabExecutor:
+    """Multiplex page loads over the tabs of one (already authenticated) browser
+
+    WebDriver drives one tab at a time, but navigations started with
+    location.assign() keep loading while the executor switches to the
+    next tab, so up to max_tabs pages load at once. Every tab is its own
+    document, so API monitoring and timing entries stay per page.
+    """
+
+    def __init__(self, driver, setup_tab=None, max_tabs=TAB_CONCURRENCY,
+                 idle_ms=PAGE_IDLE_MS, timeout=PAGE_SETTLE_TIMEOUT):
+        self.driver = driver
+        self.setup_tab = setup_tab
+        self.max_tabs = max(1, max_tabs)
+        self.idle_ms = idle_ms
+        self.timeout = timeout
+
+    def run(self, pages, capture):
+        """Load pages, calling capture(page, tab) in each settled tab
+
+        tab holds 'started' (perf_counter), 'network_mark', 'frame_id' (to
+        tell its network events from the other tabs'), 'settled' and
+        'concurrent' (tabs open when the page was loading). Returns
+        {path: capture result}, or the exception raised for that tab.
+        """
+        origin = self.driver.current_window_handle
+        pending = list(pages)
+        open_tabs = []
+        results = {}
+        try:
+            while pending or open_tabs:
+                while pending and len(open_tabs) < self.max_tabs:
+                    page = pending.pop(0)
+                    try:
+                        open_tabs.append(self._open(page))
+                    except Exception as e:
+                        results[page['path']] = e
+                        self._return_to(origin)
+                concurrent = len(open_tabs)
+                for tab in list(open_tabs):
+                    tab['concurrent'] = max(tab['concurrent'], concurrent)
+                    try:
+                        self.driver.switch_to.window(tab['handle'])
+                        if not self._poll(tab):
+                            continue
+                        results[tab['page']['path']] = capture(tab['page'], tab)
+                    except Exception as e:
+                        results[tab['page']['path']] = e
+                    open_tabs.remove(tab)
+                    self._close(tab)
+                if open_tabs:
+                    time.sleep(TAB_POLL_INTERVAL)
+        finally:
+            for tab in open_tabs:
+                self._close(tab)
+            self._return_to(origin)
+        return results
+
+    def _open(self, page):
+        """Open a tab and start loading the page without waiting for it"""
+        self.driver.switch_to.new_window('tab')
+        handle = self.driver.current_window_handle
+        try:
+            if self.setup_tab:
+                self.setup_tab(self.driver)
+            tab = {
+                'page': page,
+                'handle': handle,
+                'network_mark': get_network_log(self.driver).mark(),
+                'frame_id': main_frame_id(self.driver),
+                'started': time.perf_counter(),
+                'resources': -1,
+                'last_change': time.perf_counter(),
+                'settled': False,
+                'concurrent': 1,
+            }
+            self.driver.execute_script("location.assign(arguments[0]);", f"{BASE_URL}{page['path']}")
+        except Exception:
+            self.driver.close()
+            raise
+        logger.debug(f"Loading {page['name']} in tab {handle}")
+        return tab
+
+    def _poll(self, tab):
+        """True once the tab's page has loaded and stopped fetching for idle_ms, or timed out"""
+        now = time.perf_counter()
+        state = self.driver.execute_script(TAB_STATE_SCRIPT)
+        if state['href'] == 'about:blank' or state['ready'] != 'complete':
+            tab['last_change'] = now
+        elif state['resources'] != tab['resources']:
+            tab['resources'] = state['resources']
+            tab['last_change'] = now
+        elif (now - tab['last_change']) * 1000 >= self.idle_ms:
+            tab['settled'] = True
+            return True
+        if now - tab['started'] >= self.timeout:
+            logger.warning(f"{tab['page']['name']} not idle after {self.timeout}s")
+            return True
+        return False
+
+    def _close(self, tab):
+        try:
+            self.driver.switch_to.window(tab['handle'])
+            self.driver.close()
+        except Exception as e:
+            logger.debug(f"Could not close tab of {tab['page']['name']}: {e}")
+
+    def _return_to(self, handle):
+        try:
+            self.driver.switch_to.window(handle)
+        except Exception as e:
+            logger.warning(f"Could not switch back to the main tab: {e}")
@@ -0,0 +1,94 @@
+"""
+Trace Recorder Utility
+Records a DevTools performance trace around a test and streams it to disk gzip-compressed
+"""
+
+import base64
+import gzip
+import logging
+import threading
+import trio
+from config.config import TRACE_CATEGORIES, TRACE_CHUNK_SIZE, TRACE_STOP_TIMEOUT
+from utils.cdp import is_chromium
+
+logger = logging.getLogger(__name__)
+
+
+class TraceRecorder:
+    """Run the Tracing domain on a background CDP connection
+
+    Tracing events only arrive over a DevTools websocket, so the recording
+    runs in its own thread with a trio event loop while the test drives the
+    browser through WebDriver as usual. The trace is returned as a stream
+    and copied to disk chunk by chunk, never held in memory.
+    """
+
+    def __init__(self, driver, path):
+        self.driver = driver
+        self.path = path
+        self.started = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.error = None
+
+    def start(self):
+        """Begin tracing; returns False if the browser can't be traced"""
+        if not is_chromium(self.driver):
+            logger.warning("Performance traces need Chrome or Edge")
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.thread = threading.Thread(target=trio.run, args=(self._record,), daemon=True)
+        self.thread.start()
+        self.started.wait(timeout=TRACE_STOP_TIMEOUT)
+        if self.error or not self.started.is_set():
+            logger.warning(f"Could not start performance trace: {self.error}")
+            return False
+        return True
+
+    def stop(self):
+        """End tracing and wait for the trace file; returns its path or None"""
+        if not self.thread:
+            return None
+        self.stopping.set()
+        self.thread.join(timeout=TRACE_STOP_TIMEOUT)
+        if self.thread.is_alive() or self.error:
+            logger.warning(f"Performance trace incomplete: {self.error or 'timed out'}")
+            return None
+        logger.info(f"Performance trace saved: {self.path}")
+        return self.path
+
+    async def _record(self):
+        try:
+            async with self.driver.bidi_connection() as connection:
+                session, devtools = connection.session, connection.devtools
+                await session.execute(devtools.tracing.start(
+                    transfer_mode='ReturnAsStream',
+                    stream_compression=devtools.tracing.StreamCompression.GZIP,
+                    trace_config=devtools.tracing.TraceConfig(included_categories=TRACE_CATEGORIES),
+                ))
+                self.started.set()
+
+                while not self.stopping.is_set():
+                    await trio.sleep(0.1)
+
+                async with session.wait_for(devtools.tracing.TracingComplete) as complete:
+                    await session.execute(devtools.tracing.end())
+                await self._save_stream(session, devtools, complete.value)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self.started.set()
+
+    async def _save_stream(self, session, devtools, complete):
+        """Copy the trace stream to disk, gzip-compressing it if Chrome did not"""
+        compressed = complete.stream_compression == devtools.tracing.StreamCompression.GZIP
+        opener = open if compressed else gzip.open
+        with opener(self.path, 'wb') as f:
+            while True:
+                is_base64, data, eof = await session.execute(
+                    devtools.io.read(complete.stream, size=TRACE_CHUNK_SIZE)
+                )
+                f.write(base64.b64decode(data) if is_base64 else data.encode('utf-8'))
+                if eof:
+                    break
+        await session.execute(devtools.io.close(complete.stream))